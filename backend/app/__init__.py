@@ -1,3 +1,12 @@
 """
 Backend app package for Respira+ API.
 """
+import sys
+from pathlib import Path
+
+# The API shares domain code (e.g. emission factors) with the respira_plus
+# package at the repository root; make it importable when the server is
+# started from the backend directory.
+_REPO_ROOT = str(Path(__file__).resolve().parents[2])
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
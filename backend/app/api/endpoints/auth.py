@@ -1,19 +1,17 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, Request, status, Depends
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 from typing import Optional
-from datetime import datetime, timedelta
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from ...services.password_hasher import HasherBusyError
+from ...services.leaderboard import UserLeaderboard
+from ...services.security import InvalidTokenError, Security
+from ...services.user_repository import UserRepository
+from ...services.profiling import TrackedRoute, tracked
 
-router = APIRouter()
+router = APIRouter(route_class=TrackedRoute)
 
-# Configuration (should be in env vars)
-SECRET_KEY = "your-secret-key-keep-it-secret"
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
-
-# Use a widely supported hashing scheme to avoid bcrypt backend issues on Windows
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+bearer_scheme = HTTPBearer(auto_error=False)
 
 class UserLogin(BaseModel):
     email: str
@@ -29,55 +27,100 @@ class Token(BaseModel):
     token_type: str
     name: Optional[str] = None
 
-# Mock Database
-users_db = {}
+class UserInfo(BaseModel):
+    name: str
+    email: str
+
+def get_security(request: Request) -> Security:
+    return request.app.state.security
+
+def get_users(request: Request) -> UserRepository:
+    return request.app.state.users_db
+
+def get_leaderboard(request: Request) -> UserLeaderboard:
+    return request.app.state.leaderboard
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+async def call_repository(users_db: UserRepository, func, *args):
+    # Blocking backends (SQLite and its pool) run off the event loop
+    if users_db.blocking:
+        return await run_in_threadpool(tracked(func), *args)
+    return func(*args)
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+def hasher_busy():
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server busy, try again shortly",
+        headers={"Retry-After": "1"},
+    )
 
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+def get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+    security: Security = Depends(get_security),
+    users_db: UserRepository = Depends(get_users),
+):
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    if credentials is None:
+        raise credentials_exception
+    try:
+        payload = security.decode_access_token(credentials.credentials)
+    except InvalidTokenError:
+        raise credentials_exception
+    db_user = users_db.get(payload.get("sub"))
+    if db_user is None:
+        raise credentials_exception
+    return db_user
 
 @router.post("/register", response_model=Token)
-def register(user: UserRegister):
-    if user.email in users_db:
+async def register(
+    user: UserRegister,
+    security: Security = Depends(get_security),
+    users_db: UserRepository = Depends(get_users),
+    leaderboard: UserLeaderboard = Depends(get_leaderboard),
+):
+    if await call_repository(users_db, users_db.get, user.email) is not None:
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    hashed_password = get_password_hash(user.password)
-    users_db[user.email] = {
+    try:
+        hashed_password = await security.password_hasher.hash(user.password)
+    except HasherBusyError:
+        raise hasher_busy()
+    new_user = {
         "name": user.name,
         "email": user.email,
         "hashed_password": hashed_password
     }
+    if not await call_repository(users_db, users_db.add, new_user):
+        raise HTTPException(status_code=400, detail="Email already registered")
+    leaderboard.add_user(new_user)
     
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
-    )
+    access_token = security.create_access_token(data={"sub": user.email})
     return {"access_token": access_token, "token_type": "bearer", "name": user.name}
 
 @router.post("/login", response_model=Token)
-def login(user: UserLogin):
-    db_user = users_db.get(user.email)
-    if not db_user or not verify_password(user.password, db_user["hashed_password"]):
+async def login(
+    user: UserLogin,
+    security: Security = Depends(get_security),
+    users_db: UserRepository = Depends(get_users),
+):
+    db_user = await call_repository(users_db, users_db.get, user.email)
+    try:
+        valid = bool(db_user) and await security.password_hasher.verify(user.password, db_user["hashed_password"])
+    except HasherBusyError:
+        raise hasher_busy()
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
-    )
+    access_token = security.create_access_token(data={"sub": user.email})
     return {"access_token": access_token, "token_type": "bearer", "name": db_user.get("name")}
+
+@router.get("/me", response_model=UserInfo)
+def read_current_user(current_user: dict = Depends(get_current_user)):
+    return {"name": current_user["name"], "email": current_user["email"]}
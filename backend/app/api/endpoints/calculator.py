@@ -1,8 +1,12 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import BaseModel, Field
+from typing import Dict, List, Literal, Optional
+from respira_plus.emission_factors import FACTOR_SETS
 from ...services.carbon_calculator import CarbonCalculator
+from ...services.calculation_cache import CalculationCache
+from ...services.profiling import TrackedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TrackedRoute)
 
 class TransportRequest(BaseModel):
     transport_type: str
@@ -19,30 +23,100 @@ class FoodRequest(BaseModel):
 class CalculationResponse(BaseModel):
     emissions_kg: float
     category: str
+    factor_version: Optional[str] = None
+
+# Upper bound on items per batch request (a full week of entries fits easily)
+MAX_BATCH_ITEMS = 500
+
+class BatchItem(BaseModel):
+    category: Literal["transportation", "energy", "food"]
+    activity_type: str
+    quantity: float
+
+class BatchRequest(BaseModel):
+    # Checked while the list is validated, so oversized batches fail early with a 422
+    items: List[BatchItem] = Field(..., max_length=MAX_BATCH_ITEMS)
+    # Recalculate with an earlier, still kept factor set
+    factor_version: Optional[str] = None
+
+class BatchResponse(BaseModel):
+    items: List[CalculationResponse]
+    breakdown: Dict[str, float]
+    total_emissions_kg: float
+    factor_version: Optional[str] = None
+
+class FactorVersions(BaseModel):
+    active: str
+    versions: List[str]
+
+class CacheStats(BaseModel):
+    hits: int
+    misses: int
+    hit_rate: float
+    invalidations: int
+    size: int
+    maxsize: int
+
+# Single-activity results are cached per app; the app repeats the same inputs constantly
+def get_calculation_cache(request: Request) -> CalculationCache:
+    return request.app.state.calculation_cache
 
 @router.post("/transport", response_model=CalculationResponse)
-def calculate_transport(request: TransportRequest):
-    calculator = CarbonCalculator()
+def calculate_transport(request: TransportRequest, calculation_cache: CalculationCache = Depends(get_calculation_cache)):
     try:
-        emissions = calculator.calculate_transportation(request.transport_type, request.distance_km)
-        return {"emissions_kg": emissions, "category": "transportation"}
+        emissions, version = calculation_cache.calculate("transportation", request.transport_type, request.distance_km)
+        return {"emissions_kg": emissions, "category": "transportation", "factor_version": version}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/energy", response_model=CalculationResponse)
-def calculate_energy(request: EnergyRequest):
-    calculator = CarbonCalculator()
+def calculate_energy(request: EnergyRequest, calculation_cache: CalculationCache = Depends(get_calculation_cache)):
     try:
-        emissions = calculator.calculate_energy(request.energy_type, request.consumption)
-        return {"emissions_kg": emissions, "category": "energy"}
+        emissions, version = calculation_cache.calculate("energy", request.energy_type, request.consumption)
+        return {"emissions_kg": emissions, "category": "energy", "factor_version": version}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/food", response_model=CalculationResponse)
-def calculate_food(request: FoodRequest):
-    calculator = CarbonCalculator()
+def calculate_food(request: FoodRequest, calculation_cache: CalculationCache = Depends(get_calculation_cache)):
     try:
-        emissions = calculator.calculate_food(request.diet_type, request.days)
-        return {"emissions_kg": emissions, "category": "food"}
+        emissions, version = calculation_cache.calculate("food", request.diet_type, request.days)
+        return {"emissions_kg": emissions, "category": "food", "factor_version": version}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/cache", response_model=CacheStats)
+def read_cache_stats(calculation_cache: CalculationCache = Depends(get_calculation_cache)):
+    return calculation_cache.stats()
+
+@router.get("/factors", response_model=FactorVersions)
+def read_factor_versions():
+    return {"active": FACTOR_SETS.active.version, "versions": list(FACTOR_SETS.versions())}
+
+@router.post("/batch", response_model=BatchResponse)
+def calculate_batch(request: BatchRequest):
+    # Pinned, so every item uses the same factor set even if it is swapped meanwhile
+    try:
+        calculator = CarbonCalculator(request.factor_version or FACTOR_SETS.active.version)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    handlers = {
+        "transportation": calculator.calculate_transportation,
+        "energy": calculator.calculate_energy,
+        "food": calculator.calculate_food,
+    }
+    items = []
+    for index, item in enumerate(request.items):
+        try:
+            emissions = handlers[item.category](item.activity_type, item.quantity)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Item {index}: {e}")
+        items.append({"emissions_kg": emissions, "category": item.category,
+                      "factor_version": calculator.registry.version})
+
+    return {
+        "items": items,
+        "breakdown": calculator.get_breakdown(),
+        "total_emissions_kg": calculator.get_total_emissions(),
+        "factor_version": calculator.registry.version,
+    }
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, Query
+from pydantic import BaseModel
+from typing import List
+from ...services.leaderboard import UserLeaderboard
+from ...services.profiling import TrackedRoute
+from .auth import get_current_user, get_leaderboard
+
+router = APIRouter(route_class=TrackedRoute)
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    name: str
+    points: float
+
+class LeaderboardPage(BaseModel):
+    total: int
+    offset: int
+    limit: int
+    entries: List[LeaderboardEntry]
+
+class LeaderboardPosition(LeaderboardEntry):
+    total: int
+
+@router.get("", response_model=LeaderboardPage)
+def read_leaderboard(
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: dict = Depends(get_current_user),
+    leaderboard: UserLeaderboard = Depends(get_leaderboard),
+):
+    """Users with points, best first."""
+    total, entries = leaderboard.page(limit=limit, offset=offset)
+    return {"total": total, "offset": offset, "limit": limit, "entries": entries}
+
+@router.get("/me", response_model=LeaderboardPosition)
+def read_my_position(
+    current_user: dict = Depends(get_current_user),
+    leaderboard: UserLeaderboard = Depends(get_leaderboard),
+):
+    # Users registered through another worker are ranked on first request
+    leaderboard.add_user(current_user)
+    rank, points, total = leaderboard.position(current_user["email"])
+    return {"rank": rank, "name": current_user["name"], "points": points, "total": total}
@@ -0,0 +1,10 @@
+from fastapi import APIRouter, Request, Response
+from ...services.catalog import missions_response
+from ...services.profiling import TrackedRoute
+
+router = APIRouter(route_class=TrackedRoute)
+
+@router.get("", response_class=Response)
+def read_missions(request: Request):
+    """Mission catalog; pre-serialized, supports gzip and If-None-Match."""
+    return missions_response.respond(request)
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Query, Request, Response
+from pydantic import BaseModel
+from typing import List
+from ...services.catalog import tips_response
+from ...services.recommender import recommender
+from ...services.profiling import TrackedRoute
+
+router = APIRouter(route_class=TrackedRoute)
+
+class RecommendedTip(BaseModel):
+    id: int
+    category: str
+    title: str
+    description: str
+    impact: str
+    score: float
+
+class RecommendedMission(BaseModel):
+    id: int
+    category: str
+    title: str
+    description: str
+    duration_days: int
+    points: int
+    co2_savings_kg: float
+    score: float
+
+class Recommendations(BaseModel):
+    tips: List[RecommendedTip]
+    missions: List[RecommendedMission]
+
+@router.get("", response_class=Response)
+def read_tips(request: Request):
+    """Tip catalog; pre-serialized, supports gzip and If-None-Match."""
+    return tips_response.respond(request)
+
+@router.get("/recommended", response_model=Recommendations)
+def read_recommended(
+    transportation: float = Query(0.0, ge=0),
+    energy: float = Query(0.0, ge=0),
+    food: float = Query(0.0, ge=0),
+    limit: int = Query(5, ge=1, le=50),
+):
+    """Tips and missions ranked by the share of each category in the user's footprint (kg CO2e)."""
+    breakdown = {"transportation": transportation, "energy": energy, "food": food}
+    return recommender.recommend(breakdown, limit)
@@ -0,0 +1,85 @@
+"""
+API settings.
+
+Every tunable of the API lives here instead of in module constants.
+``Settings.from_env`` reads the ``RESPIRA_*`` environment variables; tests
+and embedding code can pass their own ``Settings`` to ``create_app``.
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+DEFAULT_CORS_ORIGINS = (
+    "http://localhost:8081",
+    "http://localhost:8082",
+    "http://192.168.1.101:8081",
+    "http://127.0.0.1:8081",
+    "http://127.0.0.1:8082",
+    "http://localhost",
+    "http://127.0.0.1",
+    "http://localhost:8000",
+    "http://127.0.0.1:8000",
+)
+
+
+def _default_hash_workers():
+    return min(4, os.cpu_count() or 1)
+
+
+@dataclass(frozen=True)
+class Settings:
+    # Tokens
+    secret_key: str = "your-secret-key-keep-it-secret"
+    algorithm: str = "HS256"
+    access_token_expire_minutes: int = 30
+    # Verified tokens are cached until they expire so repeat requests skip signature checks
+    token_cache_size: int = 10000
+
+    # Hashing runs on its own bounded pool so login bursts cannot starve other endpoints
+    hash_workers: int = field(default_factory=_default_hash_workers)
+    hash_max_pending: int = 64
+
+    # User storage: SQLite when set, in-memory otherwise
+    user_db_path: Optional[str] = None
+
+    # Single-activity calculator results are cached (0 disables the cache)
+    calculation_cache_size: int = 4096
+
+    # Emission factor set file, reloaded when it changes (bundled set when unset)
+    emission_factors_path: Optional[str] = None
+    # Seconds between checks of the factor file (0 disables reloading)
+    factor_reload_interval: float = 5.0
+
+    cors_origins: Tuple[str, ...] = DEFAULT_CORS_ORIGINS
+
+    # Opt-in request profiling (see app.services.profiling)
+    profile: bool = False
+    profile_rate: float = 0.01
+    profile_token: Optional[str] = None
+    profile_dir: str = "profiles"
+
+    @classmethod
+    def from_env(cls, environ=os.environ):
+        """Settings from ``RESPIRA_*`` environment variables, defaults otherwise."""
+        defaults = cls()
+        origins = environ.get("RESPIRA_CORS_ORIGINS")
+        return cls(
+            secret_key=environ.get("RESPIRA_SECRET_KEY", defaults.secret_key),
+            access_token_expire_minutes=int(environ.get(
+                "RESPIRA_TOKEN_EXPIRE_MINUTES", defaults.access_token_expire_minutes)),
+            token_cache_size=int(environ.get("RESPIRA_TOKEN_CACHE_SIZE", defaults.token_cache_size)),
+            hash_workers=int(environ.get("RESPIRA_HASH_WORKERS", defaults.hash_workers)),
+            hash_max_pending=int(environ.get("RESPIRA_HASH_MAX_PENDING", defaults.hash_max_pending)),
+            user_db_path=environ.get("RESPIRA_USER_DB") or None,
+            calculation_cache_size=int(environ.get(
+                "RESPIRA_CALCULATION_CACHE_SIZE", defaults.calculation_cache_size)),
+            emission_factors_path=environ.get("RESPIRA_EMISSION_FACTORS") or None,
+            factor_reload_interval=float(environ.get(
+                "RESPIRA_FACTOR_RELOAD_INTERVAL", defaults.factor_reload_interval)),
+            cors_origins=tuple(o.strip() for o in origins.split(",")) if origins else defaults.cors_origins,
+            profile=environ.get("RESPIRA_PROFILE", "").lower() in ("1", "true", "yes"),
+            profile_rate=float(environ.get("RESPIRA_PROFILE_RATE", defaults.profile_rate)),
+            profile_token=environ.get("RESPIRA_PROFILE_TOKEN") or None,
+            profile_dir=environ.get("RESPIRA_PROFILE_DIR", defaults.profile_dir),
+        )
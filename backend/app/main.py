@@ -1,37 +1,88 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from typing import Optional
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.endpoints import calculator, auth
-
-app = FastAPI(
-    title="Respira+ API",
-    description="API for Respira+ Carbon Footprint Tracker",
-    version="0.1.0",
-)
-
-# CORS setup
-origins = [
-    "http://localhost:8081",
-    "http://localhost:8082",
-    "http://192.168.1.101:8081",
-    "http://127.0.0.1:8081",
-    "http://127.0.0.1:8082",
-    "http://localhost",
-    "http://127.0.0.1",
-    "http://localhost:8000",
-    "http://127.0.0.1:8000",
-]
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-app.include_router(calculator.router, prefix="/api/calculate", tags=["calculator"])
-app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
-
-@app.get("/")
+from app.api.endpoints import calculator, auth, leaderboard, missions, tips
+from app.config import Settings
+from app.services import metrics, profiling
+from app.services.calculation_cache import CalculationCache
+from app.services.factor_reloader import FactorReloader
+from app.services.leaderboard import UserLeaderboard
+from app.services.security import Security
+from app.services.user_repository import create_user_repository
+from respira_plus.emission_factors import FACTOR_SETS
+
 def read_root():
     return {"message": "Welcome to Respira+ API"}
+
+def read_metrics():
+    return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    reloader = app.state.factor_reloader
+    if reloader is not None:
+        reloader.start()
+    yield
+    if reloader is not None:
+        reloader.stop()
+    if app.state.profiler is not None:
+        app.state.profiler.close()
+    app.state.security.shutdown()
+    app.state.users_db.close()
+
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    """Build the API. Settings default to the RESPIRA_* environment variables."""
+    if settings is None:
+        settings = Settings.from_env()
+
+    app = FastAPI(
+        title="Respira+ API",
+        description="API for Respira+ Carbon Footprint Tracker",
+        version="0.1.0",
+        lifespan=lifespan,
+    )
+    app.state.settings = settings
+    # Password hashing and JWT libraries are only loaded on first use
+    app.state.security = Security(settings)
+    app.state.users_db = create_user_repository(settings.user_db_path)
+    # Rebuilt from the stored users; per process (see app.services.leaderboard)
+    app.state.leaderboard = UserLeaderboard(app.state.users_db.users())
+    app.state.calculation_cache = CalculationCache(maxsize=settings.calculation_cache_size)
+
+    # Factor sets are shared by every calculator in the process
+    app.state.factor_reloader = None
+    if settings.emission_factors_path:
+        FACTOR_SETS.load(settings.emission_factors_path)
+        if settings.factor_reload_interval > 0:
+            app.state.factor_reloader = FactorReloader(FACTOR_SETS, settings.factor_reload_interval)
+
+    # CORS setup
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=list(settings.cors_origins),
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Opt-in sampled profiling; not installed at all when disabled
+    profiler = app.state.profiler = profiling.create_profiler(settings)
+    if profiler is not None:
+        app.add_middleware(profiling.ProfilingMiddleware, profiler=profiler)
+
+    # Outermost, so latency includes CORS handling and every response is counted
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    app.include_router(calculator.router, prefix="/api/calculate", tags=["calculator"])
+    app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
+    app.include_router(leaderboard.router, prefix="/api/leaderboard", tags=["leaderboard"])
+    app.include_router(tips.router, prefix="/api/tips", tags=["tips"])
+    app.include_router(missions.router, prefix="/api/missions", tags=["missions"])
+
+    app.add_api_route("/", read_root, methods=["GET"])
+    app.add_api_route("/metrics", read_metrics, methods=["GET"], include_in_schema=False)
+
+    return app
+
+app = create_app()
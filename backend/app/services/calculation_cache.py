@@ -0,0 +1,111 @@
+"""
+Calculation Result Cache
+
+Bounded LRU cache of single-activity emission results keyed by
+``(category, activity_type, quantity)``. The mobile app sends the same few
+pairs over and over (default distances, whole diet days), so most requests
+can skip the calculator entirely.
+
+Each entry belongs to the emission factor registry it was computed with:
+when the active factor set is swapped (or ``CarbonCalculator.registry``
+replaced), the whole cache is dropped on the next lookup. Results carry the
+factor version they were computed with. Errors (unknown activity types) are
+not cached.
+"""
+
+from collections import OrderedDict
+from threading import Lock
+
+from .carbon_calculator import CarbonCalculator
+
+METHODS = {
+    "transportation": "calculate_transportation",
+    "energy": "calculate_energy",
+    "food": "calculate_food",
+}
+
+
+class CalculationCache:
+    """
+    LRU cache of calculator results, invalidated when the factors change.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._registry = CarbonCalculator.registry
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def calculate(self, category, activity_type, quantity):
+        """
+        Get the emissions of one activity, from the cache when possible.
+
+        A ``maxsize`` of 0 disables caching.
+
+        Args:
+            category (str): 'transportation', 'energy' or 'food'
+            activity_type (str): Activity type within the category
+            quantity (float): Distance, consumption or days
+
+        Returns:
+            tuple: (emissions in kg CO2e, factor set version)
+
+        Raises:
+            ValueError: If the activity type is unknown
+        """
+        registry = CarbonCalculator.registry
+        key = (category, activity_type, quantity)
+        if self.maxsize:
+            with self._lock:
+                if registry is not self._registry:
+                    self._entries.clear()
+                    self._registry = registry
+                    self.invalidations += 1
+                result = self._entries.get(key)
+                if result is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return result
+                self.misses += 1
+
+        # Calculate with the registry checked above, even if a swap happens meanwhile
+        calculator = CarbonCalculator()
+        calculator.registry = registry
+        result = (getattr(calculator, METHODS[category])(activity_type, quantity), registry.version)
+
+        if self.maxsize:
+            with self._lock:
+                if registry is self._registry:
+                    self._entries[key] = result
+                    while len(self._entries) > self.maxsize:
+                        self._entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        """Drop all cached results and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.invalidations = 0
+
+    def stats(self):
+        """
+        Get cache counters.
+
+        Returns:
+            dict: Hits, misses, hit rate, invalidations and current size
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
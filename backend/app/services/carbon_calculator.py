@@ -5,99 +5,38 @@ Calculates carbon emissions from various activities:
 - Transportation (car, bus, train, plane)
 - Energy consumption (electricity, heating)
 - Food/diet choices
+
+The calculation itself is ``respira_plus.carbon_calculator.CarbonCalculator``;
+this subclass only counts calls for the /metrics endpoint. It follows the
+active factor set through the base class binding.
 """
 
-class CarbonCalculator:
+from respira_plus.carbon_calculator import CarbonCalculator as BaseCarbonCalculator
+from .metrics import calculator_calls
+
+class CarbonCalculator(BaseCarbonCalculator):
     """
     Calculates carbon footprint based on user activities.
     Emissions are measured in kg CO2e (carbon dioxide equivalent).
     """
-    
-    # Emission factors (kg CO2e per unit)
-    EMISSION_FACTORS = {
-        'transportation': {
-            'car_gasoline_km': 0.192,      # per km
-            'car_diesel_km': 0.171,        # per km
-            'car_electric_km': 0.053,      # per km
-            'bus_km': 0.089,               # per km
-            'train_km': 0.041,             # per km
-            'plane_short_km': 0.255,       # per km (flights < 1500km)
-            'plane_long_km': 0.195,        # per km (flights > 1500km)
-            'bike_km': 0.0,                # per km
-            'walk_km': 0.0,                # per km
-        },
-        'energy': {
-            'electricity_kwh': 0.233,      # per kWh (global average)
-            'natural_gas_kwh': 0.185,      # per kWh
-            'heating_oil_liter': 2.52,     # per liter
-        },
-        'food': {
-            'meat_heavy_day': 7.19,        # per day
-            'meat_medium_day': 5.63,       # per day
-            'meat_low_day': 4.67,          # per day
-            'pescatarian_day': 3.91,       # per day
-            'vegetarian_day': 3.81,        # per day
-            'vegan_day': 2.89,             # per day
-        }
-    }
-    
-    def __init__(self):
-        self.total_emissions = 0.0
-        self.breakdown = {
-            'transportation': 0.0,
-            'energy': 0.0,
-            'food': 0.0
-        }
-    
+
     def calculate_transportation(self, transport_type: str, distance: float) -> float:
         """
         Calculate emissions from transportation.
         """
-        if transport_type not in self.EMISSION_FACTORS['transportation']:
-            raise ValueError(f"Unknown transport type: {transport_type}")
-        
-        emissions = self.EMISSION_FACTORS['transportation'][transport_type] * distance
-        self.breakdown['transportation'] += emissions
-        self.total_emissions += emissions
-        return emissions
-    
+        calculator_calls.inc(('transportation',))
+        return super().calculate_transportation(transport_type, distance)
+
     def calculate_energy(self, energy_type: str, consumption: float) -> float:
         """
         Calculate emissions from energy consumption.
         """
-        if energy_type not in self.EMISSION_FACTORS['energy']:
-            raise ValueError(f"Unknown energy type: {energy_type}")
-        
-        emissions = self.EMISSION_FACTORS['energy'][energy_type] * consumption
-        self.breakdown['energy'] += emissions
-        self.total_emissions += emissions
-        return emissions
-    
+        calculator_calls.inc(('energy',))
+        return super().calculate_energy(energy_type, consumption)
+
     def calculate_food(self, diet_type: str, days: int) -> float:
         """
         Calculate emissions from food consumption based on diet type.
         """
-        if diet_type not in self.EMISSION_FACTORS['food']:
-            raise ValueError(f"Unknown diet type: {diet_type}")
-        
-        emissions = self.EMISSION_FACTORS['food'][diet_type] * days
-        self.breakdown['food'] += emissions
-        self.total_emissions += emissions
-        return emissions
-    
-    def get_total_emissions(self) -> float:
-        """Get total carbon emissions calculated."""
-        return self.total_emissions
-    
-    def get_breakdown(self) -> dict:
-        """Get emissions breakdown by category."""
-        return self.breakdown.copy()
-    
-    def reset(self):
-        """Reset all calculations."""
-        self.total_emissions = 0.0
-        self.breakdown = {
-            'transportation': 0.0,
-            'energy': 0.0,
-            'food': 0.0
-        }
+        calculator_calls.inc(('food',))
+        return super().calculate_food(diet_type, days)
@@ -0,0 +1,77 @@
+"""
+Catalog Responses
+
+The tip and mission catalogs never change while the server runs, so their
+JSON bodies are serialized and gzip-compressed once at startup, together
+with a strong ETag derived from the content. Requests only pick the right
+pre-built bytes: clients that send a matching ``If-None-Match`` get an empty
+304, everyone else gets the stored body (compressed if they accept gzip).
+"""
+
+import gzip
+import hashlib
+import json
+
+from fastapi import Request, Response
+
+from respira_plus.tips_missions import MISSION_CATALOG, TIP_CATALOG
+
+CACHE_CONTROL = "no-cache"
+
+
+def accepts_gzip(accept_encoding):
+    """Whether an Accept-Encoding header allows gzip."""
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            quality = params.strip().lower()
+            if not quality.startswith("q="):
+                return True
+            try:
+                return float(quality[2:]) > 0
+            except ValueError:
+                return False
+    return False
+
+
+class PreparedResponse:
+    """
+    JSON body serialized and compressed once, served with a strong ETag.
+    """
+
+    def __init__(self, payload):
+        self.body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        # mtime=0 keeps the compressed bytes identical across restarts
+        self.gzip_body = gzip.compress(self.body, compresslevel=9, mtime=0)
+        digest = hashlib.sha256(self.body).hexdigest()[:32]
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gzip"'
+
+    def not_modified(self, if_none_match):
+        """Whether an If-None-Match header matches the current body."""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        tags = {tag.strip()[2:] if tag.strip().startswith("W/") else tag.strip()
+                for tag in if_none_match.split(",")}
+        return self.etag in tags or self.gzip_etag in tags
+
+    def respond(self, request: Request) -> Response:
+        """Build the 200 or 304 response for a request."""
+        compressed = accepts_gzip(request.headers.get("accept-encoding", ""))
+        headers = {
+            "ETag": self.gzip_etag if compressed else self.etag,
+            "Cache-Control": CACHE_CONTROL,
+            "Vary": "Accept-Encoding",
+        }
+        if self.not_modified(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=headers)
+        if compressed:
+            headers["Content-Encoding"] = "gzip"
+            return Response(self.gzip_body, media_type="application/json", headers=headers)
+        return Response(self.body, media_type="application/json", headers=headers)
+
+
+tips_response = PreparedResponse([dict(tip) for tip in TIP_CATALOG])
+missions_response = PreparedResponse([dict(mission) for mission in MISSION_CATALOG])
@@ -0,0 +1,70 @@
+"""
+Emission Factor Reloader
+
+Watches the emission factor file and publishes it to
+``respira_plus.emission_factors.FACTOR_SETS`` whenever it changes, so new
+factors reach running workers without a restart. The file is checked by
+modification time on a background thread; calculators pick up the new set
+on their next calculation and earlier versions stay available for
+recalculation.
+
+A file that fails to load (bad JSON, a reused version, different
+categories) leaves the active set in place; the error is kept in
+``last_error`` and counted in ``respira_factor_reloads_total``.
+"""
+
+import threading
+
+from .metrics import factor_reloads
+
+
+class FactorReloader:
+    """
+    Background thread that reloads a factor set file when it changes.
+    """
+
+    def __init__(self, factor_sets, interval=5.0):
+        """
+        Args:
+            factor_sets (FactorSets): Store whose loaded file is watched
+            interval (float): Seconds between checks
+        """
+        self.factor_sets = factor_sets
+        self.interval = interval
+        self.last_error = None
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def check(self):
+        """
+        Reload the file if it changed.
+
+        Returns:
+            bool: Whether a new set was published
+        """
+        try:
+            reloaded = self.factor_sets.reload()
+        except (OSError, ValueError) as e:
+            self.last_error = e
+            factor_reloads.inc(("error",))
+            return False
+        if reloaded:
+            self.last_error = None
+            factor_reloads.inc(("ok",))
+        return reloaded
+
+    def start(self):
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="factor-reloader", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.check()
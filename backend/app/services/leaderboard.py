@@ -0,0 +1,97 @@
+"""
+Leaderboard Service
+
+Points leaderboard of an app's users. Users are keyed by email internally;
+the API only exposes their display names, which are stored with the
+entries so a page needs no user lookups.
+
+The API does not award points yet, so the public page only lists users
+with points and requires authentication; everyone else is ranked at 0
+and can see their own position.
+
+The ranking lives in process memory. ``create_app`` builds it from the user
+repository, so every registered user is ranked after a restart, but with
+several uvicorn workers each worker keeps its own copy: users registered
+through another worker are only listed after a restart (their own
+``/me`` position is added on first request).
+"""
+
+from threading import Lock
+from respira_plus.leaderboard import Leaderboard
+
+
+class UserLeaderboard:
+    """
+    Points leaderboard with the display name of each ranked user.
+
+    Updates come from the event loop (registration) and from threadpool
+    endpoints, and ``Leaderboard`` updates are not atomic, so every access
+    holds ``_lock``.
+    """
+
+    def __init__(self, users=()):
+        """
+        Args:
+            users (iterable): User dicts to rank with 0 points
+        """
+        self.board = Leaderboard(metric="points")
+        self.names = {}
+        self._lock = Lock()
+        for user in users:
+            self.add_user(user)
+
+    def __len__(self):
+        with self._lock:
+            return len(self.board)
+
+    def __contains__(self, email):
+        with self._lock:
+            return email in self.board
+
+    def add_user(self, user, points=0):
+        """Rank a user, keeping the points of one already ranked."""
+        with self._lock:
+            self.names[user["email"]] = user["name"]
+            if user["email"] not in self.board:
+                self.board.set_score(user["email"], points)
+
+    def set_points(self, email, points):
+        with self._lock:
+            self.board.set_score(email, points)
+
+    def points(self, email):
+        with self._lock:
+            return self.board.score(email)
+
+    def rank(self, email):
+        with self._lock:
+            return self.board.rank(email)
+
+    def position(self, email):
+        """
+        Get a user's rank, points and the number of ranked users together.
+
+        Returns:
+            tuple: ``(rank, points, total)``; rank and points are None if
+            the user is not ranked
+        """
+        with self._lock:
+            return self.board.rank(email), self.board.score(email), len(self.board)
+
+    def page(self, limit=20, offset=0):
+        """
+        Get a page of the users that have points.
+
+        Users with 0 points are ranked (see ``position``) but not listed.
+
+        Returns:
+            tuple: ``(total, entries)``, the number of users with points and
+            entries with ``rank``, ``name`` and ``points``
+        """
+        with self._lock:
+            total = self.board.count_above(0)
+            entries = [
+                {"rank": entry["rank"], "name": self.names.get(entry["user_id"], ""), "points": entry["score"]}
+                for entry in self.board.top(limit=max(0, min(limit, total - offset)), offset=offset)
+            ]
+            return total, entries
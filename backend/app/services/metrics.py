@@ -0,0 +1,244 @@
+"""
+In-Process Metrics
+
+Counters, gauges and histograms rendered in the Prometheus text format.
+
+Recording is lock-free: every thread updates its own shard (a plain dict
+reached through ``threading.local``), and shards are only summed when
+``/metrics`` is scraped. Request metrics are recorded on the event loop
+thread, hashing and calculator metrics on the worker threads; none of them
+contend with each other. A lock is taken only when a thread records its
+first value for a metric.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Base class: per-thread shards of ``{label values: value}``."""
+
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards = []
+        self._lock = threading.Lock()
+
+    def _shard(self):
+        try:
+            return self._local.values
+        except AttributeError:
+            values = {}
+            with self._lock:
+                self._shards.append(values)
+            self._local.values = values
+            return values
+
+    def _merged(self):
+        merged = {}
+        for shard in list(self._shards):
+            for key, value in list(shard.items()):
+                merged[key] = self._combine(merged.get(key), value)
+        return merged
+
+    def _combine(self, total, value):
+        return value if total is None else total + value
+
+    def _samples(self):
+        for key, value in sorted(self._merged().items()):
+            yield self.name, _format_labels(self.labelnames, key), value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(f"{name}{labels} {_format_value(value)}" for name, labels, value in self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def inc(self, labels=(), amount=1):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+
+class Gauge(Counter):
+    """Value that goes up and down (per-thread deltas are summed)."""
+
+    kind = "gauge"
+
+    def dec(self, labels=(), amount=1):
+        self.inc(labels, -amount)
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets, plus sum and count."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, labels, value):
+        shard = self._shard()
+        state = shard.get(labels)
+        if state is None:
+            # per-bucket counts (last one is +Inf), then sum
+            state = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    def _combine(self, total, value):
+        value = list(value)
+        return value if total is None else [a + b for a, b in zip(total, value)]
+
+    def _samples(self):
+        bounds = self.buckets + (float("inf"),)
+        for key, state in sorted(self._merged().items()):
+            cumulative = 0
+            for bound, count in zip(bounds, state):
+                cumulative += count
+                yield (f"{self.name}_bucket",
+                       _format_labels(self.labelnames, key, f'le="{_format_value(float(bound))}"'),
+                       cumulative)
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum", labels, state[-1]
+            yield f"{self.name}_count", labels, cumulative
+
+
+class Registry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self):
+        """Render every metric in the Prometheus text format."""
+        return "\n".join(metric.render() for metric in self._metrics) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.counter(
+    "respira_http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"))
+http_errors = registry.counter(
+    "respira_http_request_errors_total", "Requests that raised or returned a 5xx status.", ("method", "route"))
+http_in_flight = registry.gauge(
+    "respira_http_requests_in_flight", "Requests currently being handled.")
+http_latency = registry.histogram(
+    "respira_http_request_duration_seconds", "Request latency by route.", ("method", "route"))
+password_hash_seconds = registry.histogram(
+    "respira_password_hash_seconds", "Time spent hashing or verifying a password.", ("operation",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5))
+calculator_calls = registry.counter(
+    "respira_calculator_calls_total", "Emission calculations performed, by category.", ("category",))
+token_cache_lookups = registry.counter(
+    "respira_token_cache_lookups_total", "Verified-token cache lookups, by result (hit or miss).", ("result",))
+factor_reloads = registry.counter(
+    "respira_factor_reloads_total", "Emission factor file reloads, by result.", ("result",))
+
+
+def timed(histogram, labels, func):
+    """Wrap ``func`` so each call is observed in ``histogram``."""
+    def wrapper(*args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            histogram.observe(labels, time.perf_counter() - start)
+    return wrapper
+
+
+def route_label(scope):
+    """
+    Route template of a handled request, or 'unmatched'.
+
+    A matched route without path parameters has exactly one path, so the
+    request path is its template (including any router prefix).
+    """
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    if scope.get("path_params"):
+        return route.path
+    return scope["path"]
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request count, latency, in-flight requests
+    and errors per route template (e.g. ``/api/calculate/transport``).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            status = 500
+            raise
+        finally:
+            http_in_flight.dec()
+            labels = (scope["method"], route_label(scope))
+            http_latency.observe(labels, time.perf_counter() - start)
+            http_requests.inc(labels + (str(status),))
+            if status >= 500:
+                http_errors.inc(labels)
@@ -0,0 +1,76 @@
+"""
+Password Hashing Service
+
+Runs password hashing and verification on a dedicated, size-limited worker
+pool so a burst of logins cannot occupy the threads that serve the cheap
+endpoints. pbkdf2 (hashlib) releases the GIL while it works, so a thread
+pool gives real parallelism without the cost of a process pool.
+
+Callers await ``hash``/``verify``. When more than ``max_pending`` operations
+are queued or running, ``HasherBusyError`` is raised immediately instead of
+letting the queue grow; the API turns it into a 503.
+"""
+
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from .metrics import password_hash_seconds, timed
+from .profiling import tracked
+
+
+class HasherBusyError(Exception):
+    """Raised when the hashing queue is full."""
+
+
+class PasswordHasher:
+    """
+    Bounded async front-end for a passlib ``CryptContext``.
+    """
+
+    def __init__(self, context, max_workers=2, max_pending=32):
+        if max_pending < max_workers:
+            raise ValueError("max_pending must be at least max_workers")
+        self.context = context
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.rejected = 0
+        self._executor = None
+
+    def _submit(self, func, *args):
+        # Only touched from the event loop thread, so a plain counter is safe.
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HasherBusyError("Password hashing queue is full")
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="password-hasher"
+            )
+        self.pending += 1
+        loop = asyncio.get_running_loop()
+        # Run in the caller's context so a profiled request also samples the hashing thread
+        context = contextvars.copy_context()
+        return loop.run_in_executor(self._executor, context.run, tracked(func), *args)
+
+    async def _run(self, func, *args):
+        future = self._submit(func, *args)
+        try:
+            return await future
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        """Hash a password on the worker pool."""
+        return await self._run(timed(password_hash_seconds, ("hash",), self.context.hash), password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash on the worker pool."""
+        return await self._run(timed(password_hash_seconds, ("verify",), self.context.verify),
+                               password, hashed_password)
+
+    def shutdown(self):
+        """Stop the worker pool, waiting for running operations."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,291 @@
+"""
+Request Profiling
+
+Opt-in, sampled profiling of API requests. Off by default: unless it is
+enabled, the middleware is not even installed.
+
+Enable it with environment variables (see ``app.config.Settings``):
+
+- ``RESPIRA_PROFILE=1`` profiles a random ``RESPIRA_PROFILE_RATE`` fraction
+  of requests (default 0.01);
+- ``RESPIRA_PROFILE_TOKEN=<secret>`` profiles any request sent with the
+  header ``X-Respira-Profile: <secret>``;
+- ``RESPIRA_PROFILE_DIR`` sets the output directory (default ``profiles``).
+
+While a profiled request runs, a background thread samples, every few
+milliseconds, the stacks of the threads working on that request: the event
+loop thread, plus any worker thread running one of its sync handlers
+(routes built with ``TrackedRoute``) or functions wrapped with ``tracked``
+(password hashing). Worker threads are tied to the request through a
+context variable, so concurrent unprofiled requests running on other
+workers are left out; async code of other requests sharing the event loop
+can still appear. A stack sampler is used instead of cProfile because most
+of the work runs on worker threads, which a per-thread cProfile on the
+event loop would not see.
+
+Samples are aggregated per route and flushed to
+``<directory>/profile.collapsed`` from a background thread, in the
+collapsed-stack format read by flamegraph.pl, speedscope and similar tools:
+``<method> <route>;<outer frame>;...;<inner frame> <count>``.
+"""
+
+import functools
+import hmac
+import inspect
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from fastapi.routing import APIRoute
+
+from .metrics import route_label
+
+PROFILE_HEADER = "x-respira-profile"
+OUTPUT_FILE = "profile.collapsed"
+MAX_DEPTH = 128
+
+# A thread whose innermost frame is in one of these modules is waiting, not working
+IDLE_MODULES = ("threading.py", "selectors.py", "queue.py")
+# Innermost (file, function) of a thread pool worker blocked on its work queue
+IDLE_FRAMES = (("thread.py", "_worker"),)
+
+# Recording of the profiled request being handled, if any
+_recording = ContextVar("respira_profile_recording", default=None)
+
+
+def _frame_name(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def collapse(frame):
+    """
+    Collapsed stack of a frame, outermost first, or None for an idle thread.
+    """
+    filename = os.path.basename(frame.f_code.co_filename)
+    if filename in IDLE_MODULES or (filename, frame.f_code.co_name) in IDLE_FRAMES:
+        return None
+    names = []
+    while frame is not None and len(names) < MAX_DEPTH:
+        names.append(_frame_name(frame.f_code))
+        frame = frame.f_back
+    names.reverse()
+    return ";".join(names)
+
+
+class Recording:
+    """
+    Samples of one profiled request and the threads currently working on it.
+    """
+
+    __slots__ = ("samples", "threads")
+
+    def __init__(self, thread_id):
+        self.samples = Counter()
+        self.threads = {thread_id}
+
+
+def tracked(func):
+    """
+    Wrap ``func`` so the thread running it is sampled for the profiled
+    request of the calling context, if any.
+
+    The context must reach the worker thread: Starlette's threadpool copies
+    it, a ``concurrent.futures`` executor needs ``contextvars.copy_context().run``.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        recording = _recording.get()
+        if recording is None:
+            return func(*args, **kwargs)
+        thread_id = threading.get_ident()
+        recording.threads.add(thread_id)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            recording.threads.discard(thread_id)
+    return wrapper
+
+
+class TrackedRoute(APIRoute):
+    """
+    API route whose sync endpoint is ``tracked``, so profiled requests
+    include the threadpool worker that runs it.
+    """
+
+    def __init__(self, path, endpoint, **kwargs):
+        if not inspect.iscoroutinefunction(endpoint):
+            endpoint = tracked(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+class StackSampler:
+    """
+    Samples the threads of every open recording while at least one is open.
+    """
+
+    def __init__(self, interval=0.002):
+        self.interval = interval
+        self._recordings = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self, thread_id=None):
+        """
+        Open a recording.
+
+        Args:
+            thread_id (int, optional): First thread to sample (default: the calling thread)
+
+        Returns:
+            Recording: Receives the samples until ``stop``
+        """
+        recording = Recording(threading.get_ident() if thread_id is None else thread_id)
+        with self._lock:
+            self._recordings[id(recording)] = recording
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+        return recording
+
+    def stop(self, recording):
+        """Close a recording."""
+        with self._lock:
+            self._recordings.pop(id(recording), None)
+
+    def _run(self):
+        while True:
+            # Sampling under the lock means a recording is complete once stop() returns
+            with self._lock:
+                if not self._recordings:
+                    self._thread = None
+                    return
+                frames = sys._current_frames()
+                stacks = {}
+                for recording in self._recordings.values():
+                    for thread_id in tuple(recording.threads):
+                        if thread_id not in stacks:
+                            frame = frames.get(thread_id)
+                            stacks[thread_id] = collapse(frame) if frame is not None else None
+                        stack = stacks[thread_id]
+                        if stack is not None:
+                            recording.samples[stack] += 1
+                del frames
+            time.sleep(self.interval)
+
+
+class RequestProfiler:
+    """
+    Chooses requests to profile and aggregates their samples on disk.
+    """
+
+    def __init__(self, directory="profiles", rate=0.0, token=None, interval=0.002, flush_interval=1.0):
+        """
+        Args:
+            directory (str): Output directory
+            rate (float): Fraction of requests profiled at random
+            token (str, optional): Secret that forces profiling via the header
+            interval (float): Seconds between stack samples
+            flush_interval (float): Seconds between writes of the output file
+        """
+        self.directory = directory
+        self.rate = rate
+        self.token = token
+        self.sampler = StackSampler(interval)
+        self.flush_interval = flush_interval
+        self.profiled = 0
+        self._stacks = Counter()
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._flusher = None
+
+    def wants(self, scope):
+        """Whether a request should be profiled."""
+        if self.token is not None:
+            for name, value in scope.get("headers", ()):
+                if name == PROFILE_HEADER.encode("latin-1"):
+                    return hmac.compare_digest(value, self.token.encode("latin-1"))
+        return self.rate > 0 and random.random() < self.rate
+
+    def record(self, label, samples):
+        """Add the samples of one request under ``label``; written by the next flush."""
+        with self._lock:
+            self.profiled += 1
+            for stack, count in samples.items():
+                self._stacks[f"{label};{stack}"] += count
+            self._dirty = True
+            if self._flusher is None and not self._stopped.is_set():
+                self._flusher = threading.Thread(target=self._run, name="profile-writer", daemon=True)
+                self._flusher.start()
+
+    def flush(self):
+        """Rewrite the output file if new samples were recorded."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                lines = [f"{stack} {count}\n" for stack, count in sorted(self._stacks.items())]
+                self._dirty = False
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, OUTPUT_FILE)
+            temp_path = path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.writelines(lines)
+            os.replace(temp_path, path)
+
+    def close(self):
+        """Stop the writer thread and write any pending samples."""
+        self._stopped.set()
+        with self._lock:
+            flusher = self._flusher
+        if flusher is not None:
+            flusher.join()
+        self.flush()
+
+    def _run(self):
+        while not self._stopped.wait(self.flush_interval):
+            self.flush()
+
+
+def create_profiler(settings):
+    """
+    Build the profiler configured by the app settings.
+
+    Returns:
+        RequestProfiler or None: None when profiling is disabled
+    """
+    if not settings.profile and settings.profile_token is None:
+        return None
+    rate = settings.profile_rate if settings.profile else 0.0
+    return RequestProfiler(settings.profile_dir, rate, settings.profile_token)
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that samples stacks during the requests chosen by a
+    ``RequestProfiler``.
+    """
+
+    def __init__(self, app, profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.profiler.wants(scope):
+            await self.app(scope, receive, send)
+            return
+
+        recording = self.profiler.sampler.start()
+        token = _recording.set(recording)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _recording.reset(token)
+            self.profiler.sampler.stop(recording)
+            label = f"{scope['method']} {route_label(scope)}"
+            self.profiler.record(label.replace(";", ","), recording.samples)
@@ -0,0 +1,10 @@
+"""
+Recommendation Service
+
+Shared tip and mission recommender for the API routers, built once from
+the bundled catalog.
+"""
+
+from respira_plus.recommendations import Recommender
+
+recommender = Recommender()
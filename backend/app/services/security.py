@@ -0,0 +1,87 @@
+"""
+Security Service
+
+Password hashing and access tokens for one app instance.
+
+``jose`` and ``passlib`` are imported, and the ``CryptContext`` and hashing
+pool built, on first use rather than at import, so starting a worker does
+not pay for them until the first login, registration or authenticated
+request.
+"""
+
+from datetime import datetime, timedelta
+from typing import Optional
+
+from .password_hasher import PasswordHasher
+from .token_cache import TokenCache
+
+
+class InvalidTokenError(Exception):
+    """Raised when an access token fails verification."""
+
+
+class Security:
+    """
+    Lazily initialized password hasher and JWT helpers.
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.token_cache = TokenCache(maxsize=settings.token_cache_size)
+        self._pwd_context = None
+        self._password_hasher = None
+        self._jwt = None
+
+    @property
+    def pwd_context(self):
+        if self._pwd_context is None:
+            from passlib.context import CryptContext
+            # Use a widely supported hashing scheme to avoid bcrypt backend issues on Windows
+            self._pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+        return self._pwd_context
+
+    @property
+    def password_hasher(self) -> PasswordHasher:
+        if self._password_hasher is None:
+            self._password_hasher = PasswordHasher(
+                self.pwd_context,
+                max_workers=self.settings.hash_workers,
+                max_pending=self.settings.hash_max_pending,
+            )
+        return self._password_hasher
+
+    @property
+    def jwt(self):
+        if self._jwt is None:
+            from jose import jwt
+            self._jwt = jwt
+        return self._jwt
+
+    def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None) -> str:
+        to_encode = data.copy()
+        if expires_delta is None:
+            expires_delta = timedelta(minutes=self.settings.access_token_expire_minutes)
+        to_encode.update({"exp": datetime.utcnow() + expires_delta})
+        return self.jwt.encode(to_encode, self.settings.secret_key, algorithm=self.settings.algorithm)
+
+    def decode_access_token(self, token: str) -> dict:
+        """
+        Verify a token, using the cache of already verified tokens.
+
+        Raises:
+            InvalidTokenError: If the token is invalid or expired
+        """
+        payload = self.token_cache.get(token)
+        if payload is None:
+            from jose import JWTError
+            try:
+                payload = self.jwt.decode(token, self.settings.secret_key, algorithms=[self.settings.algorithm])
+            except JWTError as e:
+                raise InvalidTokenError(str(e)) from e
+            self.token_cache.put(token, payload)
+        return payload
+
+    def shutdown(self):
+        """Stop the hashing pool if it was started."""
+        if self._password_hasher is not None:
+            self._password_hasher.shutdown()
@@ -0,0 +1,89 @@
+"""
+Verified Token Cache
+
+Bounded LRU cache of decoded JWT payloads keyed by the raw token. Entries
+expire at the token's ``exp`` claim, so a cached token is never accepted
+after it would have failed verification. Only successfully verified tokens
+are stored. Hits and misses are also exported as
+``respira_token_cache_lookups_total`` on ``/metrics``.
+"""
+
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from .metrics import token_cache_lookups
+
+
+class TokenCache:
+    """
+    LRU cache of verified token payloads with per-entry expiry.
+    """
+
+    def __init__(self, maxsize=10000, clock=time.time):
+        self.maxsize = maxsize
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, token):
+        """
+        Get the cached payload for a token.
+
+        Returns:
+            dict or None: Payload if cached and not expired
+        """
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None:
+                payload, expires_at = entry
+                if expires_at > self.clock():
+                    self._entries.move_to_end(token)
+                    self.hits += 1
+                    token_cache_lookups.inc(("hit",))
+                    return payload
+                del self._entries[token]
+            self.misses += 1
+            token_cache_lookups.inc(("miss",))
+            return None
+
+    def put(self, token, payload):
+        """
+        Cache a verified payload until its ``exp`` claim.
+
+        Tokens without an ``exp`` claim are not cached.
+        """
+        expires_at = payload.get("exp")
+        if expires_at is None or expires_at <= self.clock():
+            return
+        with self._lock:
+            self._entries[token] = (payload, expires_at)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached tokens."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Get cache counters.
+
+        Returns:
+            dict: Hits, misses, hit rate and current size
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
@@ -0,0 +1,178 @@
+"""
+User Repository Service
+
+Storage backends for registered users. Users are plain dicts with ``name``,
+``email`` and ``hashed_password`` keys.
+
+- ``InMemoryUserRepository``: process-local dict, lost on restart.
+- ``SQLiteUserRepository``: durable and shareable across uvicorn workers.
+  Uses WAL mode so readers never block the writer, a unique index on
+  ``email``, and a small pool of connections whose statement caches keep
+  the fixed SQL below prepared.
+"""
+
+import queue
+import sqlite3
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+
+class UserRepository(ABC):
+    """
+    Interface for user storage backends.
+
+    ``blocking`` backends do I/O and must not be called from the event loop.
+    """
+
+    blocking = True
+
+    @abstractmethod
+    def get(self, email):
+        """
+        Get a user by email.
+
+        Returns:
+            dict or None: User if found
+        """
+
+    @abstractmethod
+    def add(self, user):
+        """
+        Add a new user.
+
+        Returns:
+            bool: False if the email is already registered
+        """
+
+    @abstractmethod
+    def users(self):
+        """
+        Iterate over all users.
+
+        Yields:
+            dict: User
+        """
+
+    def __contains__(self, email):
+        return self.get(email) is not None
+
+    def close(self):
+        """Release any resources held by the backend."""
+
+
+class InMemoryUserRepository(UserRepository):
+    """
+    Users kept in a dict keyed by email.
+    """
+
+    blocking = False
+
+    def __init__(self):
+        self._users = {}
+
+    def get(self, email):
+        return self._users.get(email)
+
+    def add(self, user):
+        stored = dict(user)
+        return self._users.setdefault(user["email"], stored) is stored
+
+    def users(self):
+        return iter(list(self._users.values()))
+
+    def __len__(self):
+        return len(self._users)
+
+
+class SQLiteUserRepository(UserRepository):
+    """
+    Users stored in a SQLite database with pooled connections.
+
+    ``path`` must be a database file: every pooled connection opens it
+    separately, so ``:memory:`` would give each connection its own database.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS users ("
+        " id INTEGER PRIMARY KEY,"
+        " email TEXT NOT NULL,"
+        " name TEXT NOT NULL,"
+        " hashed_password TEXT NOT NULL)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS users_email ON users (email)",
+    )
+    SELECT_USER = "SELECT name, email, hashed_password FROM users WHERE email = ?"
+    SELECT_USERS = "SELECT name, email, hashed_password FROM users ORDER BY id"
+    INSERT_USER = "INSERT INTO users (email, name, hashed_password) VALUES (?, ?, ?)"
+
+    def __init__(self, path, pool_size=4, timeout=5.0):
+        self.path = path
+        self.timeout = timeout
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
+        with self._connection() as conn:
+            for statement in self.SCHEMA:
+                conn.execute(statement)
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.path, timeout=self.timeout, check_same_thread=False, isolation_level=None
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        conn = self._pool.get(timeout=self.timeout)
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def get(self, email):
+        with self._connection() as conn:
+            row = conn.execute(self.SELECT_USER, (email,)).fetchone()
+        if row is None:
+            return None
+        return {"name": row[0], "email": row[1], "hashed_password": row[2]}
+
+    def users(self):
+        with self._connection() as conn:
+            rows = conn.execute(self.SELECT_USERS).fetchall()
+        for row in rows:
+            yield {"name": row[0], "email": row[1], "hashed_password": row[2]}
+
+    def add(self, user):
+        try:
+            with self._connection() as conn:
+                conn.execute(self.INSERT_USER, (user["email"], user["name"], user["hashed_password"]))
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def __len__(self):
+        with self._connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+def create_user_repository(database_path=None):
+    """
+    Create the user repository for a database path.
+
+    Args:
+        database_path (str, optional): SQLite file; in-memory storage if empty
+
+    Returns:
+        UserRepository: Repository instance
+    """
+    if database_path:
+        return SQLiteUserRepository(database_path)
+    return InMemoryUserRepository()
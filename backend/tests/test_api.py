@@ -1,3 +1,5 @@
+import contextvars
+import sys
 from fastapi.testclient import TestClient
 from app.main import app
 
@@ -52,6 +54,48 @@ def test_invalid_transport_type():
     )
     assert response.status_code == 400
 
+def test_calculate_batch():
+    """Testa o cálculo em lote com itens de categorias diferentes."""
+    response = client.post(
+        "/api/calculate/batch",
+        json={"items": [
+            {"category": "transportation", "activity_type": "car_gasoline_km", "quantity": 100},
+            {"category": "energy", "activity_type": "electricity_kwh", "quantity": 100},
+            {"category": "food", "activity_type": "vegan_day", "quantity": 7},
+        ]}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["items"]) == 3
+    assert data["items"][0]["category"] == "transportation"
+    assert abs(data["items"][0]["emissions_kg"] - 19.2) < 0.01
+    assert abs(data["breakdown"]["energy"] - 23.3) < 0.01
+    # 19.2 + 23.3 + 20.23 = 62.73
+    assert abs(data["total_emissions_kg"] - 62.73) < 0.01
+
+def test_calculate_batch_invalid_item():
+    """Testa o tratamento de erro para item inválido no lote."""
+    response = client.post(
+        "/api/calculate/batch",
+        json={"items": [
+            {"category": "food", "activity_type": "vegan_day", "quantity": 1},
+            {"category": "transportation", "activity_type": "rocket_ship", "quantity": 100},
+        ]}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Item 1:")
+
+def test_calculate_batch_too_many_items():
+    """Testa que lotes acima do limite são rejeitados na validação do modelo."""
+    from app.api.endpoints.calculator import MAX_BATCH_ITEMS
+
+    item = {"category": "food", "activity_type": "vegan_day", "quantity": 1}
+    response = client.post("/api/calculate/batch", json={"items": [item] * (MAX_BATCH_ITEMS + 1)})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "too_long"
+    response = client.post("/api/calculate/batch", json={"items": [item] * MAX_BATCH_ITEMS})
+    assert response.status_code == 200
+
 def test_register_user():
     """Testa o registro de um novo usuário."""
     response = client.post(
@@ -104,3 +148,470 @@ def test_login_invalid_credentials():
         json={"email": "nonexistent@example.com", "password": "wrongpassword"}
     )
     assert response.status_code == 401
+
+def test_login_returns_503_when_hasher_is_busy():
+    """Testa que o login responde 503 quando a fila de hashing está cheia."""
+    hasher = app.state.security.password_hasher
+
+    email = "busy@example.com"
+    client.post(
+        "/api/auth/register",
+        json={"name": "Busy User", "email": email, "password": "password123"}
+    )
+    pending = hasher.pending
+    hasher.pending = hasher.max_pending
+    try:
+        response = client.post(
+            "/api/auth/login",
+            json={"email": email, "password": "password123"}
+        )
+    finally:
+        hasher.pending = pending
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+def test_read_current_user_uses_token_cache():
+    """Testa o endpoint autenticado e o cache de verificação de tokens."""
+    token_cache = app.state.security.token_cache
+
+    response = client.post(
+        "/api/auth/register",
+        json={"name": "Me User", "email": "me@example.com", "password": "password123"}
+    )
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    hits = token_cache.hits
+
+    first = client.get("/api/auth/me", headers=headers)
+    second = client.get("/api/auth/me", headers=headers)
+    assert first.status_code == 200
+    assert second.json() == {"name": "Me User", "email": "me@example.com"}
+    assert token_cache.hits == hits + 1
+
+def test_read_current_user_invalid_token():
+    """Testa o endpoint autenticado com token inválido ou ausente."""
+    assert client.get("/api/auth/me").status_code == 401
+    response = client.get("/api/auth/me", headers={"Authorization": "Bearer not-a-token"})
+    assert response.status_code == 401
+
+def test_token_cache_expiry_and_eviction():
+    """Testa a expiração por exp e o limite LRU do cache de tokens."""
+    from app.services.token_cache import TokenCache
+
+    now = [1000.0]
+    cache = TokenCache(maxsize=2, clock=lambda: now[0])
+    cache.put("a", {"sub": "a", "exp": 1010})
+    cache.put("b", {"sub": "b", "exp": 2000})
+    assert cache.get("a") == {"sub": "a", "exp": 1010}
+    cache.put("c", {"sub": "c", "exp": 2000})
+    assert cache.get("b") is None  # least recently used
+    now[0] = 1010.0
+    assert cache.get("a") is None  # expired
+    assert cache.stats()["hits"] == 1
+
+def test_sqlite_user_repository(tmp_path):
+    """Testa o repositório de usuários em SQLite e a persistência entre instâncias."""
+    from app.services.user_repository import SQLiteUserRepository
+
+    path = str(tmp_path / "users.db")
+    repository = SQLiteUserRepository(path, pool_size=2)
+    user = {"name": "SQL User", "email": "sql@example.com", "hashed_password": "hash"}
+    assert repository.add(user)
+    assert not repository.add(dict(user, name="Other"))
+    repository.close()
+
+    reopened = SQLiteUserRepository(path, pool_size=2)
+    assert reopened.get("sql@example.com") == user
+    assert reopened.get("missing@example.com") is None
+    assert len(reopened) == 1
+    reopened.close()
+
+def test_user_repository_interface():
+    """Testa que um repositório incompleto falha ao ser criado."""
+    import pytest
+    from app.services.user_repository import InMemoryUserRepository, UserRepository
+
+    class Incomplete(UserRepository):
+        def get(self, email):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
+    assert not InMemoryUserRepository.blocking
+
+def test_sqlite_auth_runs_off_event_loop(tmp_path, monkeypatch):
+    """Testa que as chamadas ao SQLite no cadastro e login não rodam na thread do event loop."""
+    import threading
+    from app.config import Settings
+    from app.main import create_app
+    from app.services.user_repository import SQLiteUserRepository
+
+    threads = set()
+    original_get = SQLiteUserRepository.get
+
+    def recording_get(self, email):
+        threads.add(threading.get_ident())
+        return original_get(self, email)
+
+    monkeypatch.setattr(SQLiteUserRepository, "get", recording_get)
+    custom = create_app(Settings(user_db_path=str(tmp_path / "users.db")))
+    loop_threads = set()
+
+    @custom.middleware("http")
+    async def record_loop_thread(request, call_next):
+        loop_threads.add(threading.get_ident())
+        return await call_next(request)
+
+    credentials = {"email": "offloop@example.com", "password": "password123"}
+    # Um único event loop durante o teste, para que seu id de thread não seja reaproveitado
+    with TestClient(custom) as custom_client:
+        assert custom_client.post("/api/auth/register", json=dict(credentials, name="Off Loop")).status_code == 200
+        assert custom_client.post("/api/auth/login", json=credentials).status_code == 200
+    assert threads and not threads & loop_threads
+
+def test_leaderboard_pagination_and_position():
+    """Testa a paginação do ranking e a posição do usuário autenticado."""
+    leaderboard = app.state.leaderboard
+
+    response = client.post(
+        "/api/auth/register",
+        json={"name": "Ranked User", "email": "ranked@example.com", "password": "password123"}
+    )
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    leaderboard.set_points("ranked@example.com", 1000)
+
+    assert client.get("/api/leaderboard").status_code == 401
+    page = client.get("/api/leaderboard", params={"limit": 1}, headers=headers)
+    assert page.status_code == 200
+    data = page.json()
+    assert data["total"] == leaderboard.board.count_above(0)
+    assert data["entries"] == [{"rank": 1, "name": "Ranked User", "points": 1000}]
+
+    position = client.get("/api/leaderboard/me", headers=headers)
+    assert position.status_code == 200
+    assert position.json()["rank"] == 1
+
+    assert client.get("/api/leaderboard", params={"limit": 500}, headers=headers).status_code == 422
+
+def test_leaderboard_lists_only_users_with_points():
+    """Testa que usuários sem pontos não aparecem na listagem, mas têm sua posição."""
+    response = client.post(
+        "/api/auth/register",
+        json={"name": "Zero Points", "email": "zero@example.com", "password": "password123"}
+    )
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    data = client.get("/api/leaderboard", params={"limit": 100}, headers=headers).json()
+    assert "Zero Points" not in [entry["name"] for entry in data["entries"]]
+    assert all(entry["points"] > 0 for entry in data["entries"])
+    assert data["total"] == len(data["entries"])
+
+    position = client.get("/api/leaderboard/me", headers=headers).json()
+    assert position["points"] == 0
+    assert position["rank"] > data["total"]
+
+def test_leaderboard_concurrent_updates():
+    """Testa que atualizações concorrentes mantêm o ranking ordenado."""
+    import threading
+    from app.services.leaderboard import UserLeaderboard
+
+    leaderboard = UserLeaderboard()
+
+    def update(worker):
+        for i in range(200):
+            email = f"user{i % 20}@example.com"
+            leaderboard.add_user({"email": email, "name": email})
+            leaderboard.set_points(email, (i * 7 + worker) % 50)
+
+    workers = [threading.Thread(target=update, args=(n,)) for n in range(8)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    keys = leaderboard.board._keys
+    assert keys == sorted(keys)
+    assert len(leaderboard) == 20
+
+def test_leaderboard_rebuilt_from_user_db(tmp_path):
+    """Testa que o ranking é reconstruído a partir do banco de usuários após reiniciar."""
+    from app.config import Settings
+    from app.main import create_app
+
+    settings = Settings(user_db_path=str(tmp_path / "users.db"))
+    first = create_app(settings)
+    response = TestClient(first).post(
+        "/api/auth/register",
+        json={"name": "Persisted User", "email": "persisted@example.com", "password": "password123"}
+    )
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    restarted = create_app(settings)
+    restarted_client = TestClient(restarted)
+    assert restarted.state.leaderboard is not first.state.leaderboard
+    position = restarted_client.get("/api/leaderboard/me", headers=headers)
+    assert position.status_code == 200
+    assert position.json()["name"] == "Persisted User"
+    assert "persisted@example.com" in restarted.state.leaderboard
+    assert position.json()["rank"] == 1
+    first.state.users_db.close()
+    restarted.state.users_db.close()
+
+def test_recommended_tips_follow_breakdown():
+    """Testa que as recomendações priorizam a categoria com mais emissões."""
+    response = client.get("/api/tips/recommended", params={"energy": 80.0, "food": 20.0, "limit": 3})
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["tips"]) == 3
+    assert data["tips"][0]["category"] == "energy"
+    assert data["tips"][0]["impact"] == "high"
+    assert data["missions"][0]["category"] == "energy"
+    scores = [tip["score"] for tip in data["tips"]]
+    assert scores == sorted(scores, reverse=True)
+
+def test_calculation_cache_hits_and_invalidation(monkeypatch):
+    """Testa o cache de cálculos e a invalidação quando os fatores mudam."""
+    from app.services.carbon_calculator import CarbonCalculator
+    from respira_plus.emission_factors import EMISSION_FACTORS, FactorRegistry
+
+    calculation_cache = app.state.calculation_cache
+    calculation_cache.clear()
+    body = {"energy_type": "electricity_kwh", "consumption": 100}
+    first = client.post("/api/calculate/energy", json=body).json()
+    second = client.post("/api/calculate/energy", json=body).json()
+    assert first == second
+    stats = client.get("/api/calculate/cache").json()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+    factors = {category: dict(values) for category, values in EMISSION_FACTORS.items()}
+    factors["energy"]["electricity_kwh"] = 1.0
+    monkeypatch.setattr(CarbonCalculator, "registry", FactorRegistry(factors))
+    response = client.post("/api/calculate/energy", json=body)
+    assert response.json()["emissions_kg"] == 100.0
+    assert calculation_cache.stats()["invalidations"] == 1
+
+def test_backend_calculator_extends_library():
+    """Testa que a calculadora do backend herda da biblioteca e segue o conjunto de fatores ativo."""
+    from app.services.carbon_calculator import CarbonCalculator
+    from respira_plus import carbon_calculator
+
+    assert issubclass(CarbonCalculator, carbon_calculator.CarbonCalculator)
+    assert CarbonCalculator.registry is carbon_calculator.CarbonCalculator.factor_sets.active
+    result = CarbonCalculator().calculate_batch(["bus_km"], [10])
+    assert result["total_emissions_kg"] == CarbonCalculator().calculate_transportation("bus_km", 10)
+
+def test_catalog_etag_and_gzip():
+    """Testa o catálogo pré-serializado com ETag, gzip e resposta 304."""
+    response = client.get("/api/tips", headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    assert "Content-Encoding" not in response.headers
+    assert response.json()[0]["id"] == 1
+    etag = response.headers["ETag"]
+
+    revalidated = client.get("/api/tips", headers={"Accept-Encoding": "identity", "If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+
+    compressed = client.get("/api/missions", headers={"Accept-Encoding": "gzip"})
+    assert compressed.status_code == 200
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert compressed.json()[0]["title"] == "Public Transport Challenge"
+
+    stale = client.get("/api/missions", headers={"If-None-Match": '"outdated"'})
+    assert stale.status_code == 200
+
+def test_metrics_endpoint():
+    """Testa as métricas no formato Prometheus."""
+    client.post("/api/calculate/transport", json={"transport_type": "bus_km", "distance_km": 3.5})
+    client.post("/api/calculate/transport", json={"transport_type": "teleport", "distance_km": 1})
+    client.post("/api/auth/login", json={"email": "nobody@example.com", "password": "x"})
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'respira_http_requests_total{method="POST",route="/api/calculate/transport",status="200"}' in body
+    assert 'respira_http_requests_total{method="POST",route="/api/calculate/transport",status="400"}' in body
+    assert 'respira_http_request_duration_seconds_bucket{method="POST",route="/api/calculate/transport",le="+Inf"}' in body
+    assert "respira_http_requests_in_flight 1" in body
+    assert 'respira_calculator_calls_total{category="transportation"}' in body
+
+def test_token_cache_metrics():
+    """Testa que acertos e falhas do cache de tokens aparecem em /metrics."""
+    import re
+
+    def lookups(result):
+        match = re.search(rf'respira_token_cache_lookups_total{{result="{result}"}} (\d+)', client.get("/metrics").text)
+        return int(match.group(1)) if match else 0
+
+    response = client.post(
+        "/api/auth/register",
+        json={"name": "Metrics User", "email": "metrics@example.com", "password": "password123"}
+    )
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    hits, misses = lookups("hit"), lookups("miss")
+    client.get("/api/auth/me", headers=headers)
+    client.get("/api/auth/me", headers=headers)
+    assert lookups("miss") == misses + 1
+    assert lookups("hit") == hits + 1
+
+def test_metrics_histogram_and_threads():
+    """Testa a agregação de histogramas registrados em várias threads."""
+    import threading
+    from app.services.metrics import Histogram
+
+    histogram = Histogram("test_seconds", "Test.", ("op",), buckets=(0.1, 1.0))
+    threads = [threading.Thread(target=lambda: [histogram.observe(("x",), 0.5) for _ in range(100)])
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    histogram.observe(("x",), 0.1)
+
+    text = histogram.render()
+    assert 'test_seconds_bucket{op="x",le="0.1"} 1' in text
+    assert 'test_seconds_bucket{op="x",le="1.0"} 401' in text
+    assert 'test_seconds_count{op="x"} 401' in text
+
+def test_request_profiling(tmp_path):
+    """Testa o perfilamento sob demanda com o cabeçalho de administrador."""
+    from app.config import Settings
+    from app.services.profiling import ProfilingMiddleware, RequestProfiler, create_profiler
+
+    assert create_profiler(Settings.from_env({})) is None
+    profiler = RequestProfiler(str(tmp_path), rate=0.0, token="secret", interval=0.0005)
+    profiled_client = TestClient(ProfilingMiddleware(app, profiler))
+
+    profiled_client.get("/api/tips")
+    assert profiler.profiled == 0
+
+    response = profiled_client.post(
+        "/api/auth/register",
+        json={"name": "Profiled", "email": "profiled@example.com", "password": "password123"},
+        headers={"X-Respira-Profile": "secret"},
+    )
+    assert response.status_code == 200
+    assert profiler.profiled == 1
+    profiler.close()
+    lines = (tmp_path / "profile.collapsed").read_text().splitlines()
+    assert lines
+    assert all(line.startswith("POST /api/auth/register;") for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    # The hashing thread is sampled for the profiled request
+    assert any("pbkdf2" in line or "hash (" in line for line in lines)
+
+def test_profiling_samples_only_request_threads():
+    """Testa que o perfilamento ignora threads ociosas e de outras requisições."""
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from app.services.profiling import StackSampler, collapse, tracked, _recording
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    executor.submit(lambda: None).result()
+    worker = next(t for t in threading.enumerate() if t.name.startswith("ThreadPoolExecutor"))
+    time.sleep(0.01)
+    assert collapse(sys._current_frames()[worker.ident]) is None
+    executor.shutdown()
+
+    def busy_unprofiled():
+        end = time.perf_counter() + 0.05
+        while time.perf_counter() < end:
+            pass
+
+    def busy_profiled():
+        end = time.perf_counter() + 0.05
+        while time.perf_counter() < end:
+            pass
+
+    sampler = StackSampler(interval=0.0005)
+    other = threading.Thread(target=busy_unprofiled)
+    other.start()
+    recording = sampler.start()
+    token = _recording.set(recording)
+    try:
+        profiled = threading.Thread(target=contextvars.copy_context().run, args=(tracked(busy_profiled),))
+        profiled.start()
+        profiled.join()
+    finally:
+        _recording.reset(token)
+        sampler.stop(recording)
+    other.join()
+    stacks = list(recording.samples)
+    assert any("busy_profiled" in stack for stack in stacks)
+    assert not any("busy_unprofiled" in stack for stack in stacks)
+
+def test_create_app_with_settings(tmp_path):
+    """Testa a fábrica de aplicação com configurações próprias."""
+    import sys
+    from app.config import Settings
+    from app.main import create_app
+
+    custom = create_app(Settings(secret_key="other-secret", user_db_path=str(tmp_path / "users.db"),
+                                 calculation_cache_size=0))
+    custom_client = TestClient(custom)
+    assert custom.state.security._pwd_context is None
+    response = custom_client.post(
+        "/api/auth/register",
+        json={"name": "Factory User", "email": "factory@example.com", "password": "password123"}
+    )
+    assert response.status_code == 200
+    assert "passlib.context" in sys.modules
+    assert len(custom.state.users_db) == 1
+
+    # Tokens signed with another app's secret are rejected
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
+    assert custom_client.get("/api/auth/me", headers=headers).status_code == 200
+    custom.state.users_db.close()
+
+def test_emission_factor_versions(tmp_path):
+    """Testa a troca a quente dos fatores de emissão e o recálculo com versões anteriores."""
+    import json
+    import os
+    from app.config import Settings
+    from app.main import create_app
+    from respira_plus.emission_factors import EMISSION_FACTORS, FACTOR_SETS, REGISTRY
+
+    body = {"diet_type": "vegan_day", "days": 1}
+    response = client.post("/api/calculate/food", json=body)
+    assert response.json()["factor_version"] == REGISTRY.version
+
+    path = tmp_path / "factors.json"
+    factors = {category: dict(values) for category, values in EMISSION_FACTORS.items()}
+    factors["food"]["vegan_day"] = 2.5
+    path.write_text(json.dumps({"version": "test-1", "factors": factors}))
+    os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+    try:
+        custom = create_app(Settings(emission_factors_path=str(path), user_db_path=str(tmp_path / "users.db")))
+        assert FACTOR_SETS.active.version == "test-1"
+        data = client.post("/api/calculate/food", json=body).json()
+        assert data == {"emissions_kg": 2.5, "category": "food", "factor_version": "test-1"}
+
+        versions = client.get("/api/calculate/factors").json()
+        assert versions["active"] == "test-1"
+        assert REGISTRY.version in versions["versions"]
+
+        batch = {"items": [{"category": "food", "activity_type": "vegan_day", "quantity": 1}],
+                 "factor_version": REGISTRY.version}
+        data = client.post("/api/calculate/batch", json=batch).json()
+        assert data["factor_version"] == REGISTRY.version
+        assert data["total_emissions_kg"] == 2.89
+        batch["factor_version"] = "missing"
+        assert client.post("/api/calculate/batch", json=batch).status_code == 400
+
+        # A changed file is picked up by the reloader; a broken one is ignored
+        reloader = custom.state.factor_reloader
+        factors["food"]["vegan_day"] = 2.0
+        path.write_text(json.dumps({"version": "test-2", "factors": factors}))
+        os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+        assert reloader.check()
+        assert client.post("/api/calculate/food", json=body).json()["emissions_kg"] == 2.0
+        path.write_text("{")
+        os.utime(path, ns=(3_000_000_000, 3_000_000_000))
+        assert not reloader.check()
+        assert reloader.last_error is not None
+        assert FACTOR_SETS.active.version == "test-2"
+        custom.state.users_db.close()
+    finally:
+        FACTOR_SETS.publish(REGISTRY)
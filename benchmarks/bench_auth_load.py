@@ -0,0 +1,81 @@
+"""
+Calculator latency under concurrent login load.
+
+Drives the FastAPI app in-process and measures the latency of
+``/api/calculate/*`` requests while a burst of logins is hashing passwords,
+then repeats the run without login load for comparison.
+
+Usage:
+    python -m benchmarks.bench_auth_load [--logins 200] [--requests 300]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks._common import summarize, use_backend
+
+use_backend()
+
+import httpx  # noqa: E402
+from app.main import app  # noqa: E402
+
+CALCULATOR_REQUESTS = [
+    ("/api/calculate/transport", {"transport_type": "car_gasoline_km", "distance_km": 20}),
+    ("/api/calculate/energy", {"energy_type": "electricity_kwh", "consumption": 10}),
+    ("/api/calculate/food", {"diet_type": "vegan_day", "days": 1}),
+]
+
+
+async def login_worker(client, count, statuses):
+    for _ in range(count):
+        response = await client.post(
+            "/api/auth/login",
+            json={"email": "bench@example.com", "password": "bench-password"},
+        )
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+
+async def calculator_worker(client, count, latencies):
+    for i in range(count):
+        path, body = CALCULATOR_REQUESTS[i % len(CALCULATOR_REQUESTS)]
+        start = time.perf_counter()
+        response = await client.post(path, json=body)
+        latencies.append(time.perf_counter() - start)
+        response.raise_for_status()
+
+
+async def run(logins, requests, concurrency):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post(
+            "/api/auth/register",
+            json={"name": "Bench", "email": "bench@example.com", "password": "bench-password"},
+        )
+
+        results = {}
+        for label, login_count in (("idle", 0), ("login_burst", logins)):
+            latencies = []
+            statuses = {}
+            per_worker = max(1, login_count // concurrency) if login_count else 0
+            tasks = [login_worker(client, per_worker, statuses) for _ in range(concurrency if login_count else 0)]
+            tasks += [calculator_worker(client, requests // 4, latencies) for _ in range(4)]
+            start = time.perf_counter()
+            await asyncio.gather(*tasks)
+            results[label] = dict(summarize(latencies), elapsed_s=time.perf_counter() - start,
+                                  login_statuses=statuses)
+        return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args(argv)
+    print(json.dumps(asyncio.run(run(args.logins, args.requests, args.concurrency)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
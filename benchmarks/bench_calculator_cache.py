@@ -0,0 +1,87 @@
+"""
+Calculator endpoint throughput with the result cache on and off.
+
+Drives the FastAPI app in-process with the repetitive request mix the
+mobile app sends (a few default distances, whole diet days) and reports
+requests per second and the cache hit rate for each mode. The calculation
+path alone (cache lookup vs. calculator) is timed as well, since request
+parsing and validation dominate the end-to-end numbers.
+
+Usage:
+    python -m benchmarks.bench_calculator_cache [--requests 3000] [--distinct 20]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks._common import use_backend
+
+use_backend()
+
+import httpx  # noqa: E402
+from app.main import app  # noqa: E402
+
+calculation_cache = app.state.calculation_cache
+
+
+def request_mix(distinct):
+    """Cycle through ``distinct`` inputs per endpoint."""
+    for i in range(distinct):
+        yield "/api/calculate/transport", {"transport_type": "car_gasoline_km", "distance_km": 5 * (i + 1)}
+        yield "/api/calculate/energy", {"energy_type": "electricity_kwh", "consumption": 10 * (i + 1)}
+        yield "/api/calculate/food", {"diet_type": "vegetarian_day", "days": i + 1}
+
+
+async def run_mode(requests, distinct, concurrency):
+    mix = list(request_mix(distinct))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker(offset):
+            for i in range(offset, requests, concurrency):
+                path, body = mix[i % len(mix)]
+                response = await client.post(path, json=body)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(offset) for offset in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return {"requests": requests, "elapsed_s": elapsed, "requests_per_s": requests / elapsed}
+
+
+def time_calculations(requests, distinct):
+    """Calls per second of ``calculation_cache.calculate`` alone."""
+    mix = [("transportation", "car_gasoline_km", 5 * (i + 1)) for i in range(distinct)]
+    start = time.perf_counter()
+    for i in range(requests):
+        calculation_cache.calculate(*mix[i % distinct])
+    return requests / (time.perf_counter() - start)
+
+
+def run(requests, distinct, concurrency):
+    asyncio.run(run_mode(min(requests, 200), distinct, concurrency))  # warm up
+    results = {}
+    for label, maxsize in (("cache_off", 0), ("cache_on", app.state.settings.calculation_cache_size)):
+        calculation_cache.maxsize = maxsize
+        calculation_cache.clear()
+        results[label] = dict(asyncio.run(run_mode(requests, distinct, concurrency)),
+                              cache=calculation_cache.stats())
+        results[label]["calculations_per_s"] = time_calculations(requests * 10, distinct)
+    calculation_cache.maxsize = app.state.settings.calculation_cache_size
+    for key in ("requests_per_s", "calculations_per_s"):
+        results[f"speedup_{key}"] = results["cache_on"][key] / results["cache_off"][key]
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--distinct", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.requests, args.distinct, args.concurrency), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Memory used per emission and mission record.
+
+Compares the dict records ``UserProfile`` used to store with the current
+representations: the column-oriented ``EmissionsHistory`` (and the slotted
+``EmissionRecord`` rows it hands out) and slotted ``MissionRecord`` objects.
+
+Usage:
+    python -m benchmarks.bench_record_memory [--records 100000]
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+from datetime import datetime, timedelta
+
+from respira_plus.emissions_history import EmissionsHistory
+from respira_plus.records import MissionRecord
+
+
+def bytes_per_record(build, count):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    keep = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del keep
+    return (after - before) / count
+
+
+def emission_rows(count):
+    start = datetime(2020, 1, 1)
+    for i in range(count):
+        day = start + timedelta(hours=i)
+        yield day.isoformat(), 18.0 + i % 7, {'transportation': 10.0, 'energy': 5.0, 'food': 3.0 + i % 7}
+
+
+def mission_dict(i):
+    return {
+        'mission_id': i,
+        'title': 'Public Transport Challenge',
+        'started_at': '2024-01-01T08:00:00.000000',
+        'duration_days': 5,
+        'points': 100,
+        'co2_savings_kg': 15.0,
+        'status': 'active'
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=100000)
+    args = parser.parse_args(argv)
+    n = args.records
+
+    def dict_history():
+        return [{'date': d, 'total_emissions_kg': t, 'breakdown': dict(b)} for d, t, b in emission_rows(n)]
+
+    def column_history():
+        history = EmissionsHistory()
+        for d, t, b in emission_rows(n):
+            history.add(d, t, b)
+        return history
+
+    history = column_history()
+
+    results = {
+        "emission_dict": bytes_per_record(dict_history, n),
+        "emission_columns": bytes_per_record(column_history, n),
+        "emission_record_rows": bytes_per_record(lambda: list(history), n),
+        "mission_dict": bytes_per_record(lambda: [mission_dict(i) for i in range(n)], n),
+        "mission_record": bytes_per_record(lambda: [MissionRecord(mission_dict(i)) for i in range(n)], n),
+    }
+    print(json.dumps({name: round(value, 1) for name, value in results.items()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
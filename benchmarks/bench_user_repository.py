@@ -0,0 +1,71 @@
+"""
+Register/login throughput of the user repository backends.
+
+Measures the storage side of the auth flow (an insert per registration, a
+lookup by email per login) for the in-memory and SQLite repositories, from
+one thread and from several threads sharing the connection pool. Password
+hashing is left out: it costs the same on every backend.
+
+Usage:
+    python -m benchmarks.bench_user_repository [--users 20000] [--threads 4]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks._common import use_backend
+
+use_backend()
+
+from app.services.user_repository import InMemoryUserRepository, SQLiteUserRepository  # noqa: E402
+
+
+def make_users(count):
+    return [
+        {"name": f"User {i}", "email": f"user{i}@example.com", "hashed_password": "x" * 87}
+        for i in range(count)
+    ]
+
+
+def measure(repository, users, threads):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(repository.add, users, chunksize=256))
+    register_s = time.perf_counter() - start
+
+    emails = [user["email"] for user in users]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        found = sum(1 for user in pool.map(repository.get, emails, chunksize=256) if user)
+    login_s = time.perf_counter() - start
+    assert found == len(users)
+
+    return {
+        "register_per_s": len(users) / register_s,
+        "login_per_s": len(users) / login_s,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    users = make_users(args.users)
+    results = {}
+    for threads in (1, args.threads):
+        results[f"memory_threads_{threads}"] = measure(InMemoryUserRepository(), users, threads)
+        with tempfile.TemporaryDirectory() as tmp:
+            repository = SQLiteUserRepository(os.path.join(tmp, "users.db"), pool_size=threads)
+            results[f"sqlite_threads_{threads}"] = measure(repository, users, threads)
+            repository.close()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
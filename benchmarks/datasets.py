@@ -0,0 +1,112 @@
+"""
+Fixed-seed synthetic datasets for the benchmarks.
+
+Every generator takes a ``seed`` and builds the same data on every run, so
+results from different commits measure the same work.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+from respira_plus.emission_factors import REGISTRY
+from respira_plus.tips_missions import Catalog
+from respira_plus.user_profile import UserProfile
+
+SEED = 1234
+START = datetime(2022, 1, 1, 8, 0)
+CATEGORIES = ("transportation", "energy", "food", "general")
+IMPACTS = ("high", "medium", "low")
+
+
+def make_activities(count, seed=SEED):
+    """
+    Activity rows for the calculator.
+
+    Returns:
+        tuple: (activity type names, quantities)
+    """
+    rng = random.Random(seed)
+    names = REGISTRY.names
+    types = [rng.choice(names) for _ in range(count)]
+    quantities = [round(rng.uniform(0.5, 50.0), 1) for _ in range(count)]
+    return types, quantities
+
+
+def make_profile(user_id, days, rng, missions=()):
+    """One profile with a daily emission record and some completed missions."""
+    profile = UserProfile(user_id, f"User {user_id}")
+    for day in range(days):
+        breakdown = {
+            "transportation": round(rng.uniform(0.0, 20.0), 2),
+            "energy": round(rng.uniform(1.0, 8.0), 2),
+            "food": round(rng.uniform(2.0, 7.0), 2),
+        }
+        profile.add_emission_record((START + timedelta(days=day)).isoformat(),
+                                    sum(breakdown.values()), breakdown)
+    for mission in missions:
+        if rng.random() < 0.5:
+            profile.start_mission(mission)
+            profile.complete_mission(mission["id"])
+    return profile
+
+
+def make_profiles(users, years, seed=SEED, missions=()):
+    """
+    Profiles with one emission record per day.
+
+    Args:
+        users (int): Number of profiles
+        years (int): Years of daily history per profile
+        seed (int): Random seed
+        missions (iterable): Missions each user may have completed
+
+    Returns:
+        list: UserProfile instances
+    """
+    rng = random.Random(seed)
+    missions = list(missions)
+    return [make_profile(f"user{i:05d}", 365 * years, rng, missions) for i in range(users)]
+
+
+def make_catalog_entries(tips, missions, seed=SEED):
+    """
+    Tip and mission entry dicts for a catalog of the given size.
+
+    Returns:
+        tuple: (tip dicts, mission dicts)
+    """
+    rng = random.Random(seed)
+    tip_entries = [
+        {
+            "id": i + 1,
+            "category": rng.choice(CATEGORIES),
+            "title": f"Tip {i + 1}",
+            "description": "Synthetic benchmark tip.",
+            "impact": rng.choice(IMPACTS),
+        }
+        for i in range(tips)
+    ]
+    mission_entries = [
+        {
+            "id": i + 1,
+            "title": f"Mission {i + 1}",
+            "description": "Synthetic benchmark mission.",
+            "category": rng.choice(CATEGORIES[:3]),
+            "duration_days": rng.choice((5, 7, 14, 30)),
+            "points": rng.randrange(50, 300, 10),
+            "co2_savings_kg": round(rng.uniform(5.0, 50.0), 1),
+        }
+        for i in range(missions)
+    ]
+    return tip_entries, mission_entries
+
+
+def make_catalogs(tips, missions, seed=SEED):
+    """
+    Tip and mission catalogs of the given size.
+
+    Returns:
+        tuple: (tips Catalog, missions Catalog)
+    """
+    tip_entries, mission_entries = make_catalog_entries(tips, missions, seed)
+    return Catalog(tip_entries), Catalog(mission_entries)
@@ -0,0 +1,374 @@
+"""
+Benchmark suite for the calculator, profiles and API.
+
+Runs microbenchmarks of the hot library paths and in-process ASGI throughput
+runs for each endpoint on fixed-seed synthetic data (see
+``benchmarks.datasets``), and reports operations per second. Results can be
+saved as JSON and compared with a saved baseline; a benchmark whose
+throughput drops by more than the threshold is flagged as a regression and
+the exit status is 1.
+
+The scenario scripts (``bench_auth_load``, ``bench_calculator_cache``,
+``bench_record_memory``, ``bench_user_repository``) measure specific
+situations and are run on their own.
+
+Usage:
+    python -m benchmarks.suite [--quick] [--filter api.] [--output results.json]
+    python -m benchmarks.suite --compare baseline.json [--threshold 0.15]
+    python -m benchmarks.suite --compare baseline.json --against results.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+
+from benchmarks import datasets
+from benchmarks._common import BACKEND_DIR, use_backend
+
+SIZES = {
+    "full": {"users": 50, "years": 2, "activities": 10000, "tips": 5000, "missions": 500,
+             "requests": 400, "concurrency": 8, "repeat": 5},
+    "quick": {"users": 5, "years": 1, "activities": 1000, "tips": 500, "missions": 50,
+              "requests": 50, "concurrency": 4, "repeat": 3},
+}
+DEFAULT_THRESHOLD = 0.15
+
+BENCHMARKS = []
+
+
+def benchmark(name, group="micro"):
+    """
+    Register a benchmark.
+
+    The decorated function receives the size parameters and returns
+    ``(fn, ops)``: a callable to time and the operations one call performs.
+    """
+    def register(setup):
+        BENCHMARKS.append((name, group, setup))
+        return setup
+    return register
+
+
+def measure(fn, ops, repeat):
+    """Time ``fn`` and report throughput from the median call time."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    times = [total / number for total in timer.repeat(repeat, number)]
+    median = statistics.median(times)
+    return {
+        "ops_per_s": ops / median,
+        "median_s": median,
+        "min_s": min(times),
+        "ops": ops,
+        "calls": number * repeat,
+    }
+
+
+# -- Library microbenchmarks -------------------------------------------------
+
+@benchmark("calculator.scalar")
+def bench_calculator_scalar(sizes):
+    from respira_plus.carbon_calculator import CarbonCalculator
+    from respira_plus.emission_factors import REGISTRY
+
+    calculator = CarbonCalculator()
+    methods = {
+        "transportation": calculator.calculate_transportation,
+        "energy": calculator.calculate_energy,
+        "food": calculator.calculate_food,
+    }
+    types, quantities = datasets.make_activities(sizes["activities"])
+    calls = [(methods[REGISTRY.category(REGISTRY.code(t))], t, q) for t, q in zip(types, quantities)]
+
+    def run():
+        for method, activity_type, quantity in calls:
+            method(activity_type, quantity)
+    return run, len(calls)
+
+
+@benchmark("calculator.batch")
+def bench_calculator_batch(sizes):
+    from respira_plus.carbon_calculator import CarbonCalculator
+
+    types, quantities = datasets.make_activities(sizes["activities"])
+    return (lambda: CarbonCalculator().calculate_batch(types, quantities)), len(types)
+
+
+@benchmark("profile.get_statistics")
+def bench_profile_statistics(sizes):
+    from respira_plus.tips_missions import MISSION_CATALOG
+
+    profiles = datasets.make_profiles(sizes["users"], sizes["years"], missions=MISSION_CATALOG)
+
+    def run():
+        for profile in profiles:
+            profile.get_statistics()
+    return run, len(profiles)
+
+
+@benchmark("profile.emissions_series")
+def bench_profile_series(sizes):
+    profiles = datasets.make_profiles(sizes["users"], sizes["years"])
+    end = datasets.START.date().replace(year=datasets.START.year + sizes["years"])
+    for profile in profiles:
+        profile.get_emissions_series(datasets.START.date(), end, "month")  # build rollups
+
+    def run():
+        for profile in profiles:
+            profile.get_emissions_series(datasets.START.date(), end, "week")
+    return run, len(profiles)
+
+
+@benchmark("profile.serialization")
+def bench_profile_serialization(sizes):
+    from respira_plus.user_profile import UserProfile
+
+    profiles = datasets.make_profiles(sizes["users"], sizes["years"])
+
+    def run():
+        for profile in profiles:
+            UserProfile.from_bytes(profile.to_bytes()).get_total_emissions()
+    return run, len(profiles)
+
+
+@benchmark("catalog.build")
+def bench_catalog_build(sizes):
+    from respira_plus.tips_missions import Catalog
+
+    tips, _ = datasets.make_catalog_entries(sizes["tips"], 0)
+    return (lambda: Catalog(tips)), len(tips)
+
+
+@benchmark("recommender.rank")
+def bench_recommender_rank(sizes):
+    from respira_plus.recommendations import Recommender
+
+    tips, missions = datasets.make_catalogs(sizes["tips"], sizes["missions"])
+    recommender = Recommender(tips, missions)
+    rng = random.Random(datasets.SEED)
+    breakdowns = [
+        {"transportation": rng.uniform(0, 100), "energy": rng.uniform(0, 100), "food": rng.uniform(0, 100)}
+        for _ in range(1000)
+    ]
+
+    def run():
+        for breakdown in breakdowns:
+            recommender.recommend(breakdown)
+    return run, len(breakdowns)
+
+
+@benchmark("leaderboard.set_score")
+def bench_leaderboard(sizes):
+    from respira_plus.leaderboard import Leaderboard
+
+    rng = random.Random(datasets.SEED)
+    users = [f"user{i:05d}" for i in range(sizes["activities"])]
+    updates = [(rng.choice(users), rng.randrange(0, 10000, 10)) for _ in range(sizes["activities"])]
+    leaderboard = Leaderboard()
+    for user_id in users:
+        leaderboard.set_score(user_id, 0)
+
+    def run():
+        for user_id, score in updates:
+            leaderboard.set_score(user_id, score)
+    return run, len(updates)
+
+
+# -- In-process ASGI throughput ----------------------------------------------
+
+def api_benchmark(name, method, path, body=None, headers=None, prepare=None):
+    """Register a throughput run of one endpoint through the ASGI app."""
+    @benchmark(f"api.{name}", group="api")
+    def setup(sizes):
+        use_backend()
+        import httpx
+        from app.main import app
+
+        def client():
+            transport = httpx.ASGITransport(app=app)
+            return httpx.AsyncClient(transport=transport, base_url="http://bench")
+
+        async def prepare_headers():
+            async with client() as prepare_client:
+                return await prepare(prepare_client)
+
+        request_headers = dict(headers or {})
+        if prepare is not None:
+            request_headers.update(asyncio.run(prepare_headers()))
+
+        async def burst():
+            async with client() as bench_client:
+                async def worker(count):
+                    for _ in range(count):
+                        response = await bench_client.request(method, path, json=body, headers=request_headers)
+                        if response.status_code >= 400:
+                            raise RuntimeError(f"{method} {path} returned {response.status_code}")
+
+                per_worker = sizes["requests"] // sizes["concurrency"]
+                await asyncio.gather(*(worker(per_worker) for _ in range(sizes["concurrency"])))
+
+        requests = sizes["requests"] // sizes["concurrency"] * sizes["concurrency"]
+        return (lambda: asyncio.run(burst())), requests
+    return setup
+
+
+async def _bench_token(client):
+    credentials = {"email": "suite@example.com", "password": "suite-password"}
+    response = await client.post("/api/auth/register", json=dict(credentials, name="Suite"))
+    if response.status_code != 200:
+        response = await client.post("/api/auth/login", json=credentials)
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def _catalog_etag(client):
+    response = await client.get("/api/tips")
+    return {"If-None-Match": response.headers["ETag"]}
+
+
+api_benchmark("root", "GET", "/")
+api_benchmark("calculate_transport", "POST", "/api/calculate/transport",
+              {"transport_type": "car_gasoline_km", "distance_km": 20})
+api_benchmark("calculate_energy", "POST", "/api/calculate/energy",
+              {"energy_type": "electricity_kwh", "consumption": 150})
+api_benchmark("calculate_food", "POST", "/api/calculate/food",
+              {"diet_type": "vegetarian_day", "days": 7})
+api_benchmark("calculate_batch", "POST", "/api/calculate/batch", {"items": [
+    {"category": "transportation", "activity_type": "bus_km", "quantity": 12.5},
+    {"category": "energy", "activity_type": "natural_gas_kwh", "quantity": 30},
+    {"category": "food", "activity_type": "vegan_day", "quantity": 1},
+] * 10})
+api_benchmark("tips", "GET", "/api/tips", headers={"Accept-Encoding": "gzip"})
+api_benchmark("tips_not_modified", "GET", "/api/tips", prepare=_catalog_etag)
+api_benchmark("missions", "GET", "/api/missions", headers={"Accept-Encoding": "gzip"})
+api_benchmark("tips_recommended", "GET", "/api/tips/recommended?energy=40&food=10")
+api_benchmark("leaderboard", "GET", "/api/leaderboard?limit=20", prepare=_bench_token)
+api_benchmark("auth_me", "GET", "/api/auth/me", prepare=_bench_token)
+
+
+# -- Startup -----------------------------------------------------------------
+
+def startup_benchmark(name, code):
+    """Register a run of ``code`` in a fresh interpreter started in ``backend/``."""
+    @benchmark(f"startup.{name}", group="startup")
+    def setup(sizes):
+        command = [sys.executable, "-W", "ignore", "-c", code]
+
+        def run():
+            subprocess.run(command, cwd=BACKEND_DIR, check=True)
+        return run, 1
+    return setup
+
+
+startup_benchmark("interpreter", "pass")
+startup_benchmark("import_app", "import app.main")
+startup_benchmark("first_login", (
+    "from fastapi.testclient import TestClient; from app.main import app; "
+    "TestClient(app).post('/api/auth/register', "
+    "json={'name': 'S', 'email': 's@example.com', 'password': 'startup-password'}).raise_for_status()"
+))
+
+
+# -- Running and comparing ---------------------------------------------------
+
+def run_suite(sizes, pattern=None, log=sys.stderr):
+    """
+    Run the registered benchmarks whose name contains ``pattern``.
+
+    Returns:
+        dict: ``meta`` (environment and sizes) and ``results`` by name
+    """
+    results = {}
+    for name, group, setup in BENCHMARKS:
+        if pattern and pattern not in name:
+            continue
+        fn, ops = setup(sizes)
+        results[name] = dict(measure(fn, ops, sizes["repeat"]), group=group)
+        print(f"{name:32s} {results[name]['ops_per_s']:>14,.1f} ops/s", file=log)
+    return {
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": datasets.SEED,
+            "sizes": sizes,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare two result sets by throughput.
+
+    Returns:
+        list: Rows with ``name``, ``baseline``, ``current``, ``ratio`` and
+        ``status`` ('regression', 'improvement', 'ok', 'new' or 'missing')
+    """
+    rows = []
+    base_results = baseline["results"]
+    current_results = current["results"]
+    for name in sorted(set(base_results) | set(current_results)):
+        before = base_results.get(name, {}).get("ops_per_s")
+        after = current_results.get(name, {}).get("ops_per_s")
+        if before is None or after is None:
+            rows.append({"name": name, "baseline": before, "current": after, "ratio": None,
+                         "status": "new" if before is None else "missing"})
+            continue
+        ratio = after / before
+        if ratio < 1 - threshold:
+            status = "regression"
+        elif ratio > 1 + threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append({"name": name, "baseline": before, "current": after, "ratio": ratio, "status": status})
+    return rows
+
+
+def print_comparison(rows, out=sys.stderr):
+    for row in rows:
+        ratio = f"{row['ratio']:.2f}x" if row["ratio"] is not None else "-"
+        print(f"{row['name']:32s} {ratio:>8s}  {row['status']}", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="small datasets, fewer repeats")
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this")
+    parser.add_argument("--output", help="write the results JSON to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="baseline results JSON to compare against")
+    parser.add_argument("--against", metavar="RESULTS", help="compare a saved results file instead of running")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative throughput drop flagged as a regression")
+    args = parser.parse_args(argv)
+
+    if args.against:
+        with open(args.against, encoding="utf-8") as f:
+            current = json.load(f)
+    else:
+        current = run_suite(SIZES["quick" if args.quick else "full"], args.filter)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(current, f, indent=2)
+        else:
+            print(json.dumps(current, indent=2))
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(baseline, current, args.threshold)
+        print_comparison(rows)
+        if any(row["status"] == "regression" for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,6 +15,25 @@ const api = axios.create({
 export interface CalculationResponse {
   emissions_kg: number;
   category: string;
+  factor_version: string | null;
+}
+
+export interface BatchItem {
+  category: 'transportation' | 'energy' | 'food';
+  activity_type: string;
+  quantity: number;
+}
+
+export interface BatchResponse {
+  items: CalculationResponse[];
+  breakdown: Record<string, number>;
+  total_emissions_kg: number;
+  factor_version: string | null;
+}
+
+export interface FactorVersions {
+  active: string;
+  versions: string[];
 }
 
 export const calculatorApi = {
@@ -41,6 +60,19 @@ export const calculatorApi = {
     });
     return response.data;
   },
+
+  calculateBatch: async (items: BatchItem[], factorVersion?: string): Promise<BatchResponse> => {
+    const response = await api.post<BatchResponse>('/api/calculate/batch', {
+      items,
+      factor_version: factorVersion,
+    });
+    return response.data;
+  },
+
+  getFactorVersions: async (): Promise<FactorVersions> => {
+    const response = await api.get<FactorVersions>('/api/calculate/factors');
+    return response.data;
+  },
 };
 
 export const authApi = {
@@ -61,3 +93,75 @@ export const authApi = {
     return response.data;
   },
 };
+
+export interface LeaderboardEntry {
+  rank: number;
+  name: string;
+  points: number;
+}
+
+export interface LeaderboardPage {
+  total: number;
+  offset: number;
+  limit: number;
+  entries: LeaderboardEntry[];
+}
+
+export const leaderboardApi = {
+  getPage: async (offset = 0, limit = 20): Promise<LeaderboardPage> => {
+    const response = await api.get<LeaderboardPage>('/api/leaderboard', { params: { offset, limit } });
+    return response.data;
+  },
+
+  getMyPosition: async (token: string): Promise<LeaderboardEntry & { total: number }> => {
+    const response = await api.get<LeaderboardEntry & { total: number }>('/api/leaderboard/me', {
+      headers: { Authorization: `Bearer ${token}` },
+    });
+    return response.data;
+  },
+};
+
+export interface Tip {
+  id: number;
+  category: string;
+  title: string;
+  description: string;
+  impact: 'high' | 'medium' | 'low';
+}
+
+export interface Mission {
+  id: number;
+  category: string;
+  title: string;
+  description: string;
+  duration_days: number;
+  points: number;
+  co2_savings_kg: number;
+}
+
+export interface Recommendations {
+  tips: (Tip & { score: number })[];
+  missions: (Mission & { score: number })[];
+}
+
+export const tipsApi = {
+  // Axios follows the platform HTTP cache, which revalidates with If-None-Match
+  getAll: async (): Promise<Tip[]> => {
+    const response = await api.get<Tip[]>('/api/tips');
+    return response.data;
+  },
+
+  getRecommended: async (breakdown: Record<string, number>, limit = 5): Promise<Recommendations> => {
+    const response = await api.get<Recommendations>('/api/tips/recommended', {
+      params: { ...breakdown, limit },
+    });
+    return response.data;
+  },
+};
+
+export const missionsApi = {
+  getAll: async (): Promise<Mission[]> => {
+    const response = await api.get<Mission[]>('/api/missions');
+    return response.data;
+  },
+};
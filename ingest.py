@@ -0,0 +1,89 @@
+"""
+Respira+ Activity Ingestion
+
+Command-line entry point that streams a CSV or NDJSON activity export into
+per-user, per-day emission records.
+
+Usage:
+    python ingest.py activities.csv > records.ndjson
+    python ingest.py activities.ndjson --chunk-size 50000 --output records.ndjson
+    python ingest.py activities.csv --factors factors-2023.json > recalculated.ndjson
+
+Each output record carries the ``factor_version`` it was calculated with.
+"""
+
+import argparse
+import json
+import sys
+from respira_plus.emission_factors import FACTOR_SETS
+from respira_plus.ingestion import DEFAULT_CHUNK_SIZE, READERS, ingest, pinned_calculator
+
+
+def detect_format(path):
+    """Guess the input format from the file extension."""
+    if path.endswith(('.ndjson', '.jsonl')):
+        return 'ndjson'
+    return 'csv'
+
+
+def positive_int(value):
+    """Argparse type for options that must be at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1: {number}")
+    return number
+
+
+def main(argv=None):
+    """Main entry point for the ingestion CLI."""
+    parser = argparse.ArgumentParser(description="Convert activity exports into emission records.")
+    parser.add_argument('input', help="Activity export ('-' for stdin)")
+    parser.add_argument('--format', choices=sorted(READERS), help="Input format (default: from extension)")
+    parser.add_argument('--chunk-size', type=positive_int, default=DEFAULT_CHUNK_SIZE, help="Rows per calculation batch")
+    parser.add_argument('--output', help="Write NDJSON records to this file instead of stdout")
+    parser.add_argument('--factors', help="Emission factor set file to calculate with (default: bundled set)")
+    args = parser.parse_args(argv)
+
+    if args.factors:
+        try:
+            FACTOR_SETS.load(args.factors)
+        except (OSError, ValueError) as e:
+            parser.error(f"cannot load factor set: {e}")
+    calculator = pinned_calculator()
+
+    fmt = args.format or detect_format(args.input)
+    skipped = 0
+
+    def on_error(row_number, error):
+        nonlocal skipped
+        skipped += 1
+        print(f"Row {row_number}: {error}", file=sys.stderr)
+
+    source = sys.stdin if args.input == '-' else open(args.input, newline='', encoding='utf-8')
+    target = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    records = 0
+    try:
+        for user_id, day, total, breakdown in ingest(source, fmt, args.chunk_size, calculator, on_error):
+            target.write(json.dumps({
+                'user_id': user_id,
+                'date': day,
+                'total_emissions_kg': total,
+                'breakdown': breakdown,
+                'factor_version': calculator.registry.version
+            }) + '\n')
+            records += 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+    print(f"{records} records written, {skipped} rows skipped", file=sys.stderr)
+    return 1 if skipped and not records else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
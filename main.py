@@ -16,9 +16,10 @@ class RespiraApp:
     Main application class for Respira+.
     """
     
-    def __init__(self):
+    def __init__(self, repository=None):
         self.calculator = CarbonCalculator()
         self.tips_manager = TipsMissionsManager()
+        self.repository = repository
         self.user = None
     
     def create_user(self, user_id, name):
@@ -26,6 +27,17 @@ class RespiraApp:
         self.user = UserProfile(user_id, name)
         return self.user
     
+    def load_user(self, user_id):
+        """Load a user profile from the repository, if one is configured."""
+        if self.repository is not None:
+            self.user = self.repository.load(user_id)
+        return self.user
+    
+    def save_user(self):
+        """Save the current user profile to the repository, if one is configured."""
+        if self.repository is not None and self.user is not None:
+            self.repository.save(self.user)
+    
     def calculate_daily_footprint(self, transportation_data, energy_data, food_data):
         """
         Calculate daily carbon footprint.
@@ -5,8 +5,16 @@ Calculates carbon emissions from various activities:
 - Transportation (car, bus, train, plane)
 - Energy consumption (electricity, heating)
 - Food/diet choices
+
+Calculators follow the active emission factor set (see
+``respira_plus.emission_factors``) unless pinned to a version, and record
+the version each calculation used.
 """
 
+from array import array
+
+from respira_plus.emission_factors import EMISSION_FACTORS, FACTOR_SETS
+
 
 class CarbonCalculator:
     """
@@ -14,35 +22,25 @@ class CarbonCalculator:
     Emissions are measured in kg CO2e (carbon dioxide equivalent).
     """
     
-    # Emission factors (kg CO2e per unit)
-    EMISSION_FACTORS = {
-        'transportation': {
-            'car_gasoline_km': 0.192,      # per km
-            'car_diesel_km': 0.171,        # per km
-            'car_electric_km': 0.053,      # per km
-            'bus_km': 0.089,               # per km
-            'train_km': 0.041,             # per km
-            'plane_short_km': 0.255,       # per km (flights < 1500km)
-            'plane_long_km': 0.195,        # per km (flights > 1500km)
-            'bike_km': 0.0,                # per km
-            'walk_km': 0.0,                # per km
-        },
-        'energy': {
-            'electricity_kwh': 0.233,      # per kWh (global average)
-            'natural_gas_kwh': 0.185,      # per kWh
-            'heating_oil_liter': 2.52,     # per liter
-        },
-        'food': {
-            'meat_heavy_day': 7.19,        # per day
-            'meat_medium_day': 5.63,       # per day
-            'meat_low_day': 4.67,          # per day
-            'pescatarian_day': 3.91,       # per day
-            'vegetarian_day': 3.81,        # per day
-            'vegan_day': 2.89,             # per day
-        }
-    }
+    # Emission factors (kg CO2e per unit), shared with every calculator
+    EMISSION_FACTORS = EMISSION_FACTORS
+    
+    # Compiled factor table: activity types are interned to integer codes
+    # indexing a flat array of factors. Replaced whenever a new factor set
+    # is published, so it applies from the next calculation on.
+    factor_sets = FACTOR_SETS
+    registry = FACTOR_SETS.active
     
-    def __init__(self):
+    def __init__(self, factor_version=None):
+        """
+        Args:
+            factor_version (str, optional): Use this kept factor set instead
+                of the active one (e.g. to recalculate older records)
+        """
+        if factor_version is not None:
+            self.registry = self.factor_sets.get(factor_version)
+        # Factor set version used by the latest calculation
+        self.factor_version = None
         self.total_emissions = 0.0
         self.breakdown = {
             'transportation': 0.0,
@@ -61,10 +59,13 @@ class CarbonCalculator:
         Returns:
             float: CO2 emissions in kg
         """
-        if transport_type not in self.EMISSION_FACTORS['transportation']:
+        registry = self.registry
+        code = registry.category_codes['transportation'].get(transport_type)
+        if code is None:
             raise ValueError(f"Unknown transport type: {transport_type}")
         
-        emissions = self.EMISSION_FACTORS['transportation'][transport_type] * distance
+        emissions = registry.factors[code] * distance
+        self.factor_version = registry.version
         self.breakdown['transportation'] += emissions
         self.total_emissions += emissions
         return emissions
@@ -80,10 +81,13 @@ class CarbonCalculator:
         Returns:
             float: CO2 emissions in kg
         """
-        if energy_type not in self.EMISSION_FACTORS['energy']:
+        registry = self.registry
+        code = registry.category_codes['energy'].get(energy_type)
+        if code is None:
             raise ValueError(f"Unknown energy type: {energy_type}")
         
-        emissions = self.EMISSION_FACTORS['energy'][energy_type] * consumption
+        emissions = registry.factors[code] * consumption
+        self.factor_version = registry.version
         self.breakdown['energy'] += emissions
         self.total_emissions += emissions
         return emissions
@@ -99,14 +103,86 @@ class CarbonCalculator:
         Returns:
             float: CO2 emissions in kg
         """
-        if diet_type not in self.EMISSION_FACTORS['food']:
+        registry = self.registry
+        code = registry.category_codes['food'].get(diet_type)
+        if code is None:
             raise ValueError(f"Unknown diet type: {diet_type}")
         
-        emissions = self.EMISSION_FACTORS['food'][diet_type] * days
+        emissions = registry.factors[code] * days
+        self.factor_version = registry.version
         self.breakdown['food'] += emissions
         self.total_emissions += emissions
         return emissions
     
+    def calculate_batch(self, activity_types, quantities):
+        """
+        Calculate emissions for many activity rows in a single call.
+        
+        Each activity is resolved to its category through the factor
+        registry, so transportation, energy and food rows can be mixed.
+        Activities may be given as type names or as integer codes from
+        ``registry.code()``. Rows with an unknown activity do not abort the
+        batch: their emission is NaN and a ValueError is reported for that
+        row. Valid rows are added to the calculator totals exactly as the
+        scalar ``calculate_*`` methods would.
+        
+        Args:
+            activity_types (sequence): Activity types (e.g. 'bus_km') or codes
+            quantities (sequence): Distance, consumption or days for each row.
+                Any sequence of numbers works, including ``array.array`` and
+                NumPy arrays.
+            
+        Returns:
+            dict: ``emissions`` (array of float, one per row), ``breakdown``
+            (totals per category), ``total_emissions_kg``, ``errors``
+            (list of ``(row_index, ValueError)`` tuples) and
+            ``factor_version``
+        """
+        if hasattr(quantities, 'tolist'):
+            quantities = quantities.tolist()
+        if hasattr(activity_types, 'tolist'):
+            activity_types = activity_types.tolist()
+        if len(activity_types) != len(quantities):
+            raise ValueError(
+                f"Length mismatch: {len(activity_types)} activity types "
+                f"for {len(quantities)} quantities"
+            )
+        
+        registry = self.registry
+        codes = registry.codes
+        factors = registry.factors
+        category_of = registry.category_of
+        size = len(factors)
+        nan = float('nan')
+        emissions = array('d', bytes(8 * len(quantities)))
+        sums = [0.0] * len(registry.categories)
+        errors = []
+        
+        for row, (activity, quantity) in enumerate(zip(activity_types, quantities)):
+            code = activity if type(activity) is int else codes.get(activity)
+            if code is None or not 0 <= code < size:
+                emissions[row] = nan
+                errors.append((row, ValueError(f"Unknown activity type: {activity}")))
+                continue
+            value = factors[code] * quantity
+            emissions[row] = value
+            sums[category_of[code]] += value
+        
+        breakdown = dict(zip(registry.categories, sums))
+        total = sum(sums)
+        for category, value in breakdown.items():
+            self.breakdown[category] += value
+        self.total_emissions += total
+        self.factor_version = registry.version
+        
+        return {
+            'emissions': emissions,
+            'breakdown': breakdown,
+            'total_emissions_kg': total,
+            'errors': errors,
+            'factor_version': registry.version
+        }
+    
     def get_total_emissions(self):
         """Get total carbon emissions calculated."""
         return self.total_emissions
@@ -117,9 +193,14 @@ class CarbonCalculator:
     
     def reset(self):
         """Reset all calculations."""
+        self.factor_version = None
         self.total_emissions = 0.0
         self.breakdown = {
             'transportation': 0.0,
             'energy': 0.0,
             'food': 0.0
         }
+
+
+# Follow the active factor set
+FACTOR_SETS.bind(CarbonCalculator)
@@ -0,0 +1,282 @@
+"""
+Emission Factors Module
+
+Single source of truth for the emission factors used by every calculator.
+Factor sets are versioned data files (``data/emission_factors.json`` by
+default). Each set is compiled once into a registry that interns each
+activity type to a small integer code backed by a flat array of factors,
+so resolving an activity on the hot path is one index operation.
+
+``FACTOR_SETS`` holds the active set plus the most recent earlier ones.
+Publishing a new set swaps a single reference on every bound calculator
+class, so calculators pick it up on their next calculation without taking
+any lock, and records can still be recalculated with the version they were
+originally computed with.
+"""
+
+import json
+import math
+import os
+from array import array
+from collections import OrderedDict
+from threading import Lock
+
+
+FACTORS_PATH = os.path.join(os.path.dirname(__file__), 'data', 'emission_factors.json')
+
+# Factor sets kept in memory, including the active one
+DEFAULT_KEEP = 8
+
+
+class FactorRegistry:
+    """
+    Compiled, read-only view of a nested emission factor table.
+
+    Activity types are numbered in table order. ``factors[code]`` holds the
+    factor of an activity and ``category_of[code]`` the index of its
+    category in ``categories``. ``version`` identifies the factor set.
+    """
+
+    def __init__(self, emission_factors, version=None):
+        self.version = version
+        self.categories = tuple(emission_factors)
+        self.names = []
+        self.codes = {}
+        self.factors = array('d')
+        self.category_of = array('B')
+        self.category_codes = {}
+
+        for category_index, (category, factors) in enumerate(emission_factors.items()):
+            members = {}
+            for activity_type, factor in factors.items():
+                if activity_type in self.codes:
+                    raise ValueError(f"Duplicate activity type: {activity_type}")
+                if isinstance(factor, bool) or not isinstance(factor, (int, float)) \
+                        or not math.isfinite(factor) or factor < 0:
+                    raise ValueError(f"Invalid emission factor for {activity_type}: {factor!r}")
+                code = len(self.names)
+                self.names.append(activity_type)
+                self.codes[activity_type] = code
+                self.factors.append(factor)
+                self.category_of.append(category_index)
+                members[activity_type] = code
+            self.category_codes[category] = members
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, activity_type):
+        return activity_type in self.codes
+
+    def code(self, activity_type):
+        """
+        Get the integer code of an activity type.
+
+        Args:
+            activity_type (str): Activity type (e.g. 'bus_km')
+
+        Returns:
+            int: Activity code
+        """
+        try:
+            return self.codes[activity_type]
+        except KeyError:
+            raise ValueError(f"Unknown activity type: {activity_type}") from None
+
+    def factor(self, code):
+        """Get the emission factor for an activity code."""
+        return self.factors[code]
+
+    def category(self, code):
+        """Get the category name for an activity code."""
+        return self.categories[self.category_of[code]]
+
+    def to_dict(self):
+        """
+        Rebuild the nested factor table.
+
+        Returns:
+            dict: Factors by category and activity type
+        """
+        return {
+            category: {name: self.factors[code] for name, code in members.items()}
+            for category, members in self.category_codes.items()
+        }
+
+
+def load_factor_set(path=FACTORS_PATH):
+    """
+    Load a versioned factor set from a JSON data file.
+
+    The file holds an object with a ``version`` string and the nested
+    ``factors`` table (kg CO2e per unit, by category and activity type).
+
+    Args:
+        path (str): Data file path
+
+    Returns:
+        FactorRegistry: Compiled factor set
+
+    Raises:
+        ValueError: If the file does not hold a valid factor set
+    """
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"Factor set {path} is not an object")
+    version = data.get('version')
+    factors = data.get('factors')
+    if not isinstance(version, str) or not version:
+        raise ValueError(f"Factor set {path} has no version")
+    if not isinstance(factors, dict) or not all(isinstance(v, dict) for v in factors.values()):
+        raise ValueError(f"Factor set {path} has no factors table")
+    return FactorRegistry(factors, version)
+
+
+class FactorSets:
+    """
+    The active factor set plus the most recently published earlier ones.
+
+    Reads never lock: ``active`` and the ``registry`` attribute of every
+    bound class are plain attributes that ``publish`` replaces, each in a
+    single assignment, and registries are not modified once published. Only
+    publishing is serialized.
+    """
+
+    def __init__(self, initial, keep=DEFAULT_KEEP):
+        """
+        Args:
+            initial (FactorRegistry): Versioned set to start with
+            keep (int): Number of versions kept, including the active one
+        """
+        if initial.version is None:
+            raise ValueError("Factor sets must be versioned")
+        self.keep = max(1, keep)
+        self.active = initial
+        self._history = OrderedDict([(initial.version, initial)])
+        self._lock = Lock()
+        self._bound = []
+        self._source = None
+
+    def __contains__(self, version):
+        return version in self._history
+
+    def versions(self):
+        """Kept versions, oldest first (the active one is last)."""
+        with self._lock:
+            return tuple(self._history)
+
+    def get(self, version):
+        """
+        Get a kept factor set.
+
+        Args:
+            version (str): Factor set version
+
+        Returns:
+            FactorRegistry: Factor set
+
+        Raises:
+            ValueError: If the version is unknown or no longer kept
+        """
+        registry = self._history.get(version)
+        if registry is None:
+            raise ValueError(f"Unknown factor version: {version}")
+        return registry
+
+    def bind(self, owner):
+        """
+        Keep ``owner.registry`` set to the active set.
+
+        Calculator classes are bound once at import; instances read
+        ``self.registry`` and may pin a set by assigning their own.
+        """
+        with self._lock:
+            self._bound.append(owner)
+            owner.registry = self.active
+
+    def unbind(self, owner):
+        """Stop updating ``owner.registry``."""
+        with self._lock:
+            self._bound.remove(owner)
+
+    def publish(self, registry):
+        """
+        Make a factor set the active one.
+
+        Republishing a kept version with the same factors reactivates it. A
+        version is never reused for different factors, so a version stamp
+        always identifies the factors a result was computed with.
+
+        Args:
+            registry (FactorRegistry): Versioned set with the same categories
+
+        Returns:
+            FactorRegistry: The new active set
+
+        Raises:
+            ValueError: If the set is unversioned, its categories differ or
+            its version is already used by different factors
+        """
+        if registry.version is None:
+            raise ValueError("Factor sets must be versioned")
+        with self._lock:
+            if registry.categories != self.active.categories:
+                raise ValueError(
+                    f"Factor set {registry.version} has categories {registry.categories}, "
+                    f"expected {self.active.categories}"
+                )
+            kept = self._history.get(registry.version)
+            if kept is not None:
+                if kept.to_dict() != registry.to_dict():
+                    raise ValueError(f"Factor version {registry.version} already exists with different factors")
+                registry = kept
+            self._history[registry.version] = registry
+            self._history.move_to_end(registry.version)
+            while len(self._history) > self.keep:
+                self._history.popitem(last=False)
+            self.active = registry
+            for owner in self._bound:
+                owner.registry = registry
+        return registry
+
+    def load(self, path):
+        """
+        Load a factor set file and publish it.
+
+        Args:
+            path (str): Data file path (see ``load_factor_set``)
+
+        Returns:
+            FactorRegistry: The new active set
+        """
+        mtime = os.stat(path).st_mtime_ns
+        registry = self.publish(load_factor_set(path))
+        self._source = (path, mtime)
+        return registry
+
+    def reload(self):
+        """
+        Load the last loaded file again if it changed on disk.
+
+        Returns:
+            bool: Whether the file was loaded
+        """
+        if self._source is None:
+            return False
+        path, mtime = self._source
+        current = os.stat(path).st_mtime_ns
+        if current == mtime:
+            return False
+        # A file that fails to load is not retried until it changes again
+        self._source = (path, current)
+        self.load(path)
+        return True
+
+
+REGISTRY = load_factor_set()
+
+# Factors of the bundled set (kg CO2e per unit); FACTOR_SETS.active may differ
+EMISSION_FACTORS = REGISTRY.to_dict()
+
+FACTOR_SETS = FactorSets(REGISTRY)
@@ -0,0 +1,306 @@
+"""
+Emission Log Module
+
+Append-only, fixed-width file of the emission records of one user, read
+through a memory map. Records carry no user ID, so each user needs a log
+of their own.
+
+Layout: an 80-byte header followed by fixed-width records (80 bytes with
+the three standard categories), all multiples of 8 bytes. Each record holds
+the ISO date (32 bytes, UTF-8, zero padded), the timestamp, the total, one
+float per category, a bitmask of the categories present and a CRC32 of the
+preceding bytes. Breakdown keys outside the standard categories are only
+reflected in the total.
+
+Appends are a single ``write`` of one record to a file opened with
+``O_APPEND``. If a crash leaves a partial or torn record at the end of the
+file, opening the log drops it. ``compact`` rewrites the records in date
+order into a new file and atomically replaces the old one.
+"""
+
+import mmap
+import os
+import struct
+import sys
+import zlib
+from bisect import bisect_left
+
+from respira_plus.emissions_history import CATEGORIES, EmissionsHistory, to_timestamp
+
+
+LOG_MAGIC = b'RSPLOG'
+LOG_VERSION = 1
+
+# magic, version, record size, comma-separated categories
+HEADER = struct.Struct('<6sHH70s')
+# date, timestamp, total, category values, presence bitmask, CRC32
+RECORD = struct.Struct(f'<32sdd{len(CATEGORIES)}dB3xI')
+DATE_SIZE = 32
+TIMESTAMP_SLOT = 4
+TOTAL_SLOT = 5
+SLOTS = RECORD.size // 8
+OPEN_FLAGS = os.O_RDWR | os.O_APPEND | getattr(os, 'O_BINARY', 0)
+
+
+class EmissionLog:
+    """
+    Append-only emission log backed by a memory-mapped file.
+    """
+
+    def __init__(self, path, sync=False):
+        """
+        Open a log, creating it if needed.
+
+        Args:
+            path (str): Log file path
+            sync (bool): fsync after every append for durability
+        """
+        self.path = path
+        self.sync = sync
+        if not os.path.exists(path):
+            self._create(path)
+        self._fd = os.open(path, OPEN_FLAGS)
+        self._map = None
+        self._mapped_count = 0
+        self._check_header()
+        self._count = self._recover()
+        self._sorted = self._is_sorted()
+        self._last_timestamp = self._timestamp(self._count - 1) if self._count else None
+
+    @classmethod
+    def for_user(cls, directory, user_id, sync=False):
+        """Open the log of a user inside a directory."""
+        return cls(os.path.join(directory, f"{user_id}.emlog"), sync=sync)
+
+    @staticmethod
+    def _create(path):
+        categories = ','.join(CATEGORIES).encode('utf-8')
+        header = HEADER.pack(LOG_MAGIC, LOG_VERSION, RECORD.size, categories)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(header)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+    def _check_header(self):
+        header = self._read_at(0, HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f"Truncated emission log header: {self.path}")
+        magic, version, record_size, categories = HEADER.unpack(header)
+        if magic != LOG_MAGIC:
+            raise ValueError(f"Not an emission log: {self.path}")
+        if version != LOG_VERSION or record_size != RECORD.size:
+            raise ValueError(f"Unsupported emission log version: {version}")
+        if tuple(categories.rstrip(b'\0').decode('utf-8').split(',')) != CATEGORIES:
+            raise ValueError(f"Emission log categories do not match: {self.path}")
+
+    def _recover(self):
+        # Drop a partial record and any trailing records that fail their
+        # checksum (a torn write can only affect the end of the file).
+        size = os.fstat(self._fd).st_size
+        count = (size - HEADER.size) // RECORD.size
+        while count:
+            offset = HEADER.size + (count - 1) * RECORD.size
+            if self._valid(self._read_at(offset, RECORD.size)):
+                break
+            count -= 1
+        valid_size = HEADER.size + count * RECORD.size
+        if valid_size != size:
+            os.ftruncate(self._fd, valid_size)
+        return count
+
+    def _read_at(self, offset, size):
+        os.lseek(self._fd, offset, os.SEEK_SET)
+        return os.read(self._fd, size)
+
+    @staticmethod
+    def _valid(raw):
+        if len(raw) != RECORD.size:
+            return False
+        checksum = struct.unpack_from('<I', raw, RECORD.size - 4)[0]
+        return zlib.crc32(raw[:-4]) == checksum
+
+    def _buffer(self):
+        if self._map is None or self._mapped_count != self._count:
+            if self._map is not None:
+                self._map.close()
+            self._map = mmap.mmap(self._fd, HEADER.size + self._count * RECORD.size,
+                                  access=mmap.ACCESS_READ)
+            self._mapped_count = self._count
+        return self._map
+
+    def _column(self, slot, lo, hi):
+        """Values of one float slot for records lo..hi, read from the map."""
+        if lo >= hi:
+            return []
+        buffer = self._buffer()
+        if sys.byteorder == 'little':
+            # Records are 10 float64 slots wide, so the mapped records can be
+            # viewed as one float array and a column read with a stride.
+            with memoryview(buffer) as raw, raw[HEADER.size:].cast('d') as floats:
+                with floats[lo * SLOTS + slot:hi * SLOTS:SLOTS] as column:
+                    return column.tolist()
+        return [RECORD.unpack_from(buffer, HEADER.size + i * RECORD.size)[1 + slot - TIMESTAMP_SLOT]
+                for i in range(lo, hi)]
+
+    def _timestamp(self, i):
+        return struct.unpack_from('<d', self._buffer(), HEADER.size + i * RECORD.size + 8 * TIMESTAMP_SLOT)[0]
+
+    def _is_sorted(self):
+        times = self._column(TIMESTAMP_SLOT, 0, self._count)
+        return all(a <= b for a, b in zip(times, times[1:]))
+
+    def __len__(self):
+        return self._count
+
+    def append(self, date, emissions_kg, breakdown):
+        """
+        Append an emission record.
+
+        Args:
+            date (str): Date in ISO format
+            emissions_kg (float): Total emissions in kg CO2e
+            breakdown (dict): Breakdown by category
+        """
+        encoded = date.encode('utf-8')
+        if len(encoded) > DATE_SIZE:
+            raise ValueError(f"Date too long for emission log: {date}")
+        timestamp = to_timestamp(date)
+        present = 0
+        values = []
+        for c, category in enumerate(CATEGORIES):
+            if category in breakdown:
+                present |= 1 << c
+            values.append(breakdown.get(category, 0.0))
+        packed = RECORD.pack(encoded, timestamp, emissions_kg, *values, present, 0)
+        raw = packed[:-4] + struct.pack('<I', zlib.crc32(packed[:-4]))
+
+        os.write(self._fd, raw)
+        if self.sync:
+            os.fsync(self._fd)
+        self._count += 1
+        if self._last_timestamp is not None and timestamp < self._last_timestamp:
+            self._sorted = False
+        else:
+            self._last_timestamp = timestamp
+
+    def _record(self, i):
+        fields = RECORD.unpack_from(self._buffer(), HEADER.size + i * RECORD.size)
+        date, _, total = fields[:3]
+        values = fields[3:3 + len(CATEGORIES)]
+        present = fields[3 + len(CATEGORIES)]
+        return {
+            'date': date.rstrip(b'\0').decode('utf-8'),
+            'total_emissions_kg': total,
+            'breakdown': {
+                category: value
+                for c, (category, value) in enumerate(zip(CATEGORIES, values))
+                if present & (1 << c)
+            }
+        }
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self._record(i)
+
+    def _indices(self, start, end):
+        if self._sorted:
+            times = _TimestampView(self)
+            lo = 0 if start is None else bisect_left(times, to_timestamp(start))
+            hi = self._count if end is None else bisect_left(times, to_timestamp(end), lo)
+            return range(lo, hi)
+        low = float('-inf') if start is None else to_timestamp(start)
+        high = float('inf') if end is None else to_timestamp(end)
+        times = self._column(TIMESTAMP_SLOT, 0, self._count)
+        return [i for i, t in enumerate(times) if low <= t < high]
+
+    def between(self, start=None, end=None):
+        """
+        Get records with ``start <= date < end``.
+
+        Uses binary search over the mapped timestamps while the log is
+        sorted, and a scan of the timestamp column otherwise.
+
+        Returns:
+            list: Emission records
+        """
+        return [self._record(i) for i in self._indices(start, end)]
+
+    def total_between(self, start=None, end=None):
+        """
+        Sum total emissions of records with ``start <= date < end``.
+
+        Returns:
+            float: Total emissions in kg CO2e
+        """
+        indices = self._indices(start, end)
+        if isinstance(indices, range):
+            return sum(self._column(TOTAL_SLOT, indices.start, indices.stop))
+        totals = self._column(TOTAL_SLOT, 0, self._count)
+        return sum(totals[i] for i in indices)
+
+    def total(self):
+        """Get the sum of all record totals."""
+        return sum(self._column(TOTAL_SLOT, 0, self._count))
+
+    def to_history(self):
+        """
+        Load the log into an EmissionsHistory.
+
+        Returns:
+            EmissionsHistory: History with every logged record
+        """
+        return EmissionsHistory(self)
+
+    def compact(self):
+        """
+        Rewrite the log in date order and atomically replace the file.
+
+        Records with equal dates keep their append order.
+        """
+        buffer = self._buffer()
+        order = sorted(range(self._count), key=lambda i: self._timestamp(i))
+        temp_path = self.path + '.compact'
+        with open(temp_path, 'wb') as f:
+            f.write(buffer[:HEADER.size])
+            for i in order:
+                offset = HEADER.size + i * RECORD.size
+                f.write(buffer[offset:offset + RECORD.size])
+            f.flush()
+            os.fsync(f.fileno())
+        self.close()
+        os.replace(temp_path, self.path)
+        self._fd = os.open(self.path, OPEN_FLAGS)
+        self._sorted = True
+        self._last_timestamp = self._timestamp(self._count - 1) if self._count else None
+
+    def close(self):
+        """Unmap and close the log file."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class _TimestampView:
+    """Sequence of record timestamps read lazily from the log, for bisect."""
+
+    __slots__ = ('log',)
+
+    def __init__(self, log):
+        self.log = log
+
+    def __len__(self):
+        return len(self.log)
+
+    def __getitem__(self, i):
+        return self.log._timestamp(i)
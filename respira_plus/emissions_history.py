@@ -0,0 +1,409 @@
+"""
+Emissions History Module
+
+Date-sorted, column-oriented storage for a user's emission records.
+
+Records are kept as parallel arrays (timestamps, totals and one column per
+category) ordered by date, plus a prefix sum of totals. Appending a record
+that is not older than the last one is amortized O(1); older records are
+inserted at their sorted position. Period queries locate their bounds with
+bisect, so selecting or summing a date range costs O(log n) plus the size
+of the result.
+
+Indexing and iteration produce ``EmissionRecord`` rows, which read like the
+record dicts ``UserProfile`` has always exposed (``date``,
+``total_emissions_kg`` and ``breakdown``); ``to_list`` returns plain dicts.
+Columns hold floats, so a bitmask per record remembers which of the total
+and category values were ints, and they are read back as ints.
+"""
+
+import json
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from math import fsum, isclose
+
+from respira_plus.emission_factors import REGISTRY
+from respira_plus.records import EmissionRecord
+from respira_plus.rollups import EmissionRollups
+
+
+CATEGORIES = REGISTRY.categories
+
+# Record count, metadata length, dates length
+HISTORY_HEADER = struct.Struct('<QIQ')
+
+
+def to_timestamp(date):
+    """
+    Convert an ISO date string (or datetime) to a POSIX timestamp.
+
+    Naive dates are interpreted in local time, like ``datetime.now()``.
+    """
+    if not isinstance(date, datetime):
+        date = datetime.fromisoformat(date)
+    return date.timestamp()
+
+
+def _little_endian(column):
+    if sys.byteorder == 'little':
+        return column.tobytes()
+    swapped = array(column.typecode, column)
+    swapped.byteswap()
+    return swapped.tobytes()
+
+
+class EmissionsHistory:
+    """
+    Sorted, array-backed sequence of emission records.
+    """
+
+    def __init__(self, records=()):
+        self._dates = []
+        self._dates_blob = None
+        self._times = array('d')
+        self._totals = array('d')
+        self._columns = tuple(array('d') for _ in CATEGORIES)
+        self._present = array('B')
+        self._ints = array('H')
+        self._extras = []
+        self._prefix = array('d', [0.0])
+        self._category_totals = dict.fromkeys(CATEGORIES, 0.0)
+        self._rollups = None
+        for record in records:
+            self.append(record)
+
+    def __len__(self):
+        return len(self._times)
+
+    def __bool__(self):
+        return bool(self._times)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._record(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("emission record index out of range")
+        return self._record(index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._record(i)
+
+    def __repr__(self):
+        return f"EmissionsHistory({len(self)} records)"
+
+    def _record(self, i):
+        total = self._totals[i]
+        values = tuple(column[i] for column in self._columns)
+        ints = self._ints[i]
+        if ints:
+            if ints & 1:
+                total = int(total)
+            values = tuple(
+                int(value) if ints & (2 << c) else value
+                for c, value in enumerate(values)
+            )
+        return EmissionRecord(
+            self._date_list()[i],
+            total,
+            CATEGORIES,
+            values,
+            self._present[i],
+            self._extras[i]
+        )
+
+    def _date_list(self):
+        # Dates loaded by from_bytes stay encoded until a record is needed.
+        if self._dates_blob is not None:
+            blob, self._dates_blob = self._dates_blob, None
+            self._dates = blob.decode('utf-8').split('\n') if len(self._times) else []
+        return self._dates
+
+    def add(self, date, emissions_kg, breakdown):
+        """
+        Add a record, keeping the history sorted by date.
+
+        Records with equal dates keep their insertion order.
+
+        Args:
+            date (str): Date in ISO format
+            emissions_kg (float): Total emissions in kg CO2e
+            breakdown (dict): Breakdown by category
+
+        Returns:
+            int: Position of the new record
+        """
+        timestamp = to_timestamp(date)
+        values = []
+        present = 0
+        # Bit 0: the total is an int; bit c + 1: category c is an int
+        ints = 1 if type(emissions_kg) is int else 0
+        for c, category in enumerate(CATEGORIES):
+            if category in breakdown:
+                present |= 1 << c
+                value = breakdown[category]
+                if type(value) is int:
+                    ints |= 2 << c
+                values.append(value)
+            else:
+                values.append(0.0)
+        extras = {key: value for key, value in breakdown.items() if key not in CATEGORIES}
+        category_totals = self._category_totals
+        for key, value in breakdown.items():
+            category_totals[key] = category_totals.get(key, 0.0) + value
+        if self._rollups is not None:
+            self._rollups.add(timestamp, emissions_kg, values)
+
+        if not self._times or timestamp >= self._times[-1]:
+            position = len(self._times)
+            self._date_list().append(date)
+            self._times.append(timestamp)
+            self._totals.append(emissions_kg)
+            for column, value in zip(self._columns, values):
+                column.append(value)
+            self._present.append(present)
+            self._ints.append(ints)
+            self._extras.append(extras or None)
+            self._prefix.append(self._prefix[-1] + emissions_kg)
+            return position
+
+        position = bisect_right(self._times, timestamp)
+        self._date_list().insert(position, date)
+        self._times.insert(position, timestamp)
+        self._totals.insert(position, emissions_kg)
+        for column, value in zip(self._columns, values):
+            column.insert(position, value)
+        self._present.insert(position, present)
+        self._ints.insert(position, ints)
+        self._extras.insert(position, extras or None)
+        self._prefix.append(0.0)
+        for i in range(position, len(self._totals)):
+            self._prefix[i + 1] = self._prefix[i] + self._totals[i]
+        return position
+
+    def append(self, record):
+        """
+        Add a record (dict or EmissionRecord) with ``date``,
+        ``total_emissions_kg`` and ``breakdown``.
+        """
+        return self.add(record['date'], record['total_emissions_kg'], record.get('breakdown', {}))
+
+    def index_range(self, start=None, end=None):
+        """
+        Get the positions of records with ``start <= date < end``.
+
+        Args:
+            start (str or datetime, optional): Inclusive lower bound
+            end (str or datetime, optional): Exclusive upper bound
+
+        Returns:
+            tuple: ``(lo, hi)`` positions
+        """
+        lo = 0 if start is None else bisect_left(self._times, to_timestamp(start))
+        hi = len(self._times) if end is None else bisect_left(self._times, to_timestamp(end), lo)
+        return lo, hi
+
+    def between(self, start=None, end=None):
+        """
+        Get records with ``start <= date < end``.
+
+        Returns:
+            list: Emission records in date order
+        """
+        lo, hi = self.index_range(start, end)
+        return [self._record(i) for i in range(lo, hi)]
+
+    def total_between(self, start=None, end=None):
+        """
+        Sum total emissions of records with ``start <= date < end`` in O(log n).
+
+        Returns:
+            float: Total emissions in kg CO2e
+        """
+        lo, hi = self.index_range(start, end)
+        if lo == 0:
+            return self._prefix[hi]
+        return self._prefix[hi] - self._prefix[lo]
+
+    def total(self):
+        """Get the sum of all record totals."""
+        return self._prefix[-1]
+
+    def category_totals(self):
+        """
+        Get running emission totals per breakdown category.
+
+        Returns:
+            dict: Total emissions in kg CO2e by category
+        """
+        return self._category_totals.copy()
+
+    def rollups(self):
+        """
+        Get the day/week/month rollups of this history.
+
+        They are built from the timestamp and category columns on first use
+        and updated on every insert afterwards.
+
+        Returns:
+            EmissionRollups: Rollups
+        """
+        if self._rollups is None:
+            rollups = EmissionRollups(CATEGORIES)
+            for i, timestamp in enumerate(self._times):
+                rollups.add(timestamp, self._totals[i], [column[i] for column in self._columns])
+            self._rollups = rollups
+        return self._rollups
+
+    def series(self, start, end, granularity='day'):
+        """
+        Get per-period emission totals (see EmissionRollups.series).
+        """
+        return self.rollups().series(start, end, granularity)
+
+    def check_consistency(self):
+        """
+        Recompute totals from the stored records and compare them with the
+        running totals.
+
+        Returns:
+            bool: True if the running totals match the records
+        """
+        if not isclose(self._prefix[-1], fsum(self._totals), rel_tol=1e-9, abs_tol=1e-9):
+            return False
+        expected = dict.fromkeys(CATEGORIES, 0.0)
+        for record in self:
+            for key, value in record['breakdown'].items():
+                expected[key] = expected.get(key, 0.0) + value
+        if expected.keys() != self._category_totals.keys():
+            return False
+        return all(
+            isclose(expected[key], self._category_totals[key], rel_tol=1e-9, abs_tol=1e-9)
+            for key in expected
+        )
+
+    def to_bytes(self):
+        """
+        Encode the history as packed little-endian columns.
+
+        Layout: header (record count, metadata length, dates length), JSON
+        metadata (categories, running totals, extra breakdown keys), dates
+        joined by newlines, then the timestamp, total, prefix-sum and
+        category columns as float64 and the presence bitmask as bytes. When
+        any value was an int, the int bitmask follows as uint16 and the
+        metadata sets ``ints``.
+
+        Returns:
+            bytes: Encoded history
+        """
+        meta = json.dumps({
+            'categories': list(CATEGORIES),
+            'category_totals': self._category_totals,
+            'extras': [[i, extras] for i, extras in enumerate(self._extras) if extras],
+            'ints': any(self._ints)
+        }).encode('utf-8')
+        dates = '\n'.join(self._date_list()).encode('utf-8')
+        parts = [HISTORY_HEADER.pack(len(self), len(meta), len(dates)), meta, dates]
+        for column in (self._times, self._totals, self._prefix) + self._columns:
+            parts.append(_little_endian(column))
+        parts.append(self._present.tobytes())
+        if any(self._ints):
+            parts.append(_little_endian(self._ints))
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data, offset=0):
+        """
+        Decode a history written by ``to_bytes``.
+
+        Columns are copied straight into arrays; no record objects are
+        created and the dates are only decoded when a record is read, so
+        totals and period sums are available right away.
+
+        Args:
+            data (bytes-like): Encoded data
+            offset (int): Position of the history in ``data``
+
+        Returns:
+            tuple: ``(EmissionsHistory, end_offset)``
+
+        Raises:
+            ValueError: If ``data`` is shorter than its header declares
+        """
+        view = memoryview(data)
+        if len(view) - offset < HISTORY_HEADER.size:
+            raise ValueError("Truncated profile data")
+        count, meta_len, dates_len = HISTORY_HEADER.unpack_from(view, offset)
+        offset += HISTORY_HEADER.size
+        if len(view) - offset < meta_len + dates_len:
+            raise ValueError("Truncated profile data")
+        meta = json.loads(bytes(view[offset:offset + meta_len]))
+        offset += meta_len
+        dates = bytes(view[offset:offset + dates_len])
+        offset += dates_len
+        # times, totals, prefix (count + 1) and one column per category, then the bitmasks
+        column_items = 3 * count + 1 + count * len(meta['categories'])
+        int_bytes = 2 * count if meta.get('ints') else 0
+        if len(view) - offset < 8 * column_items + count + int_bytes:
+            raise ValueError("Truncated profile data")
+
+        columns = []
+        for size in [count, count, count + 1] + [count] * len(meta['categories']):
+            column = array('d')
+            column.frombytes(view[offset:offset + 8 * size])
+            if sys.byteorder != 'little':
+                column.byteswap()
+            columns.append(column)
+            offset += 8 * size
+        present = array('B')
+        present.frombytes(view[offset:offset + count])
+        offset += count
+        ints = array('H')
+        if int_bytes:
+            ints.frombytes(view[offset:offset + int_bytes])
+            if sys.byteorder != 'little':
+                ints.byteswap()
+            offset += int_bytes
+        else:
+            ints.frombytes(bytes(2 * count))
+
+        history = cls()
+        if tuple(meta['categories']) != CATEGORIES:
+            # Written with another category set: rebuild record by record.
+            extras = dict(meta['extras'])
+            date_list = dates.decode('utf-8').split('\n') if count else []
+            for i in range(count):
+                breakdown = {
+                    category: int(columns[3 + c][i]) if ints[i] & (2 << c) else columns[3 + c][i]
+                    for c, category in enumerate(meta['categories'])
+                    if present[i] & (1 << c)
+                }
+                breakdown.update(extras.get(i, {}))
+                total = int(columns[1][i]) if ints[i] & 1 else columns[1][i]
+                history.add(date_list[i], total, breakdown)
+            return history, offset
+
+        history._dates_blob = dates
+        history._times, history._totals, history._prefix = columns[:3]
+        history._columns = tuple(columns[3:])
+        history._present = present
+        history._ints = ints
+        history._extras = [None] * count
+        for i, extras in meta['extras']:
+            history._extras[i] = extras
+        history._category_totals = meta['category_totals']
+        return history, offset
+
+    def to_list(self):
+        """
+        Convert the history to a list of record dicts.
+
+        Returns:
+            list: Emission records in date order
+        """
+        return [record.to_dict() for record in self]
@@ -0,0 +1,261 @@
+"""
+Activity Log Ingestion Module
+
+Streams large activity exports (CSV or NDJSON) into emission records.
+
+Every stage is a generator, so memory use depends on the chunk size and not
+on the size of the file:
+
+    parse rows -> chunk -> CarbonCalculator.calculate_batch -> group by
+    (user, day) -> emission records
+
+Each input row holds ``user_id``, ``date`` (ISO format), ``activity_type``
+and ``quantity``. Rows are grouped into one record per user and day while
+they arrive consecutively, which is how exports are normally ordered. If the
+same user and day reappear later in the file they produce a second record
+rather than forcing the whole file into memory.
+
+A run uses one emission factor set throughout: by default the calculator is
+pinned to the set that is active when the run starts.
+"""
+
+import csv
+import json
+from datetime import datetime
+from itertools import islice
+
+from respira_plus.carbon_calculator import CarbonCalculator
+from respira_plus.user_profile import UserProfile
+
+
+DEFAULT_CHUNK_SIZE = 10000
+
+
+def read_csv(stream):
+    """
+    Parse activity rows from a CSV stream with a header line.
+
+    Args:
+        stream: Text file object
+
+    Yields:
+        dict: Activity row
+    """
+    return csv.DictReader(stream)
+
+
+def read_ndjson(stream):
+    """
+    Parse activity rows from a newline-delimited JSON stream.
+
+    Args:
+        stream: Text file object
+
+    Yields:
+        dict: Activity row, or a ValueError for a line that is not valid
+        JSON (reported by ``calculate_rows`` like any other invalid row)
+    """
+    for line in stream:
+        line = line.strip()
+        if line:
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                yield ValueError(f"Invalid JSON: {e}")
+
+
+READERS = {
+    'csv': read_csv,
+    'ndjson': read_ndjson,
+}
+
+
+def parse_day(value):
+    """
+    Normalize an ISO date or datetime to its ISO day.
+
+    Args:
+        value (str): Date such as '2024-01-01' or '2024-01-01T08:00:00Z'
+
+    Returns:
+        str: Day in ISO format ('2024-01-01')
+
+    Raises:
+        ValueError: If the value is not an ISO date
+    """
+    if not isinstance(value, str):
+        raise ValueError(f"Invalid date: {value!r}")
+    if value.endswith(('Z', 'z')):
+        value = value[:-1] + '+00:00'
+    try:
+        return datetime.fromisoformat(value).date().isoformat()
+    except ValueError:
+        raise ValueError(f"Invalid date: {value!r}") from None
+
+
+def pinned_calculator():
+    """Calculator pinned to the currently active factor set."""
+    return CarbonCalculator(CarbonCalculator.factor_sets.active.version)
+
+
+def chunked(rows, size=DEFAULT_CHUNK_SIZE):
+    """
+    Split an iterable of rows into lists of at most ``size`` rows.
+
+    Yields:
+        list: Chunk of rows
+
+    Raises:
+        ValueError: If ``size`` is less than 1
+    """
+    if size < 1:
+        raise ValueError(f"Chunk size must be positive: {size}")
+    return _chunks(iter(rows), size)
+
+
+def _chunks(rows, size):
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def calculate_rows(chunks, calculator=None, on_error=None):
+    """
+    Run chunks of activity rows through the calculator in batches.
+
+    Args:
+        chunks: Iterable of row lists (see ``chunked``)
+        calculator (CarbonCalculator, optional): Calculator to use; it is
+            reset after every chunk. Defaults to ``pinned_calculator()``.
+        on_error (callable, optional): Called as ``on_error(row_number, error)``
+            (0-based data row) for rows that cannot be parsed or calculated
+            (not an object, bad date or quantity, unknown activity); such
+            rows are skipped.
+
+    Yields:
+        tuple: ``(user_id, day, category, emissions_kg)`` for each valid row
+    """
+    calculator = calculator or pinned_calculator()
+    registry = calculator.registry
+    codes = registry.codes
+    offset = 0
+
+    for chunk in chunks:
+        activities = []
+        quantities = []
+        days = []
+        invalid = {}
+        for i, row in enumerate(chunk):
+            if not isinstance(row, dict):
+                activities.append(None)
+                quantities.append(0.0)
+                days.append(None)
+                invalid[i] = row if isinstance(row, ValueError) else ValueError(f"Invalid row: {row!r}")
+                continue
+            activity_type = row.get('activity_type')
+            if isinstance(activity_type, str):
+                activities.append(codes.get(activity_type, activity_type))
+            else:
+                # Integer codes follow table order and are not an input format
+                activities.append(None)
+                invalid[i] = ValueError(f"Invalid activity type: {activity_type!r}")
+            try:
+                quantities.append(float(row['quantity']))
+            except (KeyError, TypeError, ValueError):
+                quantities.append(0.0)
+                invalid[i] = ValueError(f"Invalid quantity: {row.get('quantity')}")
+            try:
+                days.append(parse_day(row.get('date')))
+            except ValueError as e:
+                days.append(None)
+                invalid[i] = e
+            if not row.get('user_id') or not row.get('date'):
+                invalid[i] = ValueError("Missing user_id or date")
+
+        result = calculator.calculate_batch(activities, quantities)
+        calculator.reset()
+        for i, error in result['errors']:
+            invalid.setdefault(i, error)
+        emissions = result['emissions']
+
+        for i, row in enumerate(chunk):
+            if i in invalid:
+                if on_error:
+                    on_error(offset + i, invalid[i])
+                continue
+            yield (row['user_id'], days[i], registry.category(activities[i]), emissions[i])
+        offset += len(chunk)
+
+
+def group_records(rows, categories=None):
+    """
+    Combine consecutive calculated rows of the same user and day.
+
+    Args:
+        rows: Iterable of ``(user_id, day, category, emissions_kg)`` tuples
+        categories (iterable, optional): Breakdown categories
+
+    Yields:
+        tuple: ``(user_id, day, total_emissions_kg, breakdown)``
+    """
+    categories = tuple(categories or CarbonCalculator.registry.categories)
+    key = None
+    breakdown = None
+
+    for user_id, day, category, value in rows:
+        if (user_id, day) != key:
+            if key is not None:
+                yield key[0], key[1], sum(breakdown.values()), breakdown
+            key = (user_id, day)
+            breakdown = dict.fromkeys(categories, 0.0)
+        breakdown[category] += value
+
+    if key is not None:
+        yield key[0], key[1], sum(breakdown.values()), breakdown
+
+
+def ingest(stream, fmt='csv', chunk_size=DEFAULT_CHUNK_SIZE, calculator=None, on_error=None):
+    """
+    Stream an activity export into per-user, per-day emission records.
+
+    Args:
+        stream: Text file object
+        fmt (str): 'csv' or 'ndjson'
+        chunk_size (int): Rows calculated per batch
+        calculator (CarbonCalculator, optional): Calculator to use; defaults
+            to ``pinned_calculator()``
+        on_error (callable, optional): See ``calculate_rows``
+
+    Yields:
+        tuple: ``(user_id, day, total_emissions_kg, breakdown)``
+    """
+    if fmt not in READERS:
+        raise ValueError(f"Unknown format: {fmt}")
+    calculator = calculator or pinned_calculator()
+    rows = READERS[fmt](stream)
+    calculated = calculate_rows(chunked(rows, chunk_size), calculator, on_error)
+    return group_records(calculated, calculator.registry.categories)
+
+
+def apply_records(records, profiles, name=None):
+    """
+    Add emission records to user profiles, creating missing profiles.
+
+    Args:
+        records: Iterable of ``(user_id, day, total_emissions_kg, breakdown)``
+        profiles (dict): Profiles by user ID, updated in place
+        name (str, optional): Name for newly created profiles (defaults to the user ID)
+
+    Returns:
+        int: Number of records added
+    """
+    count = 0
+    for user_id, day, total, breakdown in records:
+        profile = profiles.get(user_id)
+        if profile is None:
+            profile = profiles[user_id] = UserProfile(user_id, name or user_id)
+        profile.add_emission_record(day, total, breakdown)
+        count += 1
+    return count
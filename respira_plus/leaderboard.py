@@ -0,0 +1,132 @@
+"""
+Leaderboard Module
+
+Incrementally maintained ranking of users by points (or CO2 saved).
+
+Entries are kept in a sorted list of ``(-score, user_id)`` keys. Rank and
+top-K queries are a binary search plus a slice; an update removes and
+re-inserts one key (a binary search plus a memory move). Users sharing a
+score share a rank ("1, 2, 2, 4" ranking) and are listed by user ID.
+
+Tracked profiles push their new score whenever ``complete_mission`` awards
+points, so the leaderboard never has to rescan the user base.
+"""
+
+from bisect import bisect_left, insort
+
+
+METRICS = {
+    'points': lambda profile: profile.total_points,
+    'co2_saved': lambda profile: profile.get_total_co2_saved(),
+}
+
+
+class Leaderboard:
+    """
+    Sorted index of user scores.
+    """
+
+    def __init__(self, metric='points'):
+        if metric not in METRICS:
+            raise ValueError(f"Unknown leaderboard metric: {metric}")
+        self.metric = metric
+        self._score_of = METRICS[metric]
+        self._keys = []
+        self._scores = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, user_id):
+        return user_id in self._scores
+
+    def set_score(self, user_id, score):
+        """
+        Insert or update a user's score.
+
+        Args:
+            user_id: User ID
+            score (float): New score
+        """
+        old = self._scores.get(user_id)
+        if old is not None:
+            if old == score:
+                return
+            del self._keys[bisect_left(self._keys, (-old, user_id))]
+        self._scores[user_id] = score
+        insort(self._keys, (-score, user_id))
+
+    def remove(self, user_id):
+        """
+        Remove a user.
+
+        Returns:
+            bool: True if the user was on the leaderboard
+        """
+        score = self._scores.pop(user_id, None)
+        if score is None:
+            return False
+        del self._keys[bisect_left(self._keys, (-score, user_id))]
+        return True
+
+    def track(self, profile):
+        """
+        Add a profile and follow its future score changes.
+
+        Args:
+            profile (UserProfile): Profile to track
+        """
+        self.set_score(profile.user_id, self._score_of(profile))
+        profile.add_listener(self._profile_changed)
+
+    def _profile_changed(self, profile):
+        self.set_score(profile.user_id, self._score_of(profile))
+
+    def score(self, user_id):
+        """Get a user's score, or None if not ranked."""
+        return self._scores.get(user_id)
+
+    def rank(self, user_id):
+        """
+        Get a user's 1-based rank.
+
+        Returns:
+            int or None: Rank, or None if the user is not ranked
+        """
+        score = self._scores.get(user_id)
+        if score is None:
+            return None
+        return bisect_left(self._keys, (-score,)) + 1
+
+    def count_above(self, score):
+        """
+        Count the users ranked strictly above a score.
+
+        Args:
+            score (float): Threshold score
+
+        Returns:
+            int: Number of users with a higher score
+        """
+        return bisect_left(self._keys, (-score,))
+
+    def top(self, limit=10, offset=0):
+        """
+        Get a page of the leaderboard.
+
+        Args:
+            limit (int): Maximum number of entries
+            offset (int): Number of entries to skip
+
+        Returns:
+            list: Entries with ``rank``, ``user_id`` and ``score``
+        """
+        entries = []
+        rank = None
+        previous = None
+        for position, (negative, user_id) in enumerate(self._keys[offset:offset + limit], offset):
+            if negative != previous:
+                rank = position + 1 if previous is not None else bisect_left(self._keys, (negative,)) + 1
+                previous = negative
+            entries.append({'rank': rank, 'user_id': user_id, 'score': -negative})
+        return entries
@@ -0,0 +1,224 @@
+"""
+Recommendations Module
+
+Ranks tips and missions for a user by where their footprint actually is.
+
+An entry's score is the share of the user's recent emissions in the entry's
+category times the entry's weight (impact level for tips, CO2 savings for
+missions). Entries outside the tracked categories (e.g. 'general') use an
+even share. Since the weight of an entry does not depend on the user, the
+entries of each category are sorted by weight once when the recommender is
+built. Ranking a user then needs one multiplication per category plus a
+k-way merge of the presorted groups, independent of the catalog size, and
+a whole user base can be ranked in one batch with ``recommend_batch``.
+"""
+
+import heapq
+from datetime import datetime, timedelta
+from itertools import islice
+
+from respira_plus.emissions_history import CATEGORIES
+from respira_plus.tips_missions import MISSION_CATALOG, TIP_CATALOG
+
+
+IMPACT_WEIGHTS = {'high': 1.0, 'medium': 0.6, 'low': 0.3}
+
+DEFAULT_LIMIT = 5
+RECENT_DAYS = 30
+
+
+def recent_breakdown(profile, days=RECENT_DAYS, today=None):
+    """
+    Sum a user's emissions by category over the last days.
+
+    Reads the daily rollups of the history rather than the raw records.
+
+    Args:
+        profile (UserProfile): User profile
+        days (int): Number of days, including today
+        today (date, optional): Last day (default: today)
+
+    Returns:
+        dict: Emissions by category in kg CO2e
+    """
+    end = today or datetime.now().date()
+    start = end - timedelta(days=days - 1)
+    breakdown = dict.fromkeys(CATEGORIES, 0.0)
+    for entry in profile.get_emissions_series(start, end, 'day'):
+        for category, value in entry['breakdown'].items():
+            breakdown[category] += value
+    return breakdown
+
+
+def _scored(group, share):
+    """Yield ``(-score, id, entry)`` for a presorted group, best first."""
+    for weight, entry_id, entry in group:
+        yield -share * weight, entry_id, entry
+
+
+class Recommender:
+    """
+    Scores catalog tips and missions against emission breakdowns.
+    """
+
+    def __init__(self, tips=TIP_CATALOG, missions=MISSION_CATALOG, categories=CATEGORIES):
+        """
+        Build the per-category rankings.
+
+        Args:
+            tips (Catalog): Tip catalog
+            missions (Catalog): Mission catalog
+            categories (tuple): Emission categories of the breakdowns
+        """
+        self.categories = tuple(categories)
+        max_savings = max((mission['co2_savings_kg'] for mission in missions), default=0.0) or 1.0
+        self._groups = {
+            'tips': self._group(tips, lambda tip: IMPACT_WEIGHTS.get(tip['impact'], 0.0)),
+            'missions': self._group(missions, lambda mission: mission['co2_savings_kg'] / max_savings),
+        }
+
+    def _group(self, catalog, weight_of):
+        # slot -> [(weight, id, entry)] by descending weight; slot None holds
+        # entries whose category is not a tracked emission category.
+        groups = {}
+        for entry in catalog:
+            category = entry['category']
+            slot = self.categories.index(category) if category in self.categories else None
+            groups.setdefault(slot, []).append((weight_of(entry), entry['id'], entry))
+        for group in groups.values():
+            group.sort(key=lambda item: (-item[0], item[1]))
+        return groups
+
+    def shares(self, breakdown):
+        """
+        Get the share of each category in an emission breakdown.
+
+        Args:
+            breakdown (dict): Emissions by category
+
+        Returns:
+            tuple: Shares aligned with ``categories`` (even if the total is 0)
+        """
+        values = [max(breakdown.get(category, 0.0), 0.0) for category in self.categories]
+        total = sum(values)
+        if not total:
+            return (1.0 / len(self.categories),) * len(self.categories)
+        return tuple(value / total for value in values)
+
+    def _ranked(self, kind, shares):
+        even = 1.0 / len(shares)
+        return heapq.merge(*(
+            _scored(group, even if slot is None else shares[slot])
+            for slot, group in self._groups[kind].items()
+        ))
+
+    def rank(self, breakdown, kind='tips', limit=DEFAULT_LIMIT):
+        """
+        Get the best-scoring tips or missions for a breakdown.
+
+        Args:
+            breakdown (dict): Emissions by category
+            kind (str): 'tips' or 'missions'
+            limit (int): Maximum number of entries
+
+        Returns:
+            list: Entries with their catalog fields plus ``score``, best first
+        """
+        if kind not in self._groups:
+            raise ValueError(f"Unknown recommendation kind: {kind}")
+        return [
+            {**entry, 'score': -negative}
+            for negative, _, entry in islice(self._ranked(kind, self.shares(breakdown)), limit)
+        ]
+
+    def recommend(self, breakdown, limit=DEFAULT_LIMIT):
+        """
+        Get the best tips and missions for a breakdown.
+
+        Returns:
+            dict: ``tips`` and ``missions`` rankings
+        """
+        return {
+            'tips': self.rank(breakdown, 'tips', limit),
+            'missions': self.rank(breakdown, 'missions', limit),
+        }
+
+    def recommend_batch(self, breakdowns, limit=DEFAULT_LIMIT):
+        """
+        Rank tips and missions for many users at once.
+
+        Args:
+            breakdowns (dict): Emission breakdown by user ID
+            limit (int): Maximum number of entries per ranking
+
+        Returns:
+            dict: ``recommend`` result by user ID
+        """
+        return {user_id: self.recommend(breakdown, limit) for user_id, breakdown in breakdowns.items()}
+
+
+class RecommendationCache:
+    """
+    Per-user cache of recommendations.
+
+    An entry stays valid while the user's history has the same number of
+    records and the day has not changed.
+    """
+
+    def __init__(self, recommender=None, limit=DEFAULT_LIMIT, days=RECENT_DAYS):
+        self.recommender = recommender or Recommender()
+        self.limit = limit
+        self.days = days
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _key(self, profile, today):
+        return (len(profile.emissions_history), today)
+
+    def get(self, profile, today=None):
+        """
+        Get a user's recommendations, computing them if stale.
+
+        Args:
+            profile (UserProfile): User profile
+            today (date, optional): Current day
+
+        Returns:
+            dict: ``tips`` and ``missions`` rankings
+        """
+        today = today or datetime.now().date()
+        key = self._key(profile, today)
+        cached = self._entries.get(profile.user_id)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        result = self.recommender.recommend(recent_breakdown(profile, self.days, today), self.limit)
+        self._entries[profile.user_id] = (key, result)
+        return result
+
+    def refresh(self, profiles, today=None):
+        """
+        Recompute the recommendations of many users in one batch.
+
+        Args:
+            profiles (iterable): User profiles
+            today (date, optional): Current day
+
+        Returns:
+            int: Number of users refreshed
+        """
+        today = today or datetime.now().date()
+        profiles = list(profiles)
+        breakdowns = {profile.user_id: recent_breakdown(profile, self.days, today) for profile in profiles}
+        results = self.recommender.recommend_batch(breakdowns, self.limit)
+        for profile in profiles:
+            self._entries[profile.user_id] = (self._key(profile, today), results[profile.user_id])
+        return len(profiles)
+
+    def invalidate(self, user_id=None):
+        """Drop the cached recommendations of one user, or of all users."""
+        if user_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(user_id, None)
@@ -0,0 +1,194 @@
+"""
+Record Types Module
+
+Compact record types used by ``UserProfile``.
+
+Both types use ``__slots__`` instead of per-record dicts and behave like the
+dicts they replace (``record['points']``, ``record.get(...)``, ``dict(record)``,
+comparison with plain dicts), so existing callers keep working.
+``to_dict`` returns exactly the dict the profile used to store.
+"""
+
+from collections.abc import Mapping, MutableMapping
+
+
+class EmissionRecord(Mapping):
+    """
+    One emission record: date, total and breakdown by category.
+
+    The breakdown is stored as a tuple of values aligned with ``categories``
+    plus a bitmask of which categories were present, and only rebuilt as a
+    dict when accessed.
+    """
+
+    __slots__ = ('date', 'total_emissions_kg', '_categories', '_values', '_present', '_extras')
+
+    KEYS = ('date', 'total_emissions_kg', 'breakdown')
+
+    def __init__(self, date, total_emissions_kg, categories, values, present, extras=None):
+        self.date = date
+        self.total_emissions_kg = total_emissions_kg
+        self._categories = categories
+        self._values = values
+        self._present = present
+        self._extras = extras
+
+    @classmethod
+    def from_breakdown(cls, date, total_emissions_kg, breakdown, categories):
+        """
+        Create a record from a breakdown dict.
+
+        Args:
+            date (str): Date in ISO format
+            total_emissions_kg (float): Total emissions in kg CO2e
+            breakdown (dict): Breakdown by category
+            categories (tuple): Categories stored as values
+
+        Returns:
+            EmissionRecord: Record instance
+        """
+        values = []
+        present = 0
+        for c, category in enumerate(categories):
+            if category in breakdown:
+                present |= 1 << c
+                values.append(breakdown[category])
+            else:
+                values.append(0.0)
+        extras = {key: value for key, value in breakdown.items() if key not in categories}
+        return cls(date, total_emissions_kg, categories, tuple(values), present, extras or None)
+
+    @property
+    def breakdown(self):
+        """Breakdown by category as a dict."""
+        breakdown = {
+            category: value
+            for c, (category, value) in enumerate(zip(self._categories, self._values))
+            if self._present & (1 << c)
+        }
+        if self._extras:
+            breakdown.update(self._extras)
+        return breakdown
+
+    def __getitem__(self, key):
+        if key in self.KEYS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def __repr__(self):
+        return f"EmissionRecord({self.to_dict()!r})"
+
+    def to_dict(self):
+        """
+        Convert the record to a dictionary.
+
+        Returns:
+            dict: Record data
+        """
+        return {
+            'date': self.date,
+            'total_emissions_kg': self.total_emissions_kg,
+            'breakdown': self.breakdown
+        }
+
+
+class MissionRecord(MutableMapping):
+    """
+    An active or completed mission of a user.
+
+    Fields missing from the source data stay unset and are left out of
+    ``to_dict``; keys outside ``FIELDS`` are kept in a side dict.
+    """
+
+    FIELDS = (
+        'mission_id', 'title', 'started_at', 'duration_days',
+        'points', 'co2_savings_kg', 'status', 'completed_at'
+    )
+
+    __slots__ = FIELDS + ('_extra',)
+
+    def __init__(self, data=None, **fields):
+        self._extra = None
+        if data:
+            self.update(data)
+        if fields:
+            self.update(fields)
+
+    @classmethod
+    def from_mission(cls, mission, started_at):
+        """
+        Create an active mission record from catalog mission details.
+
+        Args:
+            mission (dict): Mission details
+            started_at (str): Start date in ISO format
+
+        Returns:
+            MissionRecord: Record instance
+        """
+        record = cls()
+        record.mission_id = mission['id']
+        record.title = mission['title']
+        record.started_at = started_at
+        record.duration_days = mission['duration_days']
+        record.points = mission['points']
+        record.co2_savings_kg = mission['co2_savings_kg']
+        record.status = 'active'
+        return record
+
+    def __getitem__(self, key):
+        if key in self.FIELDS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self.FIELDS:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in self.FIELDS:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self._extra and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self):
+        for name in self.FIELDS:
+            if hasattr(self, name):
+                yield name
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"MissionRecord({self.to_dict()!r})"
+
+    def to_dict(self):
+        """
+        Convert the record to a dictionary.
+
+        Returns:
+            dict: Record data
+        """
+        return dict(self.items())
@@ -0,0 +1,219 @@
+"""
+Profile Repository Module
+
+Stores user profiles on disk, partitioned into a fixed number of shards,
+and answers population-wide queries in parallel.
+
+Each profile is saved in the binary format of ``UserProfile.to_bytes`` as
+``<directory>/shard-NNN/<user_id>.profile``; the shard of a user is the
+CRC32 of the user ID modulo the shard count. Aggregate queries compute a
+partial result per shard in a process pool and merge the partials at the
+end, so analytics scale with the number of cores.
+"""
+
+import json
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import quote, unquote
+
+from respira_plus.user_profile import UserProfile
+
+
+MANIFEST = 'repository.json'
+SUFFIX = '.profile'
+
+
+def _shard_directory(directory, shard):
+    return os.path.join(directory, f'shard-{shard:03d}')
+
+
+def _empty_aggregate():
+    return {
+        'users': 0,
+        'total_emissions_kg': 0.0,
+        'emissions_by_category': {},
+        'total_co2_saved_kg': 0.0,
+        'net_impact_kg': 0.0,
+        'missions_completed': 0,
+        'total_points': 0
+    }
+
+
+def aggregate_shard(shard_directory):
+    """
+    Compute partial aggregates over every profile in one shard directory.
+
+    Args:
+        shard_directory (str): Shard directory
+
+    Returns:
+        dict: Partial aggregates (see ``merge_aggregates``)
+    """
+    partial = _empty_aggregate()
+    if not os.path.isdir(shard_directory):
+        return partial
+    by_category = partial['emissions_by_category']
+    for entry in os.scandir(shard_directory):
+        if not entry.name.endswith(SUFFIX):
+            continue
+        with open(entry.path, 'rb') as f:
+            profile = UserProfile.from_bytes(f.read())
+        total = profile.get_total_emissions()
+        saved = profile.get_total_co2_saved()
+        partial['users'] += 1
+        partial['total_emissions_kg'] += total
+        partial['total_co2_saved_kg'] += saved
+        partial['net_impact_kg'] += total - saved
+        partial['missions_completed'] += len(profile.completed_missions)
+        partial['total_points'] += profile.total_points
+        for category, value in profile.get_emissions_by_category().items():
+            by_category[category] = by_category.get(category, 0.0) + value
+    return partial
+
+
+def merge_aggregates(partials):
+    """
+    Merge per-shard partial aggregates.
+
+    Args:
+        partials (iterable): Results of ``aggregate_shard``
+
+    Returns:
+        dict: Population totals plus ``average_net_impact_kg``
+    """
+    result = _empty_aggregate()
+    for partial in partials:
+        for key in ('users', 'total_emissions_kg', 'total_co2_saved_kg',
+                    'net_impact_kg', 'missions_completed', 'total_points'):
+            result[key] += partial[key]
+        for category, value in partial['emissions_by_category'].items():
+            result['emissions_by_category'][category] = (
+                result['emissions_by_category'].get(category, 0.0) + value
+            )
+    users = result['users']
+    result['average_net_impact_kg'] = result['net_impact_kg'] / users if users else 0.0
+    return result
+
+
+class ProfileRepository:
+    """
+    Sharded on-disk store of user profiles.
+    """
+
+    def __init__(self, directory, shards=16):
+        """
+        Open a repository, creating it if needed.
+
+        Args:
+            directory (str): Root directory
+            shards (int): Number of shards for a new repository; an existing
+                repository keeps the count it was created with
+        """
+        self.directory = directory
+        manifest_path = os.path.join(directory, MANIFEST)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding='utf-8') as f:
+                self.shards = json.load(f)['shards']
+        else:
+            if shards < 1:
+                raise ValueError("shards must be at least 1")
+            self.shards = shards
+            os.makedirs(directory, exist_ok=True)
+            for shard in range(shards):
+                os.makedirs(_shard_directory(directory, shard), exist_ok=True)
+            with open(manifest_path, 'w', encoding='utf-8') as f:
+                json.dump({'shards': shards}, f)
+
+    def shard_of(self, user_id):
+        """Get the shard number of a user."""
+        return zlib.crc32(str(user_id).encode('utf-8')) % self.shards
+
+    def _path(self, user_id):
+        shard_directory = _shard_directory(self.directory, self.shard_of(user_id))
+        return os.path.join(shard_directory, quote(str(user_id), safe='') + SUFFIX)
+
+    def save(self, profile):
+        """
+        Save a profile, atomically replacing any previous version.
+
+        Args:
+            profile (UserProfile): Profile to save
+        """
+        path = self._path(profile.user_id)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(profile.to_bytes())
+        os.replace(temp_path, path)
+
+    def save_all(self, profiles):
+        """Save several profiles."""
+        for profile in profiles:
+            self.save(profile)
+
+    def load(self, user_id):
+        """
+        Load a profile.
+
+        Returns:
+            UserProfile or None: Profile if stored
+        """
+        try:
+            with open(self._path(user_id), 'rb') as f:
+                return UserProfile.from_bytes(f.read())
+        except FileNotFoundError:
+            return None
+
+    def delete(self, user_id):
+        """
+        Delete a profile.
+
+        Returns:
+            bool: True if the profile existed
+        """
+        try:
+            os.remove(self._path(user_id))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def __contains__(self, user_id):
+        return os.path.exists(self._path(user_id))
+
+    def user_ids(self, shard=None):
+        """
+        Iterate over stored user IDs, optionally for one shard.
+
+        Yields:
+            str: User ID
+        """
+        shards = range(self.shards) if shard is None else (shard,)
+        for number in shards:
+            with os.scandir(_shard_directory(self.directory, number)) as entries:
+                for entry in entries:
+                    if entry.name.endswith(SUFFIX):
+                        yield unquote(entry.name[:-len(SUFFIX)])
+
+    def __len__(self):
+        return sum(1 for _ in self.user_ids())
+
+    def aggregate(self, workers=None):
+        """
+        Compute population-wide statistics across all shards.
+
+        Each shard is aggregated in a worker process and the partial results
+        are merged.
+
+        Args:
+            workers (int, optional): Worker processes (default: CPU count);
+                0 aggregates the shards in the calling process
+
+        Returns:
+            dict: Users, total and per-category emissions, CO2 saved,
+            total and average net impact, missions completed and points
+        """
+        shard_directories = [_shard_directory(self.directory, shard) for shard in range(self.shards)]
+        if workers == 0:
+            return merge_aggregates(map(aggregate_shard, shard_directories))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return merge_aggregates(pool.map(aggregate_shard, shard_directories))
@@ -0,0 +1,111 @@
+"""
+Emission Rollups Module
+
+Pre-aggregated daily, ISO-weekly and monthly emission totals per category.
+
+Every record updates one bucket per granularity, so a chart series for any
+range costs one lookup per period in the range, regardless of how many raw
+records the history holds. Records are bucketed by their local calendar
+date, the same way naive ISO dates are interpreted elsewhere.
+"""
+
+from datetime import date, datetime
+
+
+GRANULARITIES = ('day', 'week', 'month')
+
+
+def _to_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.fromisoformat(value).date()
+
+
+def _bucket_keys(day):
+    """Integer bucket keys of a date for each granularity."""
+    ordinal = day.toordinal()
+    return (
+        ordinal,
+        ordinal - day.weekday(),
+        day.year * 12 + day.month - 1,
+    )
+
+
+def _period_label(granularity, key):
+    if granularity == 'day':
+        return date.fromordinal(key).isoformat()
+    if granularity == 'week':
+        year, week, _ = date.fromordinal(key).isocalendar()
+        return f"{year}-W{week:02d}"
+    return f"{key // 12:04d}-{key % 12 + 1:02d}"
+
+
+class EmissionRollups:
+    """
+    Running per-period totals for one emission history.
+
+    Each bucket is a list ``[total, record_count, *category_totals]``.
+    """
+
+    def __init__(self, categories):
+        self.categories = tuple(categories)
+        self._buckets = {granularity: {} for granularity in GRANULARITIES}
+
+    def add(self, timestamp, total, values):
+        """
+        Add one record to its day, week and month buckets.
+
+        Args:
+            timestamp (float): POSIX timestamp of the record
+            total (float): Total emissions in kg CO2e
+            values (sequence): Emissions per category, aligned with ``categories``
+        """
+        day = datetime.fromtimestamp(timestamp).date()
+        width = 2 + len(self.categories)
+        for granularity, key in zip(GRANULARITIES, _bucket_keys(day)):
+            buckets = self._buckets[granularity]
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = [0.0] * width
+            bucket[0] += total
+            bucket[1] += 1
+            for c, value in enumerate(values, 2):
+                bucket[c] += value
+
+    def series(self, start, end, granularity='day'):
+        """
+        Get emission totals for every period between two dates.
+
+        Periods without records are included with zero totals.
+
+        Args:
+            start (str, date or datetime): First day (inclusive)
+            end (str, date or datetime): Last day (inclusive)
+            granularity (str): 'day', 'week' (ISO weeks) or 'month'
+
+        Returns:
+            list: Entries with ``period``, ``total_emissions_kg``,
+            ``breakdown`` and ``records``
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity: {granularity}")
+        index = GRANULARITIES.index(granularity)
+        first = _bucket_keys(_to_date(start))[index]
+        last = _bucket_keys(_to_date(end))[index]
+        step = 7 if granularity == 'week' else 1
+        buckets = self._buckets[granularity]
+        empty = [0.0] * (2 + len(self.categories))
+
+        series = []
+        for key in range(first, last + 1, step):
+            bucket = buckets.get(key, empty)
+            series.append({
+                'period': _period_label(granularity, key),
+                'total_emissions_kg': bucket[0],
+                'breakdown': dict(zip(self.categories, bucket[2:])),
+                'records': int(bucket[1])
+            })
+        return series
+
@@ -2,136 +2,140 @@
 Sustainable Tips and Missions Module
 
 Provides users with sustainable tips and missions to reduce their carbon footprint.
+
+The tips and missions are loaded from a JSON data file (``data/catalog.json``
+by default) into immutable catalogs, built once at import. Every entry is a
+read-only mapping, and each catalog keeps an ID index and per-category
+tuples. Lookups are O(1), and the manager returns the shared records and
+tuples instead of copying them.
 """
 
+import json
+import os
 import random
+from types import MappingProxyType
+
+
+CATALOG_PATH = os.path.join(os.path.dirname(__file__), 'data', 'catalog.json')
+
+TIP_FIELDS = ('id', 'category', 'title', 'description', 'impact')
+MISSION_FIELDS = ('id', 'title', 'description', 'category', 'duration_days', 'points', 'co2_savings_kg')
+
+
+class Catalog:
+    """
+    Immutable, indexed collection of catalog entries (tips or missions).
+    """
+    
+    def __init__(self, entries, required_fields=('id', 'category')):
+        """
+        Build a catalog.
+        
+        Args:
+            entries (iterable): Entry dicts
+            required_fields (tuple): Fields every entry must have
+            
+        Raises:
+            ValueError: If an entry lacks a field or an ID is repeated
+        """
+        items = []
+        by_id = {}
+        by_category = {}
+        for entry in entries:
+            missing = [field for field in required_fields if field not in entry]
+            if missing:
+                raise ValueError(f"Catalog entry {entry.get('id')!r} is missing: {', '.join(missing)}")
+            if entry['id'] in by_id:
+                raise ValueError(f"Duplicate catalog ID: {entry['id']}")
+            item = MappingProxyType(dict(entry))
+            items.append(item)
+            by_id[item['id']] = item
+            by_category.setdefault(item['category'], []).append(item)
+        
+        self.items = tuple(items)
+        self._by_id = by_id
+        self._by_category = {category: tuple(group) for category, group in by_category.items()}
+    
+    def __len__(self):
+        return len(self.items)
+    
+    def __iter__(self):
+        return iter(self.items)
+    
+    def __contains__(self, entry_id):
+        return entry_id in self._by_id
+    
+    @property
+    def categories(self):
+        """Categories present in the catalog."""
+        return tuple(self._by_category)
+    
+    def get(self, entry_id):
+        """Get an entry by ID, or None."""
+        return self._by_id.get(entry_id)
+    
+    def by_category(self, category):
+        """Get the entries of a category (an empty tuple if none)."""
+        return self._by_category.get(category, ())
+
+
+def load_catalogs(path=CATALOG_PATH):
+    """
+    Load the tip and mission catalogs from a JSON data file.
+    
+    The file holds an object with ``tips`` and ``missions`` lists.
+    
+    Args:
+        path (str): Data file path
+        
+    Returns:
+        tuple: (tips Catalog, missions Catalog)
+    """
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    return (
+        Catalog(data.get('tips', ()), TIP_FIELDS),
+        Catalog(data.get('missions', ()), MISSION_FIELDS)
+    )
+
+
+TIP_CATALOG, MISSION_CATALOG = load_catalogs()
 
 
 class TipsMissionsManager:
     """
     Manages sustainable tips and missions for users.
+    
+    Returned tips and missions are read-only mappings shared by all callers;
+    use ``dict(tip)`` to get a modifiable copy.
     """
     
-    TIPS = [
-        {
-            'id': 1,
-            'category': 'transportation',
-            'title': 'Use Public Transportation',
-            'description': 'Switch from car to bus or train for your daily commute to reduce emissions by up to 50%.',
-            'impact': 'high'
-        },
-        {
-            'id': 2,
-            'category': 'transportation',
-            'title': 'Bike or Walk for Short Trips',
-            'description': 'For trips under 3km, consider walking or biking instead of driving.',
-            'impact': 'medium'
-        },
-        {
-            'id': 3,
-            'category': 'transportation',
-            'title': 'Carpool When Possible',
-            'description': 'Share rides with colleagues or friends to reduce individual carbon footprint.',
-            'impact': 'medium'
-        },
-        {
-            'id': 4,
-            'category': 'energy',
-            'title': 'Switch to LED Bulbs',
-            'description': 'LED bulbs use 75% less energy than traditional incandescent bulbs.',
-            'impact': 'medium'
-        },
-        {
-            'id': 5,
-            'category': 'energy',
-            'title': 'Unplug Devices',
-            'description': 'Unplug electronics when not in use to avoid phantom energy consumption.',
-            'impact': 'low'
-        },
-        {
-            'id': 6,
-            'category': 'energy',
-            'title': 'Use Energy-Efficient Appliances',
-            'description': 'Choose appliances with high energy efficiency ratings (A++ or better).',
-            'impact': 'high'
-        },
-        {
-            'id': 7,
-            'category': 'food',
-            'title': 'Reduce Meat Consumption',
-            'description': 'Try meatless Mondays or reduce meat portions to lower your food carbon footprint.',
-            'impact': 'high'
-        },
-        {
-            'id': 8,
-            'category': 'food',
-            'title': 'Buy Local Produce',
-            'description': 'Choose locally grown fruits and vegetables to reduce transportation emissions.',
-            'impact': 'medium'
-        },
-        {
-            'id': 9,
-            'category': 'food',
-            'title': 'Reduce Food Waste',
-            'description': 'Plan meals and store food properly to minimize waste.',
-            'impact': 'medium'
-        },
-        {
-            'id': 10,
-            'category': 'general',
-            'title': 'Recycle and Compost',
-            'description': 'Separate recyclables and compost organic waste to reduce landfill emissions.',
-            'impact': 'medium'
-        }
-    ]
-    
-    MISSIONS = [
-        {
-            'id': 1,
-            'title': 'Public Transport Challenge',
-            'description': 'Use public transportation for 5 consecutive workdays',
-            'category': 'transportation',
-            'duration_days': 5,
-            'points': 100,
-            'co2_savings_kg': 15.0
-        },
-        {
-            'id': 2,
-            'title': 'Zero Waste Week',
-            'description': 'Reduce your food waste to zero for one week',
-            'category': 'food',
-            'duration_days': 7,
-            'points': 150,
-            'co2_savings_kg': 10.0
-        },
-        {
-            'id': 3,
-            'title': 'Meatless Week',
-            'description': 'Follow a vegetarian diet for 7 days',
-            'category': 'food',
-            'duration_days': 7,
-            'points': 200,
-            'co2_savings_kg': 25.0
-        },
-        {
-            'id': 4,
-            'title': 'Energy Saver',
-            'description': 'Reduce electricity consumption by 20% for one month',
-            'category': 'energy',
-            'duration_days': 30,
-            'points': 250,
-            'co2_savings_kg': 40.0
-        },
-        {
-            'id': 5,
-            'title': 'Bike to Work',
-            'description': 'Commute by bike for 10 workdays',
-            'category': 'transportation',
-            'duration_days': 14,
-            'points': 180,
-            'co2_savings_kg': 30.0
-        }
-    ]
+    TIPS = TIP_CATALOG.items
+    MISSIONS = MISSION_CATALOG.items
+    
+    def __init__(self, tips=None, missions=None):
+        """
+        Create a manager.
+        
+        Args:
+            tips (Catalog, optional): Tip catalog (default: bundled catalog)
+            missions (Catalog, optional): Mission catalog (default: bundled catalog)
+        """
+        self.tips = tips if tips is not None else TIP_CATALOG
+        self.missions = missions if missions is not None else MISSION_CATALOG
+    
+    @classmethod
+    def from_file(cls, path):
+        """
+        Create a manager with the catalogs of a JSON data file.
+        
+        Args:
+            path (str): Data file path (see ``load_catalogs``)
+            
+        Returns:
+            TipsMissionsManager: Manager instance
+        """
+        return cls(*load_catalogs(path))
     
     def get_tips_by_category(self, category=None):
         """
@@ -141,11 +145,11 @@ class TipsMissionsManager:
             category (str, optional): Filter by category
             
         Returns:
-            list: List of tips
+            tuple: Tips
         """
         if category:
-            return [tip for tip in self.TIPS if tip['category'] == category]
-        return self.TIPS.copy()
+            return self.tips.by_category(category)
+        return self.tips.items
     
     def get_random_tips(self, count=3):
         """
@@ -157,7 +161,7 @@ class TipsMissionsManager:
         Returns:
             list: Random tips
         """
-        return random.sample(self.TIPS, min(count, len(self.TIPS)))
+        return random.sample(self.tips.items, min(count, len(self.tips)))
     
     def get_tip_by_id(self, tip_id):
         """
@@ -167,21 +171,18 @@ class TipsMissionsManager:
             tip_id (int): Tip ID
             
         Returns:
-            dict or None: Tip if found
+            Mapping or None: Tip if found
         """
-        for tip in self.TIPS:
-            if tip['id'] == tip_id:
-                return tip.copy()
-        return None
+        return self.tips.get(tip_id)
     
     def get_missions(self):
         """
         Get all available missions.
         
         Returns:
-            list: List of missions
+            tuple: Missions
         """
-        return self.MISSIONS.copy()
+        return self.missions.items
     
     def get_mission_by_id(self, mission_id):
         """
@@ -191,12 +192,9 @@ class TipsMissionsManager:
             mission_id (int): Mission ID
             
         Returns:
-            dict or None: Mission if found
+            Mapping or None: Mission if found
         """
-        for mission in self.MISSIONS:
-            if mission['id'] == mission_id:
-                return mission.copy()
-        return None
+        return self.missions.get(mission_id)
     
     def get_missions_by_category(self, category):
         """
@@ -206,6 +204,6 @@ class TipsMissionsManager:
             category (str): Category to filter by
             
         Returns:
-            list: List of missions
+            tuple: Missions
         """
-        return [mission for mission in self.MISSIONS if mission['category'] == category]
+        return self.missions.by_category(category)
@@ -6,6 +6,17 @@ Tracks user progress, carbon footprint history, and mission completion.
 
 from datetime import datetime, timedelta
 import json
+import struct
+from math import isclose
+
+from respira_plus.emissions_history import EmissionsHistory
+from respira_plus.records import MissionRecord
+
+
+# Binary profile format: magic, format version, metadata length
+PROFILE_MAGIC = b'RSP+'
+PROFILE_VERSION = 1
+PROFILE_HEADER = struct.Struct('<4sHI')
 
 
 class UserProfile:
@@ -17,10 +28,49 @@ class UserProfile:
         self.user_id = user_id
         self.name = name
         self.total_points = 0
-        self.emissions_history = []
+        self.emissions_history = EmissionsHistory()
         self.completed_missions = []
         self.active_missions = []
         self.created_at = datetime.now().isoformat()
+        self.emission_log = None
+        self._listeners = []
+    
+    @property
+    def emissions_history(self):
+        """Emission records sorted by date (see EmissionsHistory)."""
+        return self._emissions_history
+    
+    @emissions_history.setter
+    def emissions_history(self, records):
+        if not isinstance(records, EmissionsHistory):
+            records = EmissionsHistory(records)
+        self._emissions_history = records
+    
+    @property
+    def active_missions(self):
+        """Active mission records in the order they were started."""
+        return list(self._active_missions.values())
+    
+    @active_missions.setter
+    def active_missions(self, missions):
+        self._active_missions = {}
+        for mission in missions:
+            if not isinstance(mission, MissionRecord):
+                mission = MissionRecord(mission)
+            self._active_missions.setdefault(mission['mission_id'], mission)
+    
+    @property
+    def completed_missions(self):
+        """Completed mission records."""
+        return self._completed_missions
+    
+    @completed_missions.setter
+    def completed_missions(self, missions):
+        self._completed_missions = [
+            mission if isinstance(mission, MissionRecord) else MissionRecord(mission)
+            for mission in missions
+        ]
+        self._co2_saved = sum(mission['co2_savings_kg'] for mission in self._completed_missions)
     
     def add_emission_record(self, date, emissions_kg, breakdown):
         """
@@ -31,12 +81,28 @@ class UserProfile:
             emissions_kg (float): Total emissions in kg CO2e
             breakdown (dict): Breakdown by category
         """
-        record = {
-            'date': date,
-            'total_emissions_kg': emissions_kg,
-            'breakdown': breakdown
-        }
-        self.emissions_history.append(record)
+        if self.emission_log is not None:
+            self.emission_log.append(date, emissions_kg, breakdown)
+        self.emissions_history.add(date, emissions_kg, breakdown)
+    
+    def attach_emission_log(self, log):
+        """
+        Persist every new emission record to an append-only log.
+        
+        Args:
+            log (EmissionLog): Log to append to
+        """
+        self.emission_log = log
+    
+    def add_listener(self, callback):
+        """
+        Register a callback run as ``callback(profile)`` whenever a completed
+        mission changes the profile's points and CO2 saved.
+        
+        Args:
+            callback (callable): Callback
+        """
+        self._listeners.append(callback)
     
     def start_mission(self, mission):
         """
@@ -44,17 +110,40 @@ class UserProfile:
         
         Args:
             mission (dict): Mission details
+            
+        Returns:
+            bool: True if the mission was started, False if it is already active
         """
-        mission_record = {
-            'mission_id': mission['id'],
-            'title': mission['title'],
-            'started_at': datetime.now().isoformat(),
-            'duration_days': mission['duration_days'],
-            'points': mission['points'],
-            'co2_savings_kg': mission['co2_savings_kg'],
-            'status': 'active'
-        }
-        self.active_missions.append(mission_record)
+        if mission['id'] in self._active_missions:
+            return False
+        self._active_missions[mission['id']] = MissionRecord.from_mission(
+            mission, datetime.now().isoformat()
+        )
+        return True
+    
+    def start_missions(self, missions):
+        """
+        Start several missions at once, skipping those already active.
+        
+        Args:
+            missions (iterable): Mission details
+            
+        Returns:
+            int: Number of missions started
+        """
+        return sum(1 for mission in missions if self.start_mission(mission))
+    
+    def get_active_mission(self, mission_id):
+        """
+        Get an active mission record by mission ID.
+        
+        Args:
+            mission_id (int): Mission ID
+            
+        Returns:
+            dict or None: Mission record if the mission is active
+        """
+        return self._active_missions.get(mission_id)
     
     def complete_mission(self, mission_id):
         """
@@ -66,15 +155,29 @@ class UserProfile:
         Returns:
             bool: True if mission was found and completed
         """
-        for i, mission in enumerate(self.active_missions):
-            if mission['mission_id'] == mission_id:
-                mission['status'] = 'completed'
-                mission['completed_at'] = datetime.now().isoformat()
-                self.total_points += mission['points']
-                self.completed_missions.append(mission)
-                self.active_missions.pop(i)
-                return True
-        return False
+        mission = self._active_missions.pop(mission_id, None)
+        if mission is None:
+            return False
+        mission['status'] = 'completed'
+        mission['completed_at'] = datetime.now().isoformat()
+        self.total_points += mission['points']
+        self._co2_saved += mission['co2_savings_kg']
+        self.completed_missions.append(mission)
+        for callback in self._listeners:
+            callback(self)
+        return True
+    
+    def complete_missions(self, mission_ids):
+        """
+        Complete several missions at once, skipping those not active.
+        
+        Args:
+            mission_ids (iterable): Mission IDs to complete
+            
+        Returns:
+            int: Number of missions completed
+        """
+        return sum(1 for mission_id in mission_ids if self.complete_mission(mission_id))
     
     def get_total_emissions(self):
         """
@@ -83,7 +186,16 @@ class UserProfile:
         Returns:
             float: Total emissions in kg CO2e
         """
-        return sum(record['total_emissions_kg'] for record in self.emissions_history)
+        return self.emissions_history.total()
+    
+    def get_emissions_by_category(self):
+        """
+        Get total emissions per category across all records.
+        
+        Returns:
+            dict: Total emissions in kg CO2e by category
+        """
+        return self.emissions_history.category_totals()
     
     def get_emissions_by_period(self, days=30):
         """
@@ -95,11 +207,24 @@ class UserProfile:
         Returns:
             list: Emission records within the period
         """
-        cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
-        return [
-            record for record in self.emissions_history
-            if record['date'] >= cutoff_date
-        ]
+        cutoff_date = datetime.now() - timedelta(days=days)
+        return self.emissions_history.between(cutoff_date)
+    
+    def get_emissions_series(self, start, end, granularity='day'):
+        """
+        Get emissions per day, ISO week or month for a date range.
+        
+        Served from pre-aggregated rollups, without reading raw records.
+        
+        Args:
+            start (str): First day in ISO format (inclusive)
+            end (str): Last day in ISO format (inclusive)
+            granularity (str): 'day', 'week' or 'month'
+            
+        Returns:
+            list: Entries with period, total emissions, breakdown and record count
+        """
+        return self.emissions_history.series(start, end, granularity)
     
     def get_total_co2_saved(self):
         """
@@ -108,7 +233,7 @@ class UserProfile:
         Returns:
             float: Total CO2 saved in kg
         """
-        return sum(mission['co2_savings_kg'] for mission in self.completed_missions)
+        return self._co2_saved
     
     def get_statistics(self):
         """
@@ -119,21 +244,35 @@ class UserProfile:
         """
         total_emissions = self.get_total_emissions()
         total_saved = self.get_total_co2_saved()
-        recent_emissions = self.get_emissions_by_period(30)
+        recent_emissions = self.emissions_history.total_between(datetime.now() - timedelta(days=30))
         
         return {
             'user_id': self.user_id,
             'name': self.name,
             'total_points': self.total_points,
             'total_emissions_kg': total_emissions,
+            'emissions_by_category': self.get_emissions_by_category(),
             'total_co2_saved_kg': total_saved,
             'net_impact_kg': total_emissions - total_saved,
             'missions_completed': len(self.completed_missions),
-            'active_missions': len(self.active_missions),
-            'recent_30_days_emissions': sum(r['total_emissions_kg'] for r in recent_emissions),
+            'active_missions': len(self._active_missions),
+            'recent_30_days_emissions': recent_emissions,
             'created_at': self.created_at
         }
     
+    def check_consistency(self):
+        """
+        Check the running totals against the raw history and missions.
+        
+        Returns:
+            bool: True if every maintained aggregate matches a full recount
+        """
+        saved = sum(mission['co2_savings_kg'] for mission in self.completed_missions)
+        return (
+            self.emissions_history.check_consistency()
+            and isclose(saved, self._co2_saved, rel_tol=1e-9, abs_tol=1e-9)
+        )
+    
     def to_dict(self):
         """
         Convert profile to dictionary.
@@ -145,12 +284,73 @@ class UserProfile:
             'user_id': self.user_id,
             'name': self.name,
             'total_points': self.total_points,
-            'emissions_history': self.emissions_history,
-            'completed_missions': self.completed_missions,
-            'active_missions': self.active_missions,
+            'emissions_history': self.emissions_history.to_list(),
+            'completed_missions': [mission.to_dict() for mission in self.completed_missions],
+            'active_missions': [mission.to_dict() for mission in self._active_missions.values()],
             'created_at': self.created_at
         }
     
+    def to_bytes(self):
+        """
+        Convert profile to the compact binary format.
+        
+        The header and missions are stored as JSON metadata; the emission
+        history is stored as packed columns (see EmissionsHistory.to_bytes).
+        
+        Returns:
+            bytes: Encoded profile
+        """
+        meta = json.dumps({
+            'user_id': self.user_id,
+            'name': self.name,
+            'total_points': self.total_points,
+            'completed_missions': [mission.to_dict() for mission in self.completed_missions],
+            'active_missions': [mission.to_dict() for mission in self._active_missions.values()],
+            'created_at': self.created_at
+        }).encode('utf-8')
+        return b''.join([
+            PROFILE_HEADER.pack(PROFILE_MAGIC, PROFILE_VERSION, len(meta)),
+            meta,
+            self.emissions_history.to_bytes()
+        ])
+    
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Create profile from the compact binary format.
+        
+        The emission history is loaded without creating per-record objects,
+        so statistics can be read straight away.
+        
+        Args:
+            data (bytes-like): Encoded profile
+            
+        Returns:
+            UserProfile: User profile instance
+            
+        Raises:
+            ValueError: If the data is not a complete profile
+        """
+        if len(data) < PROFILE_HEADER.size:
+            raise ValueError("Truncated profile data")
+        magic, version, meta_len = PROFILE_HEADER.unpack_from(data)
+        if magic != PROFILE_MAGIC:
+            raise ValueError("Not a Respira+ profile")
+        if version != PROFILE_VERSION:
+            raise ValueError(f"Unsupported profile format version: {version}")
+        
+        offset = PROFILE_HEADER.size
+        if len(data) < offset + meta_len:
+            raise ValueError("Truncated profile data")
+        meta = json.loads(bytes(data[offset:offset + meta_len]))
+        profile = cls(meta['user_id'], meta['name'])
+        profile.total_points = meta['total_points']
+        profile.completed_missions = meta['completed_missions']
+        profile.active_missions = meta['active_missions']
+        profile.created_at = meta['created_at']
+        profile.emissions_history, _ = EmissionsHistory.from_bytes(data, offset + meta_len)
+        return profile
+    
     @classmethod
     def from_dict(cls, data):
         """
@@ -169,3 +369,32 @@ class UserProfile:
         profile.active_missions = data.get('active_missions', [])
         profile.created_at = data.get('created_at', datetime.now().isoformat())
         return profile
+
+
+
+def start_mission_for_all(profiles, mission):
+    """
+    Start a mission for many users, e.g. for a campaign.
+    
+    Args:
+        profiles (iterable): User profiles
+        mission (dict): Mission details
+        
+    Returns:
+        list: IDs of the users for whom the mission was started
+    """
+    return [profile.user_id for profile in profiles if profile.start_mission(mission)]
+
+
+def complete_mission_for_all(profiles, mission_id):
+    """
+    Complete a mission for every user that has it active.
+    
+    Args:
+        profiles (iterable): User profiles
+        mission_id (int): Mission ID to complete
+        
+    Returns:
+        list: IDs of the users whose mission was completed
+    """
+    return [profile.user_id for profile in profiles if profile.complete_mission(mission_id)]
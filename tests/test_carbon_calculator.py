@@ -2,8 +2,12 @@
 Tests for Carbon Calculator Module
 """
 
+import math
 import unittest
+from array import array
+from unittest import mock
 from respira_plus.carbon_calculator import CarbonCalculator
+from respira_plus.emission_factors import EMISSION_FACTORS, REGISTRY, FactorRegistry, FactorSets
 
 
 class TestCarbonCalculator(unittest.TestCase):
@@ -90,6 +94,111 @@ class TestCarbonCalculator(unittest.TestCase):
         """Test error handling for invalid diet type."""
         with self.assertRaises(ValueError):
             self.calculator.calculate_food('invalid_type', 7)
+    
+    def test_calculate_batch(self):
+        """Test batch calculation over mixed categories."""
+        result = self.calculator.calculate_batch(
+            ['car_gasoline_km', 'electricity_kwh', 'vegan_day', 'bus_km'],
+            array('d', [100, 100, 7, 50])
+        )
+        
+        self.assertEqual(len(result['emissions']), 4)
+        self.assertAlmostEqual(result['emissions'][0], 19.2, places=2)
+        self.assertAlmostEqual(result['emissions'][3], 4.45, places=2)
+        self.assertAlmostEqual(result['breakdown']['transportation'], 23.65, places=2)
+        self.assertAlmostEqual(result['breakdown']['energy'], 23.3, places=2)
+        self.assertAlmostEqual(result['breakdown']['food'], 20.23, places=2)
+        self.assertEqual(result['errors'], [])
+    
+    def test_calculate_batch_matches_scalar(self):
+        """Test that batch totals match the scalar methods."""
+        scalar = CarbonCalculator()
+        scalar.calculate_transportation('train_km', 40)
+        scalar.calculate_energy('heating_oil_liter', 10)
+        scalar.calculate_food('meat_low_day', 3)
+        
+        self.calculator.calculate_batch(
+            ['train_km', 'heating_oil_liter', 'meat_low_day'], [40, 10, 3]
+        )
+        
+        self.assertAlmostEqual(self.calculator.get_total_emissions(),
+                               scalar.get_total_emissions(), places=6)
+        self.assertEqual(self.calculator.get_breakdown().keys(),
+                         scalar.get_breakdown().keys())
+    
+    def test_calculate_batch_reports_invalid_rows(self):
+        """Test that unknown types are reported per row without aborting."""
+        result = self.calculator.calculate_batch(
+            ['bus_km', 'invalid_type', 'vegan_day'], [10, 5, 1]
+        )
+        
+        self.assertEqual(len(result['errors']), 1)
+        row, error = result['errors'][0]
+        self.assertEqual(row, 1)
+        self.assertIsInstance(error, ValueError)
+        self.assertTrue(math.isnan(result['emissions'][1]))
+        self.assertAlmostEqual(result['total_emissions_kg'], 0.89 + 2.89, places=2)
+    
+    def test_calculate_batch_with_codes(self):
+        """Test batch calculation with integer activity codes."""
+        registry = self.calculator.registry
+        codes = array('H', [registry.code('bus_km'), registry.code('vegan_day')])
+        result = self.calculator.calculate_batch(codes, [50, 7])
+        
+        self.assertAlmostEqual(result['emissions'][0], 4.45, places=2)
+        self.assertAlmostEqual(result['breakdown']['food'], 20.23, places=2)
+        self.assertEqual(result['errors'], [])
+    
+    def test_calculate_batch_length_mismatch(self):
+        """Test error handling for mismatched batch inputs."""
+        with self.assertRaises(ValueError):
+            self.calculator.calculate_batch(['bus_km'], [1, 2])
+    
+    def test_results_are_stamped_with_factor_version(self):
+        """Test that calculations record the factor set version used."""
+        self.assertIsNone(self.calculator.factor_version)
+        self.calculator.calculate_transportation('bus_km', 10)
+        self.assertEqual(self.calculator.factor_version, REGISTRY.version)
+        result = self.calculator.calculate_batch(['vegan_day'], [1])
+        self.assertEqual(result['factor_version'], REGISTRY.version)
+        self.calculator.reset()
+        self.assertIsNone(self.calculator.factor_version)
+
+
+class TestFactorSetSwap(unittest.TestCase):
+    
+    def setUp(self):
+        self.factor_sets = FactorSets(REGISTRY)
+        for patcher in (mock.patch.object(CarbonCalculator, 'factor_sets', self.factor_sets),
+                        mock.patch.object(CarbonCalculator, 'registry', REGISTRY)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.factor_sets.bind(CarbonCalculator)
+        self.addCleanup(self.factor_sets.unbind, CarbonCalculator)
+        doubled = {category: {name: factor * 2 for name, factor in factors.items()}
+                   for category, factors in EMISSION_FACTORS.items()}
+        self.doubled = FactorRegistry(doubled, 'doubled')
+    
+    def test_running_calculator_follows_published_set(self):
+        """Test that an existing calculator uses a newly published set."""
+        calculator = CarbonCalculator()
+        before = calculator.calculate_food('vegan_day', 1)
+        self.factor_sets.publish(self.doubled)
+        after = calculator.calculate_food('vegan_day', 1)
+        
+        self.assertAlmostEqual(after, before * 2)
+        self.assertEqual(calculator.factor_version, 'doubled')
+    
+    def test_pinned_calculator_recalculates_with_old_version(self):
+        """Test recalculating with a kept, earlier factor set."""
+        self.factor_sets.publish(self.doubled)
+        pinned = CarbonCalculator(REGISTRY.version)
+        
+        self.assertAlmostEqual(pinned.calculate_food('vegan_day', 1), 2.89)
+        self.assertEqual(pinned.factor_version, REGISTRY.version)
+        self.assertAlmostEqual(CarbonCalculator('doubled').calculate_food('vegan_day', 1), 5.78)
+        with self.assertRaises(ValueError):
+            CarbonCalculator('unknown')
 
 
 if __name__ == '__main__':
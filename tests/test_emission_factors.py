@@ -0,0 +1,143 @@
+"""
+Tests for Emission Factors Module
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from respira_plus.emission_factors import (
+    EMISSION_FACTORS, FACTOR_SETS, REGISTRY, FactorRegistry, FactorSets, load_factor_set
+)
+
+
+def scaled_factors(scale):
+    """Bundled factors multiplied by ``scale``."""
+    return {category: {name: factor * scale for name, factor in factors.items()}
+            for category, factors in EMISSION_FACTORS.items()}
+
+
+class TestFactorRegistry(unittest.TestCase):
+    
+    def test_codes_are_dense(self):
+        """Test that every activity type gets a unique small integer code."""
+        codes = sorted(REGISTRY.codes.values())
+        self.assertEqual(codes, list(range(len(REGISTRY))))
+    
+    def test_factor_lookup(self):
+        """Test resolving a factor through its code."""
+        code = REGISTRY.code('car_gasoline_km')
+        self.assertAlmostEqual(REGISTRY.factor(code), 0.192)
+        self.assertEqual(REGISTRY.category(code), 'transportation')
+    
+    def test_category_codes(self):
+        """Test that category maps only hold their own activities."""
+        self.assertIn('vegan_day', REGISTRY.category_codes['food'])
+        self.assertNotIn('bus_km', REGISTRY.category_codes['food'])
+    
+    def test_unknown_activity(self):
+        """Test error handling for unknown activity types."""
+        with self.assertRaises(ValueError):
+            REGISTRY.code('rocket_ship_km')
+    
+    def test_round_trip(self):
+        """Test that the compiled table rebuilds the nested factors."""
+        self.assertEqual(REGISTRY.to_dict(), EMISSION_FACTORS)
+    
+    def test_duplicate_activity_type(self):
+        """Test that an activity type can only belong to one category."""
+        with self.assertRaises(ValueError):
+            FactorRegistry({'a': {'x_km': 1.0}, 'b': {'x_km': 2.0}})
+    
+    def test_invalid_factor(self):
+        """Test that factors must be non-negative numbers."""
+        for factor in (-1.0, float('nan'), '0.1', True):
+            with self.assertRaises(ValueError):
+                FactorRegistry({'a': {'x_km': factor}})
+    
+    def test_bundled_set_is_versioned(self):
+        """Test that the bundled data file is the active, versioned set."""
+        self.assertTrue(REGISTRY.version)
+        self.assertIs(FACTOR_SETS.active, REGISTRY)
+
+
+class TestFactorSets(unittest.TestCase):
+    
+    def setUp(self):
+        self.sets = FactorSets(REGISTRY, keep=3)
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, 'factors.json')
+    
+    def write(self, version, factors, mtime=None):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'version': version, 'factors': factors}, f)
+        if mtime is not None:
+            os.utime(self.path, ns=(mtime, mtime))
+    
+    def test_publish_swaps_active_set(self):
+        """Test that publishing replaces the active set and keeps the old one."""
+        new = self.sets.publish(FactorRegistry(scaled_factors(2), 'v2'))
+        self.assertIs(self.sets.active, new)
+        self.assertEqual(self.sets.versions(), (REGISTRY.version, 'v2'))
+        self.assertIs(self.sets.get(REGISTRY.version), REGISTRY)
+    
+    def test_keeps_recent_versions(self):
+        """Test that only the most recent versions are kept."""
+        for i in range(2, 6):
+            self.sets.publish(FactorRegistry(scaled_factors(i), f'v{i}'))
+        self.assertEqual(self.sets.versions(), ('v3', 'v4', 'v5'))
+        self.assertNotIn(REGISTRY.version, self.sets)
+        with self.assertRaises(ValueError):
+            self.sets.get(REGISTRY.version)
+    
+    def test_republish_reactivates_version(self):
+        """Test that republishing a kept version makes it active again."""
+        self.sets.publish(FactorRegistry(scaled_factors(2), 'v2'))
+        registry = self.sets.publish(FactorRegistry(EMISSION_FACTORS, REGISTRY.version))
+        self.assertIs(registry, REGISTRY)
+        self.assertEqual(self.sets.versions(), ('v2', REGISTRY.version))
+    
+    def test_rejects_invalid_sets(self):
+        """Test that reused versions, other categories and unversioned sets are rejected."""
+        with self.assertRaises(ValueError):
+            self.sets.publish(FactorRegistry(scaled_factors(2), REGISTRY.version))
+        with self.assertRaises(ValueError):
+            self.sets.publish(FactorRegistry({'food': {'vegan_day': 1.0}}, 'v2'))
+        with self.assertRaises(ValueError):
+            self.sets.publish(FactorRegistry(scaled_factors(2)))
+        self.assertIs(self.sets.active, REGISTRY)
+    
+    def test_load_and_reload(self):
+        """Test loading a factor file and reloading it only when it changes."""
+        self.write('v2', scaled_factors(2), mtime=1_000_000_000)
+        self.assertEqual(self.sets.load(self.path).version, 'v2')
+        self.assertFalse(self.sets.reload())
+        
+        self.write('v3', scaled_factors(3), mtime=2_000_000_000)
+        self.assertTrue(self.sets.reload())
+        self.assertEqual(self.sets.active.version, 'v3')
+        self.assertAlmostEqual(self.sets.active.factor(REGISTRY.code('bus_km')), 0.089 * 3)
+    
+    def test_reload_keeps_active_set_on_error(self):
+        """Test that a broken file does not replace the active set."""
+        self.write('v2', scaled_factors(2), mtime=1_000_000_000)
+        self.sets.load(self.path)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('{"version": "v3", "factors": ')
+        os.utime(self.path, ns=(2_000_000_000, 2_000_000_000))
+        with self.assertRaises(ValueError):
+            self.sets.reload()
+        self.assertEqual(self.sets.active.version, 'v2')
+        self.assertFalse(self.sets.reload())
+    
+    def test_load_factor_set_requires_version(self):
+        """Test that factor files must carry a version."""
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'factors': EMISSION_FACTORS}, f)
+        with self.assertRaises(ValueError):
+            load_factor_set(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
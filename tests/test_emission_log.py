@@ -0,0 +1,109 @@
+"""
+Tests for Emission Log Module
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from respira_plus.emission_log import HEADER, RECORD, EmissionLog
+from respira_plus.user_profile import UserProfile
+
+
+BREAKDOWN = {'transportation': 10.0, 'energy': 5.0, 'food': 3.0}
+
+
+class TestEmissionLog(unittest.TestCase):
+    
+    def setUp(self):
+        """Set up a log in a temporary directory."""
+        self.directory = tempfile.mkdtemp()
+        self.log = EmissionLog.for_user(self.directory, 'user001')
+    
+    def tearDown(self):
+        """Close the log and remove the directory."""
+        self.log.close()
+        shutil.rmtree(self.directory)
+    
+    def test_append_and_read(self):
+        """Test appending records and reading them back."""
+        self.log.append('2024-01-01T10:00:00', 18.0, BREAKDOWN)
+        self.log.append('2024-01-02T10:00:00', 4.0, {'food': 4.0})
+        
+        records = list(self.log)
+        self.assertEqual(len(self.log), 2)
+        self.assertEqual(records[0], {'date': '2024-01-01T10:00:00',
+                                      'total_emissions_kg': 18.0, 'breakdown': BREAKDOWN})
+        self.assertEqual(records[1]['breakdown'], {'food': 4.0})
+        self.assertEqual(self.log.total(), 22.0)
+    
+    def test_period_queries(self):
+        """Test range queries on sorted and unsorted logs."""
+        for day, total in ((1, 10.0), (2, 20.0), (4, 40.0)):
+            self.log.append(f'2024-01-0{day}', total, BREAKDOWN)
+        self.assertEqual(self.log.total_between('2024-01-02', '2024-01-04'), 20.0)
+        
+        self.log.append('2024-01-03', 30.0, BREAKDOWN)
+        self.assertEqual(self.log.total_between('2024-01-02', '2024-01-04'), 50.0)
+        self.assertEqual([r['date'] for r in self.log.between('2024-01-03')],
+                         ['2024-01-04', '2024-01-03'])
+    
+    def test_compact_sorts_records(self):
+        """Test that compaction rewrites the log in date order."""
+        self.log.append('2024-01-03', 30.0, BREAKDOWN)
+        self.log.append('2024-01-01', 10.0, BREAKDOWN)
+        self.log.compact()
+        
+        self.assertEqual([r['date'] for r in self.log], ['2024-01-01', '2024-01-03'])
+        self.log.append('2024-01-05', 50.0, BREAKDOWN)
+        self.assertEqual(self.log.total_between('2024-01-02'), 80.0)
+    
+    def test_recovers_from_torn_append(self):
+        """Test that a partial or corrupt trailing record is dropped on open."""
+        self.log.append('2024-01-01', 10.0, BREAKDOWN)
+        self.log.append('2024-01-02', 20.0, BREAKDOWN)
+        self.log.close()
+        with open(self.log.path, 'r+b') as f:
+            f.seek(HEADER.size + RECORD.size + 40)
+            f.write(b'\xff' * 8)
+            f.seek(0, os.SEEK_END)
+            f.write(b'\x00' * 17)
+        
+        self.log = EmissionLog(self.log.path)
+        
+        self.assertEqual(len(self.log), 1)
+        self.assertEqual(os.path.getsize(self.log.path), HEADER.size + RECORD.size)
+        self.assertEqual(self.log.total(), 10.0)
+    
+    def test_reopen_and_load_history(self):
+        """Test that records persist and load into an EmissionsHistory."""
+        self.log.append('2024-01-02', 20.0, BREAKDOWN)
+        self.log.append('2024-01-01', 10.0, BREAKDOWN)
+        self.log.close()
+        
+        self.log = EmissionLog(self.log.path)
+        history = self.log.to_history()
+        
+        self.assertEqual([r['date'] for r in history], ['2024-01-01', '2024-01-02'])
+        self.assertEqual(history.total(), 30.0)
+    
+    def test_profile_writes_through(self):
+        """Test that an attached profile appends every new record."""
+        profile = UserProfile('user001', 'Test User')
+        profile.attach_emission_log(self.log)
+        profile.add_emission_record('2024-01-01', 18.0, BREAKDOWN)
+        
+        self.assertEqual(len(self.log), 1)
+        self.assertEqual(self.log.total(), profile.get_total_emissions())
+    
+    def test_invalid_file(self):
+        """Test error handling for files that are not emission logs."""
+        path = os.path.join(self.directory, 'other.emlog')
+        with open(path, 'wb') as f:
+            f.write(b'x' * HEADER.size)
+        with self.assertRaises(ValueError):
+            EmissionLog(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+"""
+Tests for Emissions History Module
+"""
+
+import unittest
+from respira_plus.emissions_history import EmissionsHistory
+
+
+BREAKDOWN = {'transportation': 10.0, 'energy': 5.0, 'food': 3.0}
+
+
+class TestEmissionsHistory(unittest.TestCase):
+    
+    def setUp(self):
+        """Set up a history with records added out of order."""
+        self.history = EmissionsHistory()
+        self.history.add('2024-01-03', 30.0, BREAKDOWN)
+        self.history.add('2024-01-01', 10.0, BREAKDOWN)
+        self.history.add('2024-01-05', 50.0, BREAKDOWN)
+        self.history.add('2024-01-02', 20.0, BREAKDOWN)
+    
+    def test_records_sorted_by_date(self):
+        """Test that out-of-order inserts end up in date order."""
+        dates = [record['date'] for record in self.history]
+        self.assertEqual(dates, ['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-05'])
+        self.assertEqual(self.history[-1]['total_emissions_kg'], 50.0)
+    
+    def test_record_round_trip(self):
+        """Test that records come back as the original dicts."""
+        history = EmissionsHistory()
+        record = {'date': '2024-02-01T10:00:00', 'total_emissions_kg': 4.0,
+                  'breakdown': {'food': 4.0, 'waste': 1.5}}
+        history.append(record)
+        
+        self.assertEqual(history[0], record)
+        self.assertEqual(history.to_list(), [record])
+    
+    def test_int_values_round_trip(self):
+        """Test that int totals and breakdown values are not turned into floats."""
+        history = EmissionsHistory()
+        record = {'date': '2024-02-01', 'total_emissions_kg': 10,
+                  'breakdown': {'energy': 0.5, 'food': 10}}
+        history.append(record)
+        history.add('2024-01-01', 2.0, {'food': 2.0})
+        
+        self.assertEqual(repr(history.to_list()[1]), repr(record))
+        self.assertIsInstance(history[0]['total_emissions_kg'], float)
+        restored, _ = EmissionsHistory.from_bytes(history.to_bytes())
+        self.assertEqual(repr(restored.to_list()), repr(history.to_list()))
+        data = history.to_bytes()
+        with self.assertRaises(ValueError):
+            EmissionsHistory.from_bytes(data[:-1])
+    
+    def test_between(self):
+        """Test range queries with inclusive start and exclusive end."""
+        records = self.history.between('2024-01-02', '2024-01-05')
+        self.assertEqual([r['total_emissions_kg'] for r in records], [20.0, 30.0])
+        self.assertEqual(len(self.history.between('2024-01-04')), 1)
+    
+    def test_total_between(self):
+        """Test range sums through the prefix sums."""
+        self.assertEqual(self.history.total(), 110.0)
+        self.assertEqual(self.history.total_between('2024-01-02', '2024-01-05'), 50.0)
+        self.assertEqual(self.history.total_between(end='2024-01-02'), 10.0)
+        self.assertEqual(self.history.total_between('2025-01-01'), 0.0)
+    
+    def test_equal_dates_keep_insertion_order(self):
+        """Test that records on the same date keep their insertion order."""
+        self.history.add('2024-01-03', 31.0, BREAKDOWN)
+        same_day = self.history.between('2024-01-03', '2024-01-04')
+        self.assertEqual([r['total_emissions_kg'] for r in same_day], [30.0, 31.0])
+    
+    def test_bytes_round_trip(self):
+        """Test encoding and decoding the packed columns."""
+        self.history.add('2024-01-04', 4.0, {'food': 4.0, 'waste': 0.5})
+        
+        restored, end = EmissionsHistory.from_bytes(self.history.to_bytes())
+        
+        self.assertEqual(end, len(self.history.to_bytes()))
+        self.assertEqual(restored.to_list(), self.history.to_list())
+        self.assertEqual(restored.total_between('2024-01-02', '2024-01-05'), 54.0)
+        restored.add('2024-01-01T12:00:00', 1.0, BREAKDOWN)
+        self.assertEqual(len(restored), 6)
+        self.assertTrue(restored.check_consistency())
+    
+    def test_empty_bytes_round_trip(self):
+        """Test encoding an empty history."""
+        restored, _ = EmissionsHistory.from_bytes(EmissionsHistory().to_bytes())
+        self.assertEqual(len(restored), 0)
+        self.assertEqual(restored.to_list(), [])
+    
+    def test_truncated_bytes(self):
+        """Test that data cut short anywhere is rejected."""
+        data = self.history.to_bytes()
+        for cut in (1, 8, len(data) - 20, len(data) - 1):
+            with self.assertRaises(ValueError):
+                EmissionsHistory.from_bytes(data[:len(data) - cut])
+    
+    def test_invalid_date(self):
+        """Test error handling for dates that are not ISO formatted."""
+        with self.assertRaises(ValueError):
+            self.history.add('yesterday', 1.0, BREAKDOWN)
+
+
+if __name__ == '__main__':
+    unittest.main()
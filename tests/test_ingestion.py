@@ -0,0 +1,140 @@
+"""
+Tests for Activity Log Ingestion Module
+"""
+
+import io
+import unittest
+from unittest import mock
+from respira_plus.carbon_calculator import CarbonCalculator
+from respira_plus.emission_factors import EMISSION_FACTORS, REGISTRY, FactorRegistry, FactorSets
+from respira_plus.ingestion import apply_records, chunked, ingest
+
+
+CSV_EXPORT = """user_id,date,activity_type,quantity
+u1,2024-01-01T08:00:00,car_gasoline_km,100
+u1,2024-01-01T18:00:00,electricity_kwh,100
+u1,2024-01-02T08:00:00,vegan_day,1
+u2,2024-01-01T08:00:00,bus_km,50
+u2,2024-01-01T09:00:00,rocket_ship,10
+"""
+
+
+class TestIngestion(unittest.TestCase):
+    
+    def test_chunked(self):
+        """Test splitting rows into bounded chunks."""
+        chunks = list(chunked(range(7), 3))
+        self.assertEqual(chunks, [[0, 1, 2], [3, 4, 5], [6]])
+        with self.assertRaises(ValueError):
+            chunked(range(7), 0)
+    
+    def test_ingest_csv_groups_by_user_and_day(self):
+        """Test grouping CSV rows into per-user, per-day records."""
+        records = list(ingest(io.StringIO(CSV_EXPORT), 'csv', chunk_size=2))
+        
+        self.assertEqual([(r[0], r[1]) for r in records],
+                         [('u1', '2024-01-01'), ('u1', '2024-01-02'), ('u2', '2024-01-01')])
+        user_id, day, total, breakdown = records[0]
+        self.assertAlmostEqual(breakdown['transportation'], 19.2, places=2)
+        self.assertAlmostEqual(breakdown['energy'], 23.3, places=2)
+        self.assertAlmostEqual(total, 42.5, places=2)
+    
+    def test_ingest_reports_invalid_rows(self):
+        """Test that invalid rows are reported and skipped."""
+        errors = []
+        records = list(ingest(io.StringIO(CSV_EXPORT), 'csv',
+                              on_error=lambda row, error: errors.append(row)))
+        
+        self.assertEqual(errors, [4])
+        self.assertAlmostEqual(records[-1][2], 4.45, places=2)
+    
+    def test_ingest_ndjson(self):
+        """Test parsing NDJSON exports."""
+        export = (
+            '{"user_id": "u1", "date": "2024-01-01", "activity_type": "vegan_day", "quantity": 2}\n'
+            '\n'
+            '{"user_id": "u1", "date": "2024-01-01", "activity_type": "bus_km", "quantity": "10"}\n'
+        )
+        records = list(ingest(io.StringIO(export), 'ndjson'))
+        
+        self.assertEqual(len(records), 1)
+        self.assertAlmostEqual(records[0][2], 2 * 2.89 + 0.89, places=2)
+    
+    def test_ingest_ndjson_skips_malformed_lines(self):
+        """Test that invalid JSON and non-object lines are reported, not fatal."""
+        export = (
+            '{"user_id": "u1", "date": "2024-01-01", "activity_type": "vegan_day", "quantity": 1}\n'
+            'not json\n'
+            '[1]\n'
+            '{"user_id": "u1", "date": "2024-01-02", "activity_type": "vegan_day", "quantity": 1}\n'
+        )
+        errors = []
+        records = list(ingest(io.StringIO(export), 'ndjson',
+                              on_error=lambda row, error: errors.append(row)))
+        
+        self.assertEqual(errors, [1, 2])
+        self.assertEqual([r[1] for r in records], ['2024-01-01', '2024-01-02'])
+    
+    def test_ingest_rejects_non_string_activity_types(self):
+        """Test that list or integer activity types are reported, not fatal or decoded as codes."""
+        export = (
+            '{"user_id": "u1", "date": "2024-01-01", "activity_type": ["bus_km"], "quantity": 1}\n'
+            '{"user_id": "u1", "date": "2024-01-01", "activity_type": 5, "quantity": 1}\n'
+            '{"user_id": "u1", "date": "2024-01-01", "activity_type": "vegan_day", "quantity": 1}\n'
+        )
+        errors = []
+        records = list(ingest(io.StringIO(export), 'ndjson',
+                              on_error=lambda row, error: errors.append(row)))
+        
+        self.assertEqual(errors, [0, 1])
+        self.assertEqual(len(records), 1)
+        self.assertAlmostEqual(records[0][2], 2.89, places=2)
+    
+    def test_ingest_validates_dates(self):
+        """Test that dates are parsed, normalized to days and reported when invalid."""
+        export = (
+            "user_id,date,activity_type,quantity\n"
+            "u1,garbage,bus_km,10\n"
+            "u1,2024-01-01T23:30:00Z,bus_km,10\n"
+        )
+        errors = []
+        records = list(ingest(io.StringIO(export), 'csv',
+                              on_error=lambda row, error: errors.append((row, str(error)))))
+        
+        self.assertEqual(errors, [(0, "Invalid date: 'garbage'")])
+        self.assertEqual([r[1] for r in records], ['2024-01-01'])
+    
+    def test_ingest_uses_one_factor_set(self):
+        """Test that a set published during a run does not apply to that run."""
+        factor_sets = FactorSets(REGISTRY)
+        doubled = {category: {name: factor * 2 for name, factor in factors.items()}
+                   for category, factors in EMISSION_FACTORS.items()}
+        with mock.patch.object(CarbonCalculator, 'factor_sets', factor_sets), \
+                mock.patch.object(CarbonCalculator, 'registry', REGISTRY):
+            factor_sets.bind(CarbonCalculator)
+            self.addCleanup(factor_sets.unbind, CarbonCalculator)
+            records = ingest(io.StringIO(CSV_EXPORT), 'csv', chunk_size=2)
+            first = next(records)
+            factor_sets.publish(FactorRegistry(doubled, 'doubled'))
+            rest = list(records)
+        
+        self.assertAlmostEqual(first[2], 42.5, places=2)
+        self.assertAlmostEqual(rest[-1][2], 4.45, places=2)
+    
+    def test_ingest_unknown_format(self):
+        """Test error handling for unknown formats."""
+        with self.assertRaises(ValueError):
+            ingest(io.StringIO(''), 'xml')
+    
+    def test_apply_records(self):
+        """Test adding ingested records to user profiles."""
+        profiles = {}
+        count = apply_records(ingest(io.StringIO(CSV_EXPORT)), profiles)
+        
+        self.assertEqual(count, 3)
+        self.assertEqual(sorted(profiles), ['u1', 'u2'])
+        self.assertEqual(len(profiles['u1'].emissions_history), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
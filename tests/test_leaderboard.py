@@ -0,0 +1,80 @@
+"""
+Tests for Leaderboard Module
+"""
+
+import unittest
+from respira_plus.leaderboard import Leaderboard
+from respira_plus.user_profile import UserProfile
+
+
+MISSION = {'id': 1, 'title': 'Mission', 'duration_days': 7, 'points': 100, 'co2_savings_kg': 15.0}
+
+
+class TestLeaderboard(unittest.TestCase):
+    
+    def setUp(self):
+        """Set up a leaderboard with a few scores."""
+        self.leaderboard = Leaderboard()
+        for user_id, points in (('ana', 300), ('bia', 150), ('caio', 300), ('duda', 50)):
+            self.leaderboard.set_score(user_id, points)
+    
+    def test_top(self):
+        """Test top-K with shared ranks for tied scores."""
+        top = self.leaderboard.top(3)
+        self.assertEqual([(e['rank'], e['user_id'], e['score']) for e in top],
+                         [(1, 'ana', 300), (1, 'caio', 300), (3, 'bia', 150)])
+    
+    def test_pagination(self):
+        """Test paging through the leaderboard."""
+        page = self.leaderboard.top(limit=2, offset=1)
+        self.assertEqual([(e['rank'], e['user_id']) for e in page], [(1, 'caio'), (3, 'bia')])
+        self.assertEqual(self.leaderboard.top(limit=5, offset=10), [])
+    
+    def test_rank(self):
+        """Test rank lookups."""
+        self.assertEqual(self.leaderboard.rank('caio'), 1)
+        self.assertEqual(self.leaderboard.rank('duda'), 4)
+        self.assertIsNone(self.leaderboard.rank('nobody'))
+    
+    def test_count_above(self):
+        """Test counting users above a score."""
+        self.assertEqual(self.leaderboard.count_above(0), 4)
+        self.assertEqual(self.leaderboard.count_above(150), 2)
+        self.assertEqual(self.leaderboard.count_above(300), 0)
+    
+    def test_update_and_remove(self):
+        """Test moving and removing users."""
+        self.leaderboard.set_score('duda', 500)
+        self.assertEqual(self.leaderboard.rank('duda'), 1)
+        self.assertEqual(self.leaderboard.rank('ana'), 2)
+        self.assertTrue(self.leaderboard.remove('duda'))
+        self.assertFalse(self.leaderboard.remove('duda'))
+        self.assertEqual(len(self.leaderboard), 3)
+    
+    def test_tracks_completed_missions(self):
+        """Test incremental updates when a tracked profile completes a mission."""
+        profile = UserProfile('eva', 'Eva')
+        self.leaderboard.track(profile)
+        self.assertEqual(self.leaderboard.rank('eva'), 5)
+        
+        for mission_id in (1, 2, 3, 4):
+            profile.start_mission(dict(MISSION, id=mission_id))
+            profile.complete_mission(mission_id)
+        
+        self.assertEqual(self.leaderboard.score('eva'), 400)
+        self.assertEqual(self.leaderboard.rank('eva'), 1)
+    
+    def test_co2_saved_metric(self):
+        """Test ranking by CO2 saved."""
+        leaderboard = Leaderboard(metric='co2_saved')
+        profile = UserProfile('eva', 'Eva')
+        leaderboard.track(profile)
+        profile.start_mission(MISSION)
+        profile.complete_mission(1)
+        self.assertEqual(leaderboard.score('eva'), 15.0)
+        with self.assertRaises(ValueError):
+            Leaderboard(metric='steps')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Tests for Recommendations Module
+"""
+
+import unittest
+from datetime import date
+from respira_plus.recommendations import RecommendationCache, Recommender, recent_breakdown
+from respira_plus.user_profile import UserProfile
+
+
+TODAY = date(2024, 5, 31)
+
+
+class TestRecommender(unittest.TestCase):
+    
+    def setUp(self):
+        """Set up a recommender over the bundled catalog."""
+        self.recommender = Recommender()
+    
+    def test_top_tip_matches_largest_category(self):
+        """Test that the dominant category's high-impact tip ranks first."""
+        tips = self.recommender.rank({'transportation': 5.0, 'energy': 5.0, 'food': 90.0}, 'tips', 3)
+        
+        self.assertEqual(tips[0]['category'], 'food')
+        self.assertEqual(tips[0]['impact'], 'high')
+        self.assertAlmostEqual(tips[0]['score'], 0.9)
+        self.assertEqual([tip['score'] for tip in tips], sorted((tip['score'] for tip in tips), reverse=True))
+    
+    def test_ranking_matches_full_scoring(self):
+        """Test the merged ranking against scoring every entry."""
+        breakdown = {'transportation': 30.0, 'energy': 50.0, 'food': 20.0}
+        ranked = self.recommender.rank(breakdown, 'missions', limit=100)
+        
+        self.assertEqual(len(ranked), 5)
+        self.assertEqual(ranked[0]['title'], 'Energy Saver')
+        self.assertEqual([m['score'] for m in ranked], sorted((m['score'] for m in ranked), reverse=True))
+    
+    def test_empty_breakdown_uses_even_shares(self):
+        """Test recommendations for a user without emissions."""
+        self.assertEqual(self.recommender.shares({}), (1 / 3, 1 / 3, 1 / 3))
+        self.assertEqual(len(self.recommender.rank({}, 'tips', 10)), 10)
+    
+    def test_unknown_kind(self):
+        """Test error handling for an unknown ranking kind."""
+        with self.assertRaises(ValueError):
+            self.recommender.rank({}, 'badges')
+    
+    def test_recommend_batch(self):
+        """Test ranking several users at once."""
+        results = self.recommender.recommend_batch({'a': {'energy': 1.0}, 'b': {'food': 1.0}}, limit=1)
+        
+        self.assertEqual(results['a']['tips'][0]['category'], 'energy')
+        self.assertEqual(results['b']['missions'][0]['category'], 'food')
+
+
+class TestRecommendationCache(unittest.TestCase):
+    
+    def setUp(self):
+        """Set up a profile with recent and old emissions."""
+        self.user = UserProfile('user1', 'Test User')
+        self.user.add_emission_record('2024-05-30T09:00:00', 40.0, {'transportation': 40.0})
+        self.user.add_emission_record('2024-01-10T09:00:00', 90.0, {'food': 90.0})
+        self.cache = RecommendationCache(limit=2)
+    
+    def test_recent_breakdown(self):
+        """Test that only the last days are summed."""
+        breakdown = recent_breakdown(self.user, today=TODAY)
+        self.assertEqual(breakdown, {'transportation': 40.0, 'energy': 0.0, 'food': 0.0})
+    
+    def test_cached_until_history_changes(self):
+        """Test that results are reused until a record is added."""
+        first = self.cache.get(self.user, TODAY)
+        self.assertIs(self.cache.get(self.user, TODAY), first)
+        self.assertEqual(first['tips'][0]['category'], 'transportation')
+        
+        self.user.add_emission_record('2024-05-31T09:00:00', 200.0, {'energy': 200.0})
+        second = self.cache.get(self.user, TODAY)
+        self.assertIsNot(second, first)
+        self.assertEqual(second['tips'][0]['category'], 'energy')
+    
+    def test_refresh(self):
+        """Test the batch refresh of many users."""
+        other = UserProfile('user2', 'Other User')
+        self.assertEqual(self.cache.refresh([self.user, other], TODAY), 2)
+        self.assertEqual(len(self.cache), 2)
+        
+        self.cache.invalidate('user2')
+        self.assertEqual(len(self.cache), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
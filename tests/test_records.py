@@ -0,0 +1,70 @@
+"""
+Tests for Record Types Module
+"""
+
+import unittest
+from respira_plus.records import EmissionRecord, MissionRecord
+
+
+CATEGORIES = ('transportation', 'energy', 'food')
+
+
+class TestEmissionRecord(unittest.TestCase):
+    
+    def test_reads_like_dict(self):
+        """Test dict-style access and comparison."""
+        record = EmissionRecord.from_breakdown('2024-01-01', 18.0, {'food': 3.0, 'energy': 15.0}, CATEGORIES)
+        
+        self.assertEqual(record['total_emissions_kg'], 18.0)
+        self.assertEqual(record['breakdown'], {'energy': 15.0, 'food': 3.0})
+        self.assertEqual(record, {'date': '2024-01-01', 'total_emissions_kg': 18.0,
+                                  'breakdown': {'energy': 15.0, 'food': 3.0}})
+        with self.assertRaises(KeyError):
+            record['missing']
+    
+    def test_extra_categories(self):
+        """Test that unknown breakdown keys are kept."""
+        record = EmissionRecord.from_breakdown('2024-01-01', 2.0, {'waste': 2.0}, CATEGORIES)
+        self.assertEqual(record.to_dict()['breakdown'], {'waste': 2.0})
+    
+    def test_no_instance_dict(self):
+        """Test that records do not carry a per-instance __dict__."""
+        record = EmissionRecord.from_breakdown('2024-01-01', 1.0, {}, CATEGORIES)
+        self.assertFalse(hasattr(record, '__dict__'))
+
+
+class TestMissionRecord(unittest.TestCase):
+    
+    def setUp(self):
+        """Set up a mission record from catalog details."""
+        mission = {'id': 1, 'title': 'Test Mission', 'duration_days': 7,
+                   'points': 100, 'co2_savings_kg': 20.0}
+        self.record = MissionRecord.from_mission(mission, '2024-01-01T00:00:00')
+    
+    def test_from_mission(self):
+        """Test the fields of a newly started mission."""
+        self.assertEqual(self.record['mission_id'], 1)
+        self.assertEqual(self.record['status'], 'active')
+        self.assertNotIn('completed_at', self.record)
+        self.assertEqual(list(self.record)[0], 'mission_id')
+    
+    def test_item_assignment(self):
+        """Test updating fields and keeping unknown keys."""
+        self.record['status'] = 'completed'
+        self.record['completed_at'] = '2024-01-08T00:00:00'
+        self.record['note'] = 'done early'
+        
+        data = self.record.to_dict()
+        self.assertEqual(data['status'], 'completed')
+        self.assertEqual(data['completed_at'], '2024-01-08T00:00:00')
+        self.assertEqual(data['note'], 'done early')
+    
+    def test_round_trip(self):
+        """Test that to_dict reproduces the source dict."""
+        data = self.record.to_dict()
+        self.assertEqual(MissionRecord(data).to_dict(), data)
+        self.assertEqual(list(MissionRecord(data).to_dict()), list(data))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Tests for Profile Repository Module
+"""
+
+import shutil
+import tempfile
+import unittest
+from respira_plus.repository import ProfileRepository
+from respira_plus.user_profile import UserProfile
+
+
+def make_profile(i):
+    profile = UserProfile(f"user/{i:03d}", f"User {i}")
+    profile.add_emission_record('2024-01-01', 10.0 * i, {'transportation': 6.0 * i, 'food': 4.0 * i})
+    profile.start_mission({'id': 1, 'title': 'Mission', 'duration_days': 7,
+                           'points': 100, 'co2_savings_kg': 5.0})
+    if i % 2:
+        profile.complete_mission(1)
+    return profile
+
+
+class TestProfileRepository(unittest.TestCase):
+    
+    def setUp(self):
+        """Set up a repository with a few shards."""
+        self.directory = tempfile.mkdtemp()
+        self.repository = ProfileRepository(self.directory, shards=4)
+        self.profiles = [make_profile(i) for i in range(1, 11)]
+        self.repository.save_all(self.profiles)
+    
+    def tearDown(self):
+        """Remove the repository directory."""
+        shutil.rmtree(self.directory)
+    
+    def test_save_and_load(self):
+        """Test that profiles round-trip through their shard files."""
+        loaded = self.repository.load("user/003")
+        
+        self.assertEqual(loaded.to_dict(), self.profiles[2].to_dict())
+        self.assertIsNone(self.repository.load("missing"))
+        self.assertIn("user/003", self.repository)
+    
+    def test_profiles_spread_across_shards(self):
+        """Test that each profile lives in the shard its ID hashes to."""
+        self.assertEqual(len(self.repository), 10)
+        for shard in range(self.repository.shards):
+            for user_id in self.repository.user_ids(shard):
+                self.assertEqual(self.repository.shard_of(user_id), shard)
+    
+    def test_delete(self):
+        """Test deleting a profile."""
+        self.assertTrue(self.repository.delete("user/001"))
+        self.assertFalse(self.repository.delete("user/001"))
+        self.assertEqual(len(self.repository), 9)
+    
+    def test_reopen_keeps_shard_count(self):
+        """Test that reopening uses the shard count the repository was created with."""
+        reopened = ProfileRepository(self.directory, shards=64)
+        self.assertEqual(reopened.shards, 4)
+        self.assertIsNotNone(reopened.load("user/010"))
+    
+    def test_aggregate(self):
+        """Test population-wide aggregates, in-process and with a process pool."""
+        serial = self.repository.aggregate(workers=0)
+        
+        self.assertEqual(serial['users'], 10)
+        self.assertAlmostEqual(serial['total_emissions_kg'], 550.0)
+        self.assertAlmostEqual(serial['emissions_by_category']['transportation'], 330.0)
+        self.assertAlmostEqual(serial['total_co2_saved_kg'], 25.0)
+        self.assertAlmostEqual(serial['average_net_impact_kg'], 52.5)
+        self.assertEqual(serial['missions_completed'], 5)
+        self.assertEqual(serial['total_points'], 500)
+        
+        parallel = self.repository.aggregate(workers=2)
+        self.assertEqual(parallel['users'], serial['users'])
+        self.assertAlmostEqual(parallel['total_emissions_kg'], serial['total_emissions_kg'])
+
+
+if __name__ == '__main__':
+    unittest.main()
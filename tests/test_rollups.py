@@ -0,0 +1,61 @@
+"""
+Tests for Emission Rollups Module
+"""
+
+import unittest
+from respira_plus.emissions_history import EmissionsHistory
+
+
+class TestEmissionRollups(unittest.TestCase):
+    
+    def setUp(self):
+        """Set up a history spanning two months."""
+        self.history = EmissionsHistory()
+        self.history.add('2024-01-01T08:00:00', 10.0, {'transportation': 10.0})
+        self.history.add('2024-01-01T20:00:00', 5.0, {'energy': 5.0})
+        self.history.add('2024-01-09T08:00:00', 3.0, {'food': 3.0})
+        self.history.add('2024-02-15T08:00:00', 7.0, {'food': 7.0})
+    
+    def test_daily_series(self):
+        """Test daily buckets, including empty days."""
+        series = self.history.series('2024-01-01', '2024-01-03', 'day')
+        
+        self.assertEqual([e['period'] for e in series], ['2024-01-01', '2024-01-02', '2024-01-03'])
+        self.assertEqual(series[0]['total_emissions_kg'], 15.0)
+        self.assertEqual(series[0]['records'], 2)
+        self.assertEqual(series[0]['breakdown'], {'transportation': 10.0, 'energy': 5.0, 'food': 0.0})
+        self.assertEqual(series[1]['total_emissions_kg'], 0.0)
+    
+    def test_weekly_series(self):
+        """Test ISO week buckets."""
+        series = self.history.series('2024-01-03', '2024-01-10', 'week')
+        
+        self.assertEqual([e['period'] for e in series], ['2024-W01', '2024-W02'])
+        self.assertEqual([e['total_emissions_kg'] for e in series], [15.0, 3.0])
+    
+    def test_monthly_series(self):
+        """Test monthly buckets."""
+        series = self.history.series('2024-01-20', '2024-03-01', 'month')
+        
+        self.assertEqual([e['period'] for e in series], ['2024-01', '2024-02', '2024-03'])
+        self.assertEqual([e['total_emissions_kg'] for e in series], [18.0, 7.0, 0.0])
+        self.assertEqual(series[1]['breakdown']['food'], 7.0)
+    
+    def test_updates_after_insert(self):
+        """Test that inserts after the first query update the rollups."""
+        self.history.series('2024-01-01', '2024-01-31', 'month')
+        self.history.add('2023-12-31T12:00:00', 4.0, {'energy': 4.0})
+        self.history.add('2024-01-31T12:00:00', 2.0, {'energy': 2.0})
+        
+        self.assertEqual(self.history.series('2024-01-01', '2024-01-01', 'month')[0]['total_emissions_kg'], 20.0)
+        self.assertEqual(self.history.series('2024-01-31', '2024-01-31', 'week')[0]['total_emissions_kg'], 2.0)
+        self.assertEqual(self.history.series('2023-12-31', '2023-12-31', 'day')[0]['total_emissions_kg'], 4.0)
+    
+    def test_invalid_granularity(self):
+        """Test error handling for unknown granularities."""
+        with self.assertRaises(ValueError):
+            self.history.series('2024-01-01', '2024-01-31', 'year')
+
+
+if __name__ == '__main__':
+    unittest.main()
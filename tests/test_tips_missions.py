@@ -2,8 +2,11 @@
 Tests for Tips and Missions Module
 """
 
+import json
+import os
+import tempfile
 import unittest
-from respira_plus.tips_missions import TipsMissionsManager
+from respira_plus.tips_missions import Catalog, TipsMissionsManager
 
 
 class TestTipsMissionsManager(unittest.TestCase):
@@ -16,7 +19,7 @@ class TestTipsMissionsManager(unittest.TestCase):
         """Test getting all tips."""
         tips = self.manager.get_tips_by_category()
         self.assertGreater(len(tips), 0)
-        self.assertIsInstance(tips, list)
+        self.assertIsInstance(tips, tuple)
     
     def test_get_tips_by_category_transportation(self):
         """Test filtering tips by transportation category."""
@@ -62,7 +65,7 @@ class TestTipsMissionsManager(unittest.TestCase):
         """Test getting all missions."""
         missions = self.manager.get_missions()
         self.assertGreater(len(missions), 0)
-        self.assertIsInstance(missions, list)
+        self.assertIsInstance(missions, tuple)
     
     def test_get_mission_by_id(self):
         """Test getting a specific mission by ID."""
@@ -107,6 +110,41 @@ class TestTipsMissionsManager(unittest.TestCase):
             self.assertIn('points', mission)
             self.assertIn('co2_savings_kg', mission)
 
+    
+    def test_records_are_read_only(self):
+        """Test that catalog entries cannot be modified by callers."""
+        tip = self.manager.get_tip_by_id(1)
+        with self.assertRaises(TypeError):
+            tip['title'] = 'Changed'
+        self.assertIs(self.manager.get_tip_by_id(1), tip)
+        self.assertEqual(dict(tip)['id'], 1)
+    
+    def test_unknown_category(self):
+        """Test filtering by a category without entries."""
+        self.assertEqual(self.manager.get_missions_by_category('unknown'), ())
+    
+    def test_from_file(self):
+        """Test loading catalogs from an external data file."""
+        data = {
+            'tips': [{'id': 7, 'category': 'water', 'title': 'Shorter Showers',
+                      'description': 'Keep showers under 5 minutes.', 'impact': 'low'}],
+            'missions': []
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'catalog.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            manager = TipsMissionsManager.from_file(path)
+        
+        self.assertEqual(manager.get_tip_by_id(7)['title'], 'Shorter Showers')
+        self.assertEqual(len(manager.get_tips_by_category('water')), 1)
+        self.assertEqual(manager.get_missions(), ())
+    
+    def test_duplicate_ids_rejected(self):
+        """Test that a catalog rejects duplicate IDs."""
+        with self.assertRaises(ValueError):
+            Catalog([{'id': 1, 'category': 'food'}, {'id': 1, 'category': 'energy'}])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -3,8 +3,8 @@ Testes para o Módulo de Perfil de Usuário
 """
 
 import unittest
-from datetime import datetime
-from respira_plus.user_profile import UserProfile
+from datetime import datetime, timedelta
+from respira_plus.user_profile import UserProfile, complete_mission_for_all, start_mission_for_all
 
 
 class TestUserProfile(unittest.TestCase):
@@ -64,6 +64,48 @@ class TestUserProfile(unittest.TestCase):
         self.assertEqual(len(self.user.completed_missions), 1)
         self.assertEqual(self.user.total_points, 100)
     
+    def test_start_mission_twice(self):
+        """Testa que a mesma missão não fica ativa duas vezes."""
+        mission = {
+            'id': 1,
+            'title': 'Test Mission',
+            'duration_days': 7,
+            'points': 100,
+            'co2_savings_kg': 20.0
+        }
+        
+        self.assertTrue(self.user.start_mission(mission))
+        self.assertFalse(self.user.start_mission(mission))
+        self.assertEqual(len(self.user.active_missions), 1)
+        self.assertEqual(self.user.get_active_mission(1)['title'], 'Test Mission')
+        self.assertIsNone(self.user.get_active_mission(2))
+    
+    def test_bulk_missions(self):
+        """Testa o início e a conclusão de várias missões de uma vez."""
+        missions = [
+            {'id': i, 'title': f'Mission {i}', 'duration_days': 7, 'points': 10, 'co2_savings_kg': 1.0}
+            for i in range(1, 4)
+        ]
+        
+        self.assertEqual(self.user.start_missions(missions), 3)
+        self.assertEqual([m['mission_id'] for m in self.user.active_missions], [1, 2, 3])
+        self.assertEqual(self.user.complete_missions([2, 3, 99]), 2)
+        self.assertEqual([m['mission_id'] for m in self.user.active_missions], [1])
+        self.assertEqual(self.user.total_points, 20)
+    
+    def test_mission_campaign_across_users(self):
+        """Testa missões em lote para vários usuários."""
+        other = UserProfile("test002", "Other User")
+        mission = {'id': 5, 'title': 'Campaign', 'duration_days': 7, 'points': 50, 'co2_savings_kg': 5.0}
+        other.start_mission(mission)
+        
+        started = start_mission_for_all([self.user, other], mission)
+        completed = complete_mission_for_all([self.user, other], 5)
+        
+        self.assertEqual(started, ["test001"])
+        self.assertEqual(completed, ["test001", "test002"])
+        self.assertEqual(other.total_points, 50)
+    
     def test_complete_nonexistent_mission(self):
         """Testa a conclusão de uma missão que não existe."""
         result = self.user.complete_mission(999)
@@ -80,6 +122,29 @@ class TestUserProfile(unittest.TestCase):
         total = self.user.get_total_emissions()
         self.assertEqual(total, 40.0)
     
+    def test_get_emissions_by_period(self):
+        """Testa a consulta de emissões por período."""
+        breakdown = {'transportation': 10.0, 'energy': 5.0, 'food': 3.0}
+        old_date = (datetime.now() - timedelta(days=90)).isoformat()
+        recent_date = (datetime.now() - timedelta(days=2)).isoformat()
+        
+        self.user.add_emission_record(recent_date, 18.0, breakdown)
+        self.user.add_emission_record(old_date, 30.0, breakdown)
+        
+        recent = self.user.get_emissions_by_period(30)
+        self.assertEqual(len(recent), 1)
+        self.assertEqual(recent[0]['date'], recent_date)
+        self.assertEqual(self.user.get_statistics()['recent_30_days_emissions'], 18.0)
+        self.assertEqual(self.user.emissions_history[0]['date'], old_date)
+    
+    def test_get_emissions_series(self):
+        """Testa a série mensal de emissões."""
+        self.user.add_emission_record('2024-03-05T10:00:00', 12.0, {'food': 12.0})
+        self.user.add_emission_record('2024-04-01T10:00:00', 8.0, {'energy': 8.0})
+        
+        series = self.user.get_emissions_series('2024-03-01', '2024-04-30', 'month')
+        self.assertEqual([e['total_emissions_kg'] for e in series], [12.0, 8.0])
+    
     def test_get_total_co2_saved(self):
         """Testa o cálculo do total de CO2 economizado."""
         mission1 = {
@@ -131,6 +196,34 @@ class TestUserProfile(unittest.TestCase):
         self.assertEqual(stats['total_co2_saved_kg'], 20.0)
         self.assertEqual(stats['missions_completed'], 1)
     
+    def test_running_totals(self):
+        """Testa os totais mantidos incrementalmente."""
+        breakdown = {'transportation': 10.0, 'energy': 5.0, 'food': 3.0}
+        self.user.add_emission_record(datetime.now().isoformat(), 18.0, breakdown)
+        self.user.add_emission_record('2020-01-01T00:00:00', 18.0, breakdown)
+        self.user.start_mission({'id': 1, 'title': 'Test Mission', 'duration_days': 7,
+                                 'points': 100, 'co2_savings_kg': 20.0})
+        self.user.complete_mission(1)
+        
+        self.assertEqual(self.user.get_emissions_by_category(),
+                         {'transportation': 20.0, 'energy': 10.0, 'food': 6.0})
+        self.assertEqual(self.user.get_total_co2_saved(), 20.0)
+        self.assertTrue(self.user.check_consistency())
+    
+    def test_from_dict_rebuilds_totals(self):
+        """Testa que from_dict recalcula os totais mantidos."""
+        self.user.add_emission_record('2024-01-01', 18.0, {'transportation': 18.0})
+        self.user.start_mission({'id': 1, 'title': 'Test Mission', 'duration_days': 7,
+                                 'points': 100, 'co2_savings_kg': 20.0})
+        self.user.complete_mission(1)
+        
+        restored = UserProfile.from_dict(self.user.to_dict())
+        
+        self.assertEqual(restored.get_statistics()['total_emissions_kg'], 18.0)
+        self.assertEqual(restored.get_statistics()['total_co2_saved_kg'], 20.0)
+        self.assertEqual(restored.get_emissions_by_category()['transportation'], 18.0)
+        self.assertTrue(restored.check_consistency())
+    
     def test_to_dict(self):
         """Testa a conversão do perfil para dicionário."""
         data = self.user.to_dict()
@@ -141,6 +234,86 @@ class TestUserProfile(unittest.TestCase):
         self.assertIn('total_points', data)
         self.assertIn('emissions_history', data)
     
+    def test_to_dict_round_trip(self):
+        """Testa que to_dict/from_dict preservam os dados exatamente."""
+        self.user.add_emission_record('2024-01-01T10:00:00', 18.0,
+                                      {'transportation': 10.0, 'energy': 5.0, 'food': 3.0})
+        for i in (1, 2):
+            self.user.start_mission({'id': i, 'title': f'Mission {i}', 'duration_days': 7,
+                                     'points': 100, 'co2_savings_kg': 20.0})
+        self.user.complete_mission(1)
+        
+        data = self.user.to_dict()
+        
+        self.assertEqual(data['emissions_history'], [{
+            'date': '2024-01-01T10:00:00',
+            'total_emissions_kg': 18.0,
+            'breakdown': {'transportation': 10.0, 'energy': 5.0, 'food': 3.0}
+        }])
+        self.assertIsInstance(data['active_missions'][0], dict)
+        self.assertEqual(data['completed_missions'][0]['status'], 'completed')
+        self.assertEqual(UserProfile.from_dict(data).to_dict(), data)
+    
+    def test_to_dict_round_trip_keeps_ints(self):
+        """Testa que totais e valores inteiros não voltam como float."""
+        data = self.user.to_dict()
+        data['emissions_history'] = [{
+            'date': '2024-01-01', 'total_emissions_kg': 10, 'breakdown': {'food': 10}
+        }]
+        
+        restored = UserProfile.from_dict(data).to_dict()
+        
+        self.assertEqual(repr(restored['emissions_history']), repr(data['emissions_history']))
+        restored = UserProfile.from_bytes(UserProfile.from_dict(data).to_bytes()).to_dict()
+        self.assertEqual(repr(restored['emissions_history']), repr(data['emissions_history']))
+    
+    def _populated_profile(self):
+        self.user.add_emission_record('2024-01-02T10:00:00', 18.0,
+                                      {'transportation': 10.0, 'energy': 5.0, 'food': 3.0})
+        self.user.add_emission_record('2024-01-01T10:00:00', 4.0, {'food': 3.0, 'waste': 1.0})
+        for i in (1, 2):
+            self.user.start_mission({'id': i, 'title': f'Mission {i}', 'duration_days': 7,
+                                     'points': 100, 'co2_savings_kg': 20.0})
+        self.user.complete_mission(1)
+        return self.user
+    
+    def test_bytes_round_trip(self):
+        """Testa que o formato binário equivale ao formato de dicionário."""
+        user = self._populated_profile()
+        
+        restored = UserProfile.from_bytes(user.to_bytes())
+        
+        self.assertEqual(restored.to_dict(), user.to_dict())
+        self.assertEqual(UserProfile.from_bytes(restored.to_bytes()).to_dict(), user.to_dict())
+        self.assertTrue(restored.check_consistency())
+    
+    def test_from_bytes_statistics_without_decoding_history(self):
+        """Testa que as estatísticas não exigem decodificar os registros."""
+        restored = UserProfile.from_bytes(self._populated_profile().to_bytes())
+        
+        stats = restored.get_statistics()
+        
+        self.assertEqual(stats['total_emissions_kg'], 22.0)
+        self.assertEqual(stats['emissions_by_category']['food'], 6.0)
+        self.assertIsNotNone(restored.emissions_history._dates_blob)
+        self.assertEqual(restored.emissions_history[0]['date'], '2024-01-01T10:00:00')
+    
+    def test_from_bytes_invalid_data(self):
+        """Testa o tratamento de erro para dados binários inválidos."""
+        data = bytearray(self.user.to_bytes())
+        with self.assertRaises(ValueError):
+            UserProfile.from_bytes(b'JSON' + bytes(data[4:]))
+        data[4] = 99
+        with self.assertRaises(ValueError):
+            UserProfile.from_bytes(bytes(data))
+    
+    def test_from_bytes_truncated_data(self):
+        """Testa que dados binários truncados são rejeitados."""
+        data = self._populated_profile().to_bytes()
+        for length in (10, len(data) // 2, len(data) - 8, len(data) - 1):
+            with self.assertRaisesRegex(ValueError, "Truncated profile data"):
+                UserProfile.from_bytes(data[:length])
+    
     def test_from_dict(self):
         """Testa a criação do perfil a partir de um dicionário."""
         data = {